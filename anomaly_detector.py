@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Akışkan Pump / Anomali Dedektörü
+Sembol başına O(1) güncellenen EWMA hacim/getiri istatistikleri ve tüm evrende vektörize top-k sıralaması
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_MIN_SCALE = 1e-12
+
+# Sembol başına durum dizileri ve başlangıç değerleri
+_STATE = (
+    ('count', 0), ('last_close', np.nan),
+    ('volume_mean', 0.0), ('volume_var', 0.0), ('return_mean', 0.0), ('return_var', 0.0),
+    ('volume_z', 0.0), ('return_z', 0.0), ('scores', -np.inf),
+)
+
+
+def volume_spike_zscore(volume, lookback: int = 100) -> float:
+    """
+    Son barın log hacminin önceki lookback bara göre robust z-skoru (medyan / MAD)
+
+    Tam geçmiş yerine yalnızca son lookback + 1 değer okunur.
+    """
+    values = np.asarray(volume, dtype=np.float64)[-(lookback + 1):]
+    if len(values) < 3:
+        return 0.0
+    logs = np.log1p(np.maximum(values, 0.0))
+    history, last = logs[:-1], logs[-1]
+    median = np.median(history)
+    mad = 1.4826 * np.median(np.abs(history - median))
+    if not np.isfinite(last) or mad < _MIN_SCALE:
+        return 0.0
+    return float((last - median) / mad)
+
+
+class StreamingAnomalyDetector:
+    """
+    Tüm sembol evreni için bar bazlı pump / anomali dedektörü
+
+    Her sembol için log hacmin ve log getirinin EWMA ortalaması ve varyansı
+    sütunsal dizilerde tutulur; bir bar güncellemesi sembol başına O(1)'dir ve
+    tüm evren tek bir vektörize adımda işlenir. Z-skorları barın kendisi
+    istatistiklere eklenmeden önce hesaplanır. Güncellemede sapma clip_sigma
+    standart sapmada kırpılır (Huber); böylece bir pump ortalamayı ve varyansı
+    şişirip sonraki barlarda kendini gizleyemez - z-skorları bu anlamda
+    robusttur.
+
+    Pump puanı volume_z + max(return_z, 0)'dır. Hacim ve getiri z-skorlarının
+    ikisi de eşiği geçtiğinde sembol işaretlenir. top() en yüksek puanlı k
+    sembolü np.argpartition ile O(n) seçer.
+    """
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None, halflife: float = 60.0, warmup: int = 30,
+                 volume_threshold: float = 3.0, return_threshold: float = 5.0, clip_sigma: float = 3.0):
+        """
+        Args:
+            symbols: Başlangıç evreni (sonradan yeni semboller otomatik eklenir)
+            halflife: EWMA yarı ömrü (bar)
+            warmup: Puanlamadan önce gereken en az bar sayısı
+            volume_threshold: İşaretleme için log hacim z-skoru eşiği
+            return_threshold: İşaretleme için getiri z-skoru eşiği
+            clip_sigma: Güncellemede sapmanın kırpıldığı standart sapma sayısı
+        """
+        self.alpha = 1.0 - math.exp(math.log(0.5) / halflife)
+        self.warmup = warmup
+        self.volume_threshold = volume_threshold
+        self.return_threshold = return_threshold
+        self.clip_sigma = clip_sigma
+
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._capacity = 0
+        self._allocate(64)
+        if symbols is not None:
+            self.add_symbols(symbols)
+
+    # ---- Evren ----
+
+    def _allocate(self, capacity: int):
+        """Durum dizilerini büyütür (kapasite ikiye katlanarak)"""
+        for name, fill in _STATE:
+            arr = np.full(capacity, fill, dtype=np.int64 if isinstance(fill, int) else np.float64)
+            old = getattr(self, name, None)
+            if old is not None:
+                arr[:len(old)] = old
+            setattr(self, name, arr)
+        self._capacity = capacity
+
+    def add_symbols(self, symbols: Iterable[str]) -> np.ndarray:
+        """Sembolleri evrene ekler (varsa atlar); dizinlerini döndürür"""
+        idx = []
+        for symbol in symbols:
+            i = self.index.get(symbol)
+            if i is None:
+                i = self.index[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+            idx.append(i)
+        if len(self.symbols) > self._capacity:
+            self._allocate(max(len(self.symbols), 2 * self._capacity))
+        return np.asarray(idx, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    # ---- Güncelleme ----
+
+    def update(self, closes, volumes, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Bir barlık kapanış ve hacimleri işler
+
+        Args:
+            closes: Kapanış fiyatları
+            volumes: Bar hacimleri
+            symbols: closes/volumes'un sembolleri (None: evrenin tamamı, evren sırasıyla)
+
+        Returns:
+            Güncellenen sembollerin pump puanları (ısınmamış olanlar -inf)
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        if symbols is None:
+            if len(closes) != len(self.symbols):
+                raise ValueError("symbols verilmediğinde closes evren uzunluğunda olmalı")
+            idx = np.arange(len(self.symbols))
+        else:
+            idx = self.add_symbols(symbols)
+        return self._update(idx, closes, volumes)
+
+    def update_one(self, symbol: str, close: float, volume: float) -> Optional[Dict]:
+        """Tek sembol için bir bar (akış mesajları); işaretlenirse anomali kaydını döndürür"""
+        idx = self.add_symbols((symbol,))
+        self._update(idx, np.array([close], dtype=np.float64), np.array([volume], dtype=np.float64))
+        i = int(idx[0])
+        return self._record(i) if self._flagged(idx)[0] else None
+
+    def _update(self, idx: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        alpha = self.alpha
+        x = np.log1p(np.maximum(volumes, 0.0))
+        prev = self.last_close[idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.log(closes / prev)
+        has_return = np.isfinite(r)
+        r = np.where(has_return, r, 0.0)
+
+        count = self.count[idx]
+        ready = count >= self.warmup
+
+        # Z-skorları: bar istatistiklere girmeden önce
+        v_mean, v_var = self.volume_mean[idx], self.volume_var[idx]
+        r_mean, r_var = self.return_mean[idx], self.return_var[idx]
+        # Sıfırdan başlayan EWMA varyansının ilk barlardaki düşük tahmini düzeltilir
+        decay = 1.0 - alpha
+        v_std = np.sqrt(v_var / (1.0 - decay ** np.maximum(count - 1, 1)))
+        r_std = np.sqrt(r_var / (1.0 - decay ** np.maximum(count - 2, 1)))
+        v_dev = x - v_mean
+        r_dev = r - r_mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vz = np.where(ready & (v_std > _MIN_SCALE), v_dev / v_std, 0.0)
+            rz = np.where(ready & has_return & (r_std > _MIN_SCALE), r_dev / r_std, 0.0)
+        self.volume_z[idx] = vz
+        self.return_z[idx] = rz
+        scores = np.where(ready, vz + np.maximum(rz, 0.0), -np.inf)
+        self.scores[idx] = scores
+
+        # İstatistik güncellemesi: ısınma sonrası sapmalar kırpılır
+        first = count == 0
+        v_limit = np.where(ready, self.clip_sigma * v_std, np.inf)
+        r_limit = np.where(ready, self.clip_sigma * r_std, np.inf)
+        v_dev = np.clip(v_dev, -v_limit, v_limit)
+        r_dev = np.clip(r_dev, -r_limit, r_limit)
+        self.volume_mean[idx] = np.where(first, x, v_mean + alpha * v_dev)
+        self.volume_var[idx] = np.where(first, 0.0, (1 - alpha) * (v_var + alpha * v_dev * v_dev))
+        # Getiri istatistikleri ancak önceki kapanış varsa güncellenir
+        r_first = count == 1
+        self.return_mean[idx] = np.where(has_return, np.where(r_first, r, r_mean + alpha * r_dev), r_mean)
+        self.return_var[idx] = np.where(has_return, np.where(r_first, 0.0, (1 - alpha) * (r_var + alpha * r_dev * r_dev)), r_var)
+
+        self.last_close[idx] = closes
+        self.count[idx] = count + 1
+        return scores
+
+    # ---- Sorgular ----
+
+    def _flagged(self, idx: np.ndarray) -> np.ndarray:
+        return (self.volume_z[idx] >= self.volume_threshold) & (self.return_z[idx] >= self.return_threshold)
+
+    def _record(self, i: int) -> Dict:
+        return {
+            'symbol': self.symbols[i],
+            'score': float(self.scores[i]),
+            'volume_z': float(self.volume_z[i]),
+            'return_z': float(self.return_z[i]),
+            'price': float(self.last_close[i]),
+            'flagged': bool(self._flagged(np.array([i]))[0])
+        }
+
+    def flagged(self) -> List[Dict]:
+        """Son barında eşikleri geçen semboller (puana göre azalan)"""
+        n = len(self.symbols)
+        hits = np.nonzero(self._flagged(np.arange(n)))[0]
+        hits = hits[np.argsort(-self.scores[hits], kind='stable')]
+        return [self._record(int(i)) for i in hits]
+
+    def top(self, k: int = 10) -> List[Dict]:
+        """Son puanlara göre en anormal k sembol (ısınmamış semboller hariç)"""
+        n = len(self.symbols)
+        scores = self.scores[:n]
+        valid = np.nonzero(np.isfinite(scores))[0]
+        if len(valid) == 0 or k <= 0:
+            return []
+        if len(valid) > k:
+            valid = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+        valid = valid[np.argsort(-scores[valid], kind='stable')]
+        return [self._record(int(i)) for i in valid]
+
+    def reset(self, symbol: str):
+        """Sembolün istatistiklerini sıfırlar (ör. uzun veri boşluğundan sonra)"""
+        i = self.index[symbol]
+        self.count[i] = 0
+        self.last_close[i] = np.nan
+        self.volume_z[i] = self.return_z[i] = 0.0
+        self.scores[i] = -np.inf
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olay Güdümlü Vektörize Backtest Motoru
+PaperTrader ile aynı işlem/PnL kayıtlarını, tüm sembollerde barları zaman sırasıyla yürüyerek üretir
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import indicator_kernels as kernels
+import jit_backend
+from portfolio_risk import PortfolioRiskLedger
+from position_sizing import PositionSizer
+
+SignalFunc = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+# Aynı bar içindeki işlem sırası: önce sinyaller (sembol sırasıyla), sonra stop-loss kontrolü
+_PHASE_SIGNAL = 0
+_PHASE_STOP = 1
+
+
+def ma_crossover_signals(closes: np.ndarray, fast: int = 5, slow: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    PaperTrader.generate_simple_signal ile aynı MA crossover sinyallerini tüm barlar için üretir
+
+    Args:
+        closes: (zaman × sembol) kapanış matrisi
+
+    Returns:
+        (buy, sell) boolean matrisleri
+    """
+    ma_fast = kernels.sma(closes, fast)
+    ma_slow = kernels.sma(closes, slow)
+    buy = np.zeros(closes.shape, dtype=bool)
+    sell = np.zeros(closes.shape, dtype=bool)
+    # NaN karşılaştırmaları False döner; pandas'taki iloc[-2]/iloc[-1] kontrolüyle aynı
+    buy[1:] = (ma_fast[:-1] <= ma_slow[:-1]) & (ma_fast[1:] > ma_slow[1:])
+    sell[1:] = (ma_fast[:-1] >= ma_slow[:-1]) & (ma_fast[1:] < ma_slow[1:])
+    return buy, sell
+
+
+@dataclass
+class BacktestResult:
+    """Backtest çıktısı - PaperTrader.trades / pnl_history ile aynı alanlar"""
+    initial_balance: float
+    final_balance: float
+    trades: List[Dict]
+    open_positions: List[Dict]
+    equity: pd.DataFrame = field(repr=False)
+
+    @property
+    def pnl_history(self) -> List[Dict]:
+        """PaperTrader.pnl_history biçiminde bar bazlı kayıtlar"""
+        return self.equity.to_dict('records')
+
+    def summary(self) -> Dict[str, float]:
+        """Toplam getiri, başarı oranı ve maksimum drawdown"""
+        values = self.equity['portfolio_value'].to_numpy()
+        final_value = values[-1] if len(values) else self.initial_balance
+        pnls = np.array([t['pnl'] for t in self.trades])
+        peaks = np.maximum.accumulate(values) if len(values) else values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdowns = np.where(peaks > 0, (peaks - values) / peaks, 0.0)
+        return {
+            'total_return_pct': (final_value - self.initial_balance) / self.initial_balance * 100,
+            'final_value': final_value,
+            'trades': len(pnls),
+            'win_rate_pct': (pnls > 0).mean() * 100 if len(pnls) else 0.0,
+            'net_pnl': pnls.sum() if len(pnls) else 0.0,
+            'max_drawdown_pct': drawdowns.max() * 100 if len(drawdowns) else 0.0
+        }
+
+
+def find_stop_exit(closes: np.ndarray, bar: int, end: int, stop_loss: float, trail_pct: float = 0.0) -> int:
+    """
+    bar'da açılan long pozisyonun (bar, end] aralığında stop'a takıldığı ilk bar (yoksa -1)
+
+    trail_pct > 0 ise stop, giriş barı dahil görülen en yüksek kapanışın trail_pct
+    altına çekilir; bar önce önceki barların stop'una karşı kontrol edilir. Numba
+    kuruluysa jit_backend.stop_exit_loop erken çıkışla tarar, yoksa NumPy yolu.
+    """
+    if jit_backend.enabled():
+        return int(jit_backend.stop_exit_loop(closes, bar, end, stop_loss, trail_pct))
+    window = closes[bar + 1:end + 1]
+    if trail_pct > 0:
+        # Bar t'nin stop'u: t-1'e kadarki en yüksek kapanıştan (NaN'lar atlanır)
+        peaks = np.fmax.accumulate(closes[bar:end])
+        stops = np.maximum(stop_loss, peaks * (1.0 - trail_pct))
+        hits = np.flatnonzero(window <= stops)
+    else:
+        hits = np.flatnonzero(window <= stop_loss)
+    return bar + 1 + int(hits[0]) if len(hits) else -1
+
+
+class BacktestEngine:
+    """
+    Olay güdümlü backtest motoru
+
+    Sinyaller tüm barlar için önceden dizi olarak hesaplanır. Pozisyon açıldığında
+    çıkış barı (bir sonraki SELL sinyali veya fiyatın stop'un altına indiği ilk bar)
+    vektörize aramayla hemen bulunur; Python döngüsü bar başına değil yalnızca
+    işlem olayları başına döner. Bakiye paylaşıldığı için olaylar tüm sembollerde
+    tek bir zaman sıralı kuyruktan işlenir. Yol bağımlı trailing stop taraması
+    Numba kuruluysa derlenmiş döngüyle (bkz. jit_backend) erken çıkışla yapılır.
+    """
+
+    def __init__(
+        self,
+        initial_balance: float = 10000,
+        position_sizer: Optional[PositionSizer] = None,
+        stop_loss_pct: float = 0.05,
+        strategy_type: str = "fixed_fractional",
+        signal_func: Optional[SignalFunc] = None,
+        trailing_stop_pct: Optional[float] = None
+    ):
+        """
+        Args:
+            trailing_stop_pct: Verilirse stop, giriş sonrası en yüksek kapanışın bu oran
+                altına çekilir (yalnızca yukarı). Risk defteri başlangıç stop'uyla kalır.
+        """
+        self.initial_balance = initial_balance
+        # PaperTrader gibi varsayılan boyutlandırıcı açık pozisyonları risk defterinde izler
+        self.position_sizer = position_sizer or PositionSizer(ledger=PortfolioRiskLedger())
+        self.stop_loss_pct = stop_loss_pct
+        self.strategy_type = strategy_type
+        self.signal_func = signal_func or ma_crossover_signals
+        self.trailing_stop_pct = trailing_stop_pct
+
+    @staticmethod
+    def prepare(data: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Sembol -> DataFrame sözlüğünü ortak zaman eksenine hizalar
+
+        Returns:
+            (zaman damgaları, semboller, (zaman × sembol) kapanış matrisi; eksik barlar NaN)
+        """
+        symbols = [s for s, df in data.items() if len(df) > 0]
+        closes = pd.concat(
+            {s: data[s].set_index('timestamp')['close'] for s in symbols}, axis=1
+        ).sort_index()
+        return closes.index.to_numpy(), symbols, np.ascontiguousarray(closes.to_numpy(dtype=np.float64))
+
+    def run(self, data: Dict[str, pd.DataFrame]) -> BacktestResult:
+        """Sembol -> OHLCV DataFrame sözlüğü üzerinde backtest"""
+        times, symbols, closes = self.prepare(data)
+        return self.run_arrays(times, symbols, closes)
+
+    def run_arrays(self, times: np.ndarray, symbols: Sequence[str], closes: np.ndarray,
+                   signals: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> BacktestResult:
+        """
+        Hizalanmış dizilerle backtest (parametre taramalarında veri yeniden hizalanmaz)
+
+        Args:
+            times: Zaman damgaları (zaman,)
+            symbols: Sembol adları (sütun sırası = işlem sırası)
+            closes: (zaman × sembol) kapanış matrisi
+            signals: Önceden hesaplanmış (buy, sell) matrisleri
+        """
+        buy, sell = signals if signals is not None else self.signal_func(closes)
+        n_bars, n_symbols = closes.shape
+        by_symbol = np.ascontiguousarray(closes.T)  # Sembol bazlı aramalar için satır-öncelikli kopya
+        buy_idx = [np.flatnonzero(buy[:, s]) for s in range(n_symbols)]
+        sell_idx = [np.flatnonzero(sell[:, s]) for s in range(n_symbols)]
+
+        balance = self.initial_balance
+        balance_delta = np.zeros(n_bars)
+        realized = np.zeros(n_bars)
+        # Açık pozisyon birim sayısı / quote tutarı için fark matrisleri (gerçekleşmemiş PnL sonda tek geçişte)
+        held_delta = np.zeros((n_bars + 1, n_symbols))
+        cost_delta = np.zeros((n_bars + 1, n_symbols))
+        trades, open_positions = [], []
+        ledger = self.position_sizer.ledger
+        if ledger is not None:
+            ledger.clear()
+
+        # Kuyruk: (bar, faz, sembol sırası, olay, veri)
+        queue = []
+        for s in range(n_symbols):
+            self._push_next_buy(queue, buy_idx[s], -1, s)
+
+        while queue:
+            bar, _, s, kind, position = heapq.heappop(queue)
+
+            if kind == 'buy':
+                position = self._try_open(symbols[s], bar, by_symbol[s, bar], balance, times)
+                next_from = bar
+                if position is not None:
+                    size = position['size']
+                    balance -= size
+                    balance_delta[bar] -= size
+                    held_delta[bar, s] += size / position['entry_price']
+                    cost_delta[bar, s] += size
+                    if ledger is not None:
+                        ledger.add(id(position), symbols[s], size, position['entry_price'], position['stop_loss'])
+                    exit_bar, phase, reason = self._find_exit(by_symbol[s], sell_idx[s], bar, position['stop_loss'],
+                                                              self.trailing_stop_pct or 0.0)
+                    if exit_bar is None:
+                        open_positions.append(position)
+                        continue
+                    position['reason'] = reason
+                    heapq.heappush(queue, (exit_bar, phase, s, 'exit', position))
+                    next_from = exit_bar
+                self._push_next_buy(queue, buy_idx[s], next_from, s)
+
+            else:
+                exit_price = float(by_symbol[s, bar])
+                size = position['size']
+                pnl = size * (exit_price / position['entry_price'] - 1)
+                balance += size + pnl
+                balance_delta[bar] += size + pnl
+                realized[bar] += pnl
+                held_delta[bar, s] -= size / position['entry_price']
+                cost_delta[bar, s] -= size
+                if ledger is not None:
+                    ledger.remove(id(position))
+                trades.append({
+                    'symbol': position['symbol'],
+                    'size': position['size'],
+                    'entry_price': position['entry_price'],
+                    'exit_price': exit_price,
+                    'pnl': pnl,
+                    'reason': position.pop('reason'),
+                    'timestamp': times[bar]
+                })
+
+        held = np.cumsum(held_delta[:-1], axis=0)
+        cost = np.cumsum(cost_delta[:-1], axis=0)
+        # PaperTrader.calculate_portfolio_value gibi fiyatı olmayan sembol katkı vermez
+        unrealized = np.where(np.isnan(closes) | (held == 0), 0.0, held * closes - cost).sum(axis=1)
+        balances = self.initial_balance + np.cumsum(balance_delta)
+        portfolio_values = balances + unrealized
+        equity = pd.DataFrame({
+            'date': times,
+            'portfolio_value': portfolio_values,
+            'daily_pnl': portfolio_values - (self.initial_balance + np.cumsum(realized)),
+            'balance': balances
+        })
+        return BacktestResult(self.initial_balance, balance, trades, open_positions, equity)
+
+    def _try_open(self, symbol: str, bar: int, price: float, balance: float, times: np.ndarray) -> Optional[Dict]:
+        """PaperTrader.start_simulation + open_position ile aynı açılış kuralları"""
+        entry_price = float(price)
+        stop_loss = entry_price * (1 - self.stop_loss_pct)
+        sizing = self.position_sizer.calculate_position_size(
+            symbol=symbol,
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            portfolio_value=balance,
+            strategy_type=self.strategy_type
+        )
+        size = sizing['size']
+        if size <= 0 or size > balance:
+            return None
+        ledger = self.position_sizer.ledger
+        if ledger is not None and not ledger.can_open(size, entry_price, stop_loss, balance):
+            return None
+        return {
+            'symbol': symbol,
+            'size': size,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'strategy': self.strategy_type,
+            'timestamp': times[bar]
+        }
+
+    @staticmethod
+    def _find_exit(closes: np.ndarray, sells: np.ndarray, bar: int, stop_loss: float,
+                   trail_pct: float = 0.0) -> Tuple[Optional[int], int, str]:
+        """
+        Açılış barından sonraki ilk çıkışı bulur
+
+        Aynı barda hem SELL sinyali hem stop varsa PaperTrader'daki gibi sinyal önce işlenir.
+        """
+        k = sells.searchsorted(bar, side='right')
+        sell_bar = int(sells[k]) if k < len(sells) else None
+        end = sell_bar if sell_bar is not None else len(closes) - 1
+        hit = find_stop_exit(closes, bar, end, stop_loss, trail_pct)
+        stop_bar = hit if hit >= 0 else None
+
+        if sell_bar is not None and (stop_bar is None or sell_bar <= stop_bar):
+            return sell_bar, _PHASE_SIGNAL, "Signal Exit"
+        if stop_bar is not None:
+            return stop_bar, _PHASE_STOP, "Stop Loss"
+        return None, _PHASE_SIGNAL, ""
+
+    @staticmethod
+    def _push_next_buy(queue: List, buys: np.ndarray, after: int, s: int):
+        k = buys.searchsorted(after, side='right')
+        if k < len(buys):
+            heapq.heappush(queue, (int(buys[k]), _PHASE_SIGNAL, s, 'buy', None))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çoklu Sembol (Batch) İndikatör Hesaplama
+(sembol × zaman) fiyat matrisi üzerinde tüm semboller için tek geçişte vektörize hesaplama
+"""
+
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import indicator_kernels as kernels
+
+PriceMatrix = Union[np.ndarray, pd.DataFrame]
+
+
+class BatchIndicators:
+    """
+    Çok sembollü indikatör hesaplayıcı
+
+    Girdi (sembol × zaman) NumPy matrisi veya index'i zaman, sütunları sembol olan
+    geniş DataFrame olabilir. Hesaplama zaman-öncelikli tek bir float64 matriste
+    yapılır; sonuçlar her zaman (sembol × zaman) sıralı, C-contiguous dizilerdir.
+    """
+
+    def __init__(self):
+        self.name = "Batch İndikatör Sistemi"
+
+    @staticmethod
+    def prepare(data: PriceMatrix) -> Tuple[np.ndarray, List]:
+        """
+        Girdiyi zaman-öncelikli (zaman × sembol) contiguous float64 matrise çevirir
+
+        Returns:
+            (matris, sembol listesi)
+        """
+        if isinstance(data, pd.DataFrame):
+            return np.ascontiguousarray(data.to_numpy(dtype=np.float64)), list(data.columns)
+
+        arr = np.asarray(data, dtype=np.float64)
+        if arr.ndim == 1:
+            arr = arr[None, :]
+        if arr.ndim != 2:
+            raise ValueError("Fiyat matrisi (sembol × zaman) 2 boyutlu olmalı")
+        return np.ascontiguousarray(arr.T), list(range(arr.shape[0]))
+
+    @staticmethod
+    def _output(x: np.ndarray) -> np.ndarray:
+        """Zaman-öncelikli sonucu (sembol × zaman) contiguous diziye çevirir"""
+        return np.ascontiguousarray(x.T)
+
+    def sma(self, data: PriceMatrix, period: int = 14) -> np.ndarray:
+        """Tüm semboller için Simple Moving Average"""
+        x, _ = self.prepare(data)
+        return self._output(kernels.sma(x, period))
+
+    def ema(self, data: PriceMatrix, period: int = 14) -> np.ndarray:
+        """Tüm semboller için Exponential Moving Average"""
+        x, _ = self.prepare(data)
+        return self._output(kernels.ema(x, period))
+
+    def macd(self, data: PriceMatrix, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+        """Tüm semboller için MACD"""
+        x, _ = self.prepare(data)
+        return {k: self._output(v) for k, v in kernels.macd(x, fast, slow, signal).items()}
+
+    def rsi(self, data: PriceMatrix, period: int = 14) -> np.ndarray:
+        """Tüm semboller için RSI"""
+        x, _ = self.prepare(data)
+        return self._output(kernels.rsi(x, period))
+
+    def bollinger_bands(self, data: PriceMatrix, period: int = 20, std_dev: float = 2) -> Dict[str, np.ndarray]:
+        """Tüm semboller için Bollinger Bands"""
+        x, _ = self.prepare(data)
+        return {k: self._output(v) for k, v in kernels.bollinger_bands(x, period, std_dev).items()}
+
+    def compute_all(
+        self,
+        data: PriceMatrix,
+        sma_period: int = 20,
+        ema_period: int = 20,
+        macd_params: Tuple[int, int, int] = (12, 26, 9),
+        rsi_period: int = 14,
+        bb_period: int = 20,
+        bb_std: float = 2
+    ) -> Dict[str, np.ndarray]:
+        """
+        Tüm indikatörleri tek dönüşümle hesaplar (pump tarayıcısı için)
+
+        Returns:
+            İndikatör adı -> (sembol × zaman) dizi sözlüğü
+        """
+        x, _ = self.prepare(data)
+        results = {
+            f'sma_{sma_period}': kernels.sma(x, sma_period),
+            f'ema_{ema_period}': kernels.ema(x, ema_period),
+            'rsi': kernels.rsi(x, rsi_period),
+        }
+        results.update({f'macd_{k}' if k != 'macd' else k: v
+                        for k, v in kernels.macd(x, *macd_params).items()})
+        results.update({f'bb_{k}': v for k, v in kernels.bollinger_bands(x, bb_period, bb_std).items()})
+        return {k: self._output(v) for k, v in results.items()}
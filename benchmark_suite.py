@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+İndikatör, consensus, pozisyon boyutlama ve simülasyon sıcak yollarının tekrarlanabilir ölçümü
+
+Kullanım:
+    python benchmark_suite.py --scale small                     # ölç, baseline ile karşılaştır
+    python benchmark_suite.py --scale small --update-baseline   # baseline'ı yenile
+    python benchmark_suite.py --scale large --output bench.json
+
+Sonuçlar (süre, throughput, tracemalloc tepe bellek) JSON olarak yazılır. Baseline
+ile karşılaştırmada süre veya tepe bellek toleransın üzerinde artan durumlar
+gerileme sayılır ve çıkış kodu 1 olur. Süreler makineye bağlıdır; baseline aynı
+makinede üretilmelidir.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicator_cache import IndicatorCache
+from position_sizing import PositionSizer
+from signal_generator import SignalGenerator
+from technical_indicators import TechnicalIndicators
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# bars: tek seri indikatör uzunluğu, symbols: çok sembollü durumların evren büyüklüğü
+SCALES = {
+    'small': {'bars': 1_000, 'symbols': 10, 'repeat': 5},
+    'medium': {'bars': 100_000, 'symbols': 100, 'repeat': 3},
+    'large': {'bars': 1_000_000, 'symbols': 1000, 'repeat': 3},
+    'xlarge': {'bars': 10_000_000, 'symbols': 1000, 'repeat': 1},
+}
+
+CONSENSUS_BARS = 500     # Timeframe başına bar (MarketDataPipeline lookback'i)
+SIMULATION_BARS = 2_000  # Simülasyonda sembol başına bar
+SIMULATION_DAYS = 30
+SIZING_CALLS_PER_SYMBOL = 100
+
+# Bu mutlak farkların altındaki değişimler ölçüm gürültüsü sayılır
+MIN_DELTA = {'best_s': 0.0005, 'peak_mb': 0.5}
+
+
+# ---- Sentetik veri ----
+
+def synthetic_ohlcv(n_bars: int, seed: int = 42, start: str = "2024-01-01",
+                    freq: str = "1min", price: float = 50000.0) -> pd.DataFrame:
+    """Log-normal (GBM) kapanışlardan OHLCV DataFrame ('timestamp' kolonu ile)"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    open_ = np.concatenate([[price], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, n_bars)) * close
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=n_bars, freq=freq),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.lognormal(3, 1, n_bars)
+    })
+
+
+def synthetic_universe(n_symbols: int, n_bars: int, seed: int = 42, freq: str = "1min") -> Dict[str, pd.DataFrame]:
+    """sembol -> OHLCV (semboller birbirinden bağımsız tohumlarla)"""
+    return {f"SYM{i:04d}USDT": synthetic_ohlcv(n_bars, seed + i, freq=freq) for i in range(n_symbols)}
+
+
+def synthetic_timeframes(n_bars: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """SignalGenerator girdisi: timeframe -> OHLCV"""
+    freqs = {'1m': '1min', '5m': '5min', '15m': '15min', '1h': '1h'}
+    return {tf: synthetic_ohlcv(n_bars, seed + i, freq=freq) for i, (tf, freq) in enumerate(freqs.items())}
+
+
+# ---- Ölçüm ----
+
+def measure(func: Callable, items: int, repeat: int = 3) -> Dict[str, float]:
+    """
+    En iyi / ortalama süre, throughput ve tepe bellek
+
+    Zamanlama tracemalloc kapalıyken yapılır; tepe bellek ayrı bir çalıştırmada ölçülür.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'items': items,
+        'best_s': best,
+        'mean_s': float(np.mean(times)),
+        'items_per_sec': items / best if best > 0 else float('inf'),
+        'peak_mb': peak / 1024 ** 2
+    }
+
+
+@contextlib.contextmanager
+def _quiet():
+    """PaperTrader'ın konsol çıktısını ölçümden ayırır"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ---- Durumlar ----
+
+def _indicator_cases(scale: Dict) -> List[Tuple[str, Callable, int]]:
+    df = synthetic_ohlcv(scale['bars'])
+    ti = TechnicalIndicators()
+    high, low, close = df['high'], df['low'], df['close']
+    n = len(df)
+    return [
+        ('indicators.sma', lambda: ti.sma(close, 20), n),
+        ('indicators.ema', lambda: ti.ema(close, 20), n),
+        ('indicators.rsi', lambda: ti.rsi(close, 14), n),
+        ('indicators.macd', lambda: ti.macd(close), n),
+        ('indicators.bollinger_bands', lambda: ti.bollinger_bands(close), n),
+        ('indicators.atr', lambda: ti.atr(high, low, close, 14), n),
+    ]
+
+
+def _consensus_cases(scale: Dict) -> List[Tuple[str, Callable, int]]:
+    generator = SignalGenerator(cache=IndicatorCache())
+    universe = [synthetic_timeframes(CONSENSUS_BARS, seed=i * 10) for i in range(scale['symbols'])]
+
+    def run():
+        # Önbellek her turda temizlenir: ölçülen, soğuk hesaplama maliyetidir
+        generator.cache.clear()
+        for frames in universe:
+            generator.generate_consensus_signal(frames)
+
+    return [('consensus.generate_consensus_signal', run, scale['symbols'])]
+
+
+def _sizing_cases(scale: Dict) -> List[Tuple[str, Callable, int]]:
+    rng = np.random.default_rng(7)
+    n = scale['symbols'] * SIZING_CALLS_PER_SYMBOL
+    entry = rng.uniform(1, 50000, n)
+    stop = entry * rng.uniform(0.9, 0.99, n)
+    portfolio = rng.uniform(1_000, 100_000, n)
+    strategies = rng.choice(["kelly", "fixed_fractional", "volatility", "martingale"], n)
+    sizer = PositionSizer()
+
+    def scalar():
+        for i in range(n):
+            sizer.calculate_position_size(f"SYM{i}", entry[i], stop[i], portfolio[i], strategies[i])
+
+    return [
+        ('sizing.calculate_position_size', scalar, n),
+        ('sizing.calculate_position_sizes', lambda: sizer.calculate_position_sizes(entry, stop, portfolio, strategies), n),
+    ]
+
+
+def _simulation_cases(scale: Dict) -> List[Tuple[str, Callable, int]]:
+    with _quiet():
+        from paper_trading_test import PaperTrader
+    data = synthetic_universe(scale['symbols'], min(scale['bars'], SIMULATION_BARS), freq="1h")
+
+    def run():
+        trader = PaperTrader(10000)
+        with _quiet():
+            trader.start_simulation({s: df.copy() for s, df in data.items()}, duration_days=SIMULATION_DAYS)
+
+    return [('simulation.start_simulation', run, scale['symbols'] * SIMULATION_DAYS)]
+
+
+CASE_GROUPS = {
+    'indicators': _indicator_cases,
+    'consensus': _consensus_cases,
+    'sizing': _sizing_cases,
+    'simulation': _simulation_cases,
+}
+
+
+def run_suite(scale_name: str = "small", groups: Optional[List[str]] = None,
+              repeat: Optional[int] = None, verbose: bool = True) -> Dict:
+    """
+    Seçilen ölçekte tüm durumları çalıştırır
+
+    Returns:
+        {'meta': {...}, 'results': {durum: ölçüm veya {'error': ...}}}
+    """
+    scale = SCALES[scale_name]
+    repeat = repeat or scale['repeat']
+    results = {}
+    for group in groups or list(CASE_GROUPS):
+        try:
+            cases = CASE_GROUPS[group](scale)
+        except Exception as e:
+            results[group] = {'error': f"{type(e).__name__}: {e}"}
+            if verbose:
+                print(f"❌ {group}: kurulum hatası - {e}")
+            continue
+        for name, func, items in cases:
+            try:
+                results[name] = measure(func, items, repeat)
+            except Exception as e:
+                # Eksik veya bozuk bir sıcak yol diğer ölçümleri engellemez
+                results[name] = {'error': f"{type(e).__name__}: {e}"}
+            if verbose:
+                _print_result(name, results[name])
+
+    return {
+        'meta': {
+            'scale': scale_name,
+            **{k: v for k, v in scale.items() if k != 'repeat'},
+            'repeat': repeat,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+
+
+# ---- Baseline ----
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25,
+            memory_tolerance: float = 0.25) -> List[Dict]:
+    """
+    Baseline'a göre gerilemeleri bulur
+
+    Yalnızca iki tarafta da başarılı olan durumlar karşılaştırılır. Baseline'da
+    çalışıp şimdi hata veren durum da gerileme sayılır. Oransal artış toleransı
+    aşsa bile mutlak fark MIN_DELTA'nın altındaysa gerileme sayılmaz.
+
+    Returns:
+        [{'case', 'metric', 'baseline', 'current', 'change'}, ...]
+    """
+    regressions = []
+    base_results = baseline.get('results', {})
+    for name, result in current.get('results', {}).items():
+        base = base_results.get(name)
+        if base is None or 'error' in base:
+            continue
+        if 'error' in result:
+            regressions.append({'case': name, 'metric': 'error', 'baseline': None,
+                                'current': result['error'], 'change': None})
+            continue
+        for metric, limit in (('best_s', tolerance), ('peak_mb', memory_tolerance)):
+            if base[metric] <= 0 or result[metric] - base[metric] < MIN_DELTA[metric]:
+                continue
+            change = result[metric] / base[metric] - 1
+            if change > limit:
+                regressions.append({'case': name, 'metric': metric, 'baseline': base[metric],
+                                    'current': result[metric], 'change': change})
+    return regressions
+
+
+def load_baseline(path: str, scale_name: str) -> Optional[Dict]:
+    """Baseline dosyasından ilgili ölçeğin sonuçları (dosya ölçek -> rapor tutar)"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get(scale_name)
+
+
+def save_baseline(path: str, report: Dict):
+    """Raporu diğer ölçekleri koruyarak baseline dosyasına yazar"""
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+    stored[report['meta']['scale']] = report
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+
+
+# ---- Çıktı ----
+
+def _print_result(name: str, result: Dict):
+    if 'error' in result:
+        print(f"{name:<40} ❌ {result['error']}")
+        return
+    print(f"{name:<40}{result['best_s'] * 1e3:>12.2f} ms{result['items_per_sec']:>16,.0f}/sn"
+          f"{result['peak_mb']:>10.1f} MB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sıcak yol benchmark suite")
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--groups', nargs='+', choices=list(CASE_GROUPS), help="Çalıştırılacak gruplar")
+    parser.add_argument('--repeat', type=int, help="Tekrar sayısı (varsayılan: ölçeğe göre)")
+    parser.add_argument('--output', help="Sonuç JSON dosyası")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON dosyası")
+    parser.add_argument('--update-baseline', action='store_true', help="Sonuçları baseline olarak kaydet")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="İzin verilen süre artışı (0.25 = %%25)")
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help="İzin verilen tepe bellek artışı")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Benchmark Suite - ölçek: {args.scale} {SCALES[args.scale]}")
+    print("=" * 84)
+    report = run_suite(args.scale, args.groups, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Sonuçlar kaydedildi: {args.output}")
+
+    if args.update_baseline:
+        save_baseline(args.baseline, report)
+        print(f"📌 Baseline güncellendi: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline, args.scale)
+    if baseline is None:
+        print(f"\n⚠️ '{args.scale}' ölçeği için baseline yok ({args.baseline})")
+        return 0
+
+    regressions = compare(report, baseline, args.tolerance, args.memory_tolerance)
+    if not regressions:
+        print("\n✅ Baseline'a göre gerileme yok")
+        return 0
+    print(f"\n❌ {len(regressions)} gerileme:")
+    for r in regressions:
+        if r['metric'] == 'error':
+            print(f"   {r['case']}: artık hata veriyor ({r['current']})")
+        else:
+            print(f"   {r['case']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
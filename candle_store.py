@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bellek Eşlemeli Mum Deposu
+(sembol, timeframe) başına sabit genişlikli ikili sütun dosyaları; parse ve kopya olmadan zaman aralığı okuma
+"""
+
+import json
+import os
+from urllib.parse import quote, unquote
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+INDEX_STRIDE = 1024  # Seyrek zaman indeksinde her kaçıncı satırın tutulacağı
+
+_META_FILE = 'meta.json'
+_TIME_FILE = 'time.i8'
+_INDEX_FILE = 'index.i8'
+
+
+def _component(name: str) -> str:
+    """
+    Sembol/timeframe adını tek ve güvenli bir dizin adına çevirir
+
+    '/' dahil ayırıcılar yüzde kodlanır ('BTC/USDT' -> 'BTC%2FUSDT'); boş ad,
+    '.' ve '..' reddedilir, böylece ad kök dizinin dışına çıkamaz.
+    """
+    if not isinstance(name, str) or name in ('', '.', '..') or '\x00' in name:
+        raise ValueError(f"Geçersiz sembol/timeframe adı: {name!r}")
+    return quote(name, safe='')
+
+
+def _times_to_ns(values) -> np.ndarray:
+    """Zaman damgalarını UTC epoch nanosaniyesine çevirir (sayılar milisaniye kabul edilir)"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iu':
+        return arr.astype(np.int64) * 1_000_000
+    if arr.dtype.kind == 'f':
+        return np.round(arr * 1_000_000).astype(np.int64)
+    times = pd.to_datetime(pd.Index(arr))
+    if times.tz is not None:
+        # TIMESTAMPTZ kolonları tz-aware döner; depoda UTC saklanır
+        times = times.tz_convert('UTC').tz_localize(None)
+    return times.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+
+def _time_to_ns(value) -> int:
+    return int(_times_to_ns([value])[0])
+
+
+class _Series:
+    """Tek (sembol, timeframe) serisinin dosyaları ve bellek eşlemeleri"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.maps: Dict[str, np.ndarray] = {}
+        self.index = np.empty(0, dtype=np.int64)
+        self._repaired = False
+        meta = os.path.join(path, _META_FILE)
+        if os.path.exists(meta):
+            with open(meta) as f:
+                self.count = int(json.load(f)['count'])
+            # Okuyucular yalnızca meta'daki sayıya güvenir; artan baytları keserse
+            # eşzamanlı yazıcının yarım eklemesini bozar. Onarım ilk eklemede yapılır.
+            self._load_index()
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, _TIME_FILE if name == 'time' else f"{name}.f8")
+
+    def _repair(self):
+        """Yarım kalmış bir eklemeden artan baytları keser (meta'daki sayı esas alınır; yalnızca yazıcı)"""
+        n_index = (self.count + INDEX_STRIDE - 1) // INDEX_STRIDE
+        sizes = {self.file(name): self.count * 8 for name in ('time',) + COLUMNS}
+        sizes[os.path.join(self.path, _INDEX_FILE)] = n_index * 8
+        for path, size in sizes.items():
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        self._repaired = True
+
+    def _load_index(self):
+        n_index = (self.count + INDEX_STRIDE - 1) // INDEX_STRIDE
+        self.index = np.fromfile(os.path.join(self.path, _INDEX_FILE), dtype=np.int64, count=n_index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Sütunun salt-okunur bellek eşlemesi (sayı değiştiyse yeniden eşlenir)"""
+        mapped = self.maps.get(name)
+        if mapped is None or len(mapped) != self.count:
+            if self.count == 0:
+                return np.empty(0, dtype=np.int64 if name == 'time' else np.float64)
+            dtype = np.int64 if name == 'time' else np.float64
+            mapped = np.memmap(self.file(name), dtype=dtype, mode='r', shape=(self.count,))
+            self.maps[name] = mapped
+        return mapped
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return int(self.column('time')[-1]) if self.count else None
+
+    def locate(self, t: int, side: str) -> int:
+        """Seyrek indeksle blok bulup yalnızca o blokta ikili arama yapar"""
+        b = int(np.searchsorted(self.index, t, side))
+        lo = max(b - 1, 0) * INDEX_STRIDE
+        hi = min(b * INDEX_STRIDE + 1, self.count)
+        return lo + int(np.searchsorted(self.column('time')[lo:hi], t, side))
+
+    def append(self, times: np.ndarray, columns: Dict[str, np.ndarray]):
+        os.makedirs(self.path, exist_ok=True)
+        if not self._repaired:
+            self._repair()
+        with open(self.file('time'), 'ab') as f:
+            times.tofile(f)
+        for name in COLUMNS:
+            with open(self.file(name), 'ab') as f:
+                np.ascontiguousarray(columns[name], dtype=np.float64).tofile(f)
+
+        start = self.count
+        new_count = start + len(times)
+        first = -(-start // INDEX_STRIDE) * INDEX_STRIDE
+        index_rows = times[first - start::INDEX_STRIDE] if first < new_count else times[:0]
+        with open(os.path.join(self.path, _INDEX_FILE), 'ab') as f:
+            index_rows.tofile(f)
+
+        # Meta en son ve atomik yazılır: okuyucular yalnızca tamamlanmış satırları görür
+        tmp = os.path.join(self.path, _META_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'count': new_count, 'columns': ['time', *COLUMNS], 'index_stride': INDEX_STRIDE}, f)
+        os.replace(tmp, os.path.join(self.path, _META_FILE))
+
+        self.count = new_count
+        self.index = np.concatenate([self.index, index_rows])
+        self.maps.clear()
+
+
+class CandleStore:
+    """
+    Yerel disk üzerinde sütunsal OHLCV deposu
+
+    Her (sembol, timeframe) için ayrı bir dizinde time (int64 ns) ve
+    open/high/low/close/volume (float64) dosyaları tutulur. Yazma yalnızca sona
+    eklemedir; okuma np.memmap ile yapılır, böylece yıllarca 1m bar parse veya
+    kopya maliyeti olmadan dilimlenir. Zaman aralığı sorguları her INDEX_STRIDE
+    satırda bir zaman damgası tutan küçük bir indeksle çözülür.
+
+    Dizin düzeni: <root>/<SEMBOL>/<timeframe>/{time.i8, open.f8, ..., index.i8, meta.json}
+    (sembol ve timeframe yüzde kodlanır: 'BTC/USDT' -> 'BTC%2FUSDT')
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._series: Dict[Tuple[str, str], _Series] = {}
+
+    def _get(self, symbol: str, timeframe: str) -> _Series:
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        if series is None:
+            path = os.path.join(self.root, _component(symbol), _component(timeframe))
+            series = self._series[key] = _Series(path)
+        return series
+
+    # ---- Yazma ----
+
+    def append(self, symbol: str, timeframe: str, data: pd.DataFrame) -> int:
+        """
+        Mumları serinin sonuna ekler
+
+        Args:
+            data: 'timestamp' ve OHLCV kolonları olan DataFrame; zaman damgaları artan
+                ve serideki son zamandan büyük olmalı
+
+        Returns:
+            Eklenen satır sayısı
+        """
+        if len(data) == 0:
+            return 0
+        times = _times_to_ns(data['timestamp'].to_numpy())
+        columns = {col: data[col].to_numpy(dtype=np.float64) for col in COLUMNS}
+        return self.append_arrays(symbol, timeframe, times, columns)
+
+    def append_rows(self, symbol: str, timeframe: str, rows: Iterable[Sequence]) -> int:
+        """
+        crypto_klines sorgusundan gelen (time, open, high, low, close, volume) satırlarını ekler
+
+        Decimal değerler float64'e tek seferde dönüştürülür.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        times = _times_to_ns([r[0] for r in rows])
+        values = np.array([r[1:6] for r in rows], dtype=np.float64)
+        return self.append_arrays(symbol, timeframe, times, dict(zip(COLUMNS, values.T)))
+
+    def append_arrays(self, symbol: str, timeframe: str, times: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """Hazır dizileri ekler (times: int64 epoch ns, columns: OHLCV kolon adı -> dizi)"""
+        series = self._get(symbol, timeframe)
+        times = np.ascontiguousarray(times, dtype=np.int64)
+        if np.any(times[1:] <= times[:-1]):
+            raise ValueError("Zaman damgaları kesin artan olmalı")
+        last = series.last_time
+        if last is not None and times[0] <= last:
+            raise ValueError(f"{symbol} {timeframe}: yalnızca son mumdan ({pd.Timestamp(last)}) sonrası eklenebilir")
+        series.append(times, columns)
+        return len(times)
+
+    # ---- Okuma ----
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None,
+             columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Zaman aralığını kopyasız okur
+
+        Args:
+            start: Başlangıç (dahil); None ise serinin başı
+            end: Bitiş (hariç); None ise serinin sonu
+            columns: İstenen kolonlar (varsayılan: time + OHLCV)
+
+        Returns:
+            Kolon adı -> salt-okunur memmap dilimi ('time' int64 ns)
+        """
+        series = self._get(symbol, timeframe)
+        lo, hi = self._bounds(series, start, end)
+        names = columns or ('time',) + COLUMNS
+        return {name: series.column(name)[lo:hi] for name in names}
+
+    def frame(self, symbol: str, timeframe: str, start=None, end=None) -> pd.DataFrame:
+        """
+        SignalGenerator / BacktestEngine biçiminde DataFrame ('timestamp' + OHLCV)
+
+        Kolonlar memmap üzerinde kopyasız oluşturulur; DataFrame salt-okunurdur.
+        """
+        data = self.read(symbol, timeframe, start, end)
+        frame = {'timestamp': data.pop('time').view('datetime64[ns]')}
+        frame.update(data)
+        return pd.DataFrame(frame, copy=False)
+
+    def frames(self, symbols: Sequence[str], timeframe: str, start=None, end=None) -> Dict[str, pd.DataFrame]:
+        """Birden çok sembol için sembol -> DataFrame (BacktestEngine.run girdisi)"""
+        return {symbol: self.frame(symbol, timeframe, start, end) for symbol in symbols}
+
+    @staticmethod
+    def _bounds(series: _Series, start, end) -> Tuple[int, int]:
+        lo = series.locate(_time_to_ns(start), 'left') if start is not None else 0
+        hi = series.locate(_time_to_ns(end), 'left') if end is not None else series.count
+        return lo, max(lo, hi)
+
+    def refresh(self):
+        """
+        Başka bir süreçteki yazıcının eklediği satırları görmek için meta bilgisini yeniden okur
+
+        Seri başına tek yazıcı varsayılır; okuyucu süreçler dosyalara dokunmaz.
+        """
+        self._series.clear()
+
+    # ---- Bilgi ----
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        return self._get(symbol, timeframe).count
+
+    def time_range(self, symbol: str, timeframe: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        series = self._get(symbol, timeframe)
+        if not series.count:
+            return None
+        times = series.column('time')
+        return pd.Timestamp(int(times[0])), pd.Timestamp(int(times[-1]))
+
+    def symbols(self) -> List[str]:
+        return sorted(unquote(d) for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def timeframes(self, symbol: str) -> List[str]:
+        path = os.path.join(self.root, _component(symbol))
+        if not os.path.isdir(path):
+            return []
+        return sorted(unquote(tf) for tf in os.listdir(path) if os.path.exists(os.path.join(path, tf, _META_FILE)))
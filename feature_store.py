@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feature Store
+Hesaplanmış indikatör vektörleri için iki katmanlı önbellek: süreç içi LRU + paylaşılan (Redis uyumlu) katman
+"""
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from timeframe_pyramid import timeframe_to_ns
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+Features = Dict[str, np.ndarray]
+
+_MAGIC = b'FS1'
+_HEADER = struct.Struct('<3sqddH')       # magic, sürüm, son kapanış, son hacim, dizi sayısı
+_ARRAY_HEADER = struct.Struct('<H8sI')   # ad uzunluğu, dtype, eleman sayısı
+
+
+def candle_stamp(df: pd.DataFrame, timeframe: str) -> Optional[Tuple[int, float, float]]:
+    """
+    DataFrame'in son mumunun sürüm damgası
+
+    Sürüm son mumun kapanış zamanıdır (açılış + timeframe). Kısmi (henüz
+    kapanmamış) bar yerinde güncellendiğinde zaman aynı kalır; bu yüzden son
+    kapanış fiyatı ve hacim de damgaya dahildir.
+    """
+    if len(df) == 0:
+        return None
+    if 'timestamp' in df:
+        opened = pd.Timestamp(df['timestamp'].iloc[-1])
+    elif isinstance(df.index, pd.DatetimeIndex):
+        opened = df.index[-1]
+    else:
+        return None
+    volume = float(df['volume'].iloc[-1]) if 'volume' in df else 0.0
+    return opened.value + timeframe_to_ns(timeframe), float(df['close'].iloc[-1]), volume
+
+
+def pack_features(stamp: Tuple[int, float, float], features: Features) -> bytes:
+    """Dizileri ikili biçime paketler (JSON yok; float64 diziler ham bayt olarak)"""
+    parts = [_HEADER.pack(_MAGIC, stamp[0], stamp[1], stamp[2], len(features))]
+    for name, values in features.items():
+        arr = np.ascontiguousarray(values)
+        encoded = name.encode('utf-8')
+        parts.append(_ARRAY_HEADER.pack(len(encoded), arr.dtype.str.encode('ascii'), arr.size))
+        parts.append(encoded)
+        parts.append(arr.tobytes())
+    return b''.join(parts)
+
+
+def unpack_features(data: bytes) -> Tuple[Tuple[int, float, float], Features]:
+    """pack_features çıktısını kopyasız (salt-okunur) dizilere açar"""
+    magic, version, close, volume, count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("Geçersiz feature paketi")
+    offset = _HEADER.size
+    features = {}
+    for _ in range(count):
+        name_len, dtype, size = _ARRAY_HEADER.unpack_from(data, offset)
+        offset += _ARRAY_HEADER.size
+        name = data[offset:offset + name_len].decode('utf-8')
+        offset += name_len
+        dtype = np.dtype(dtype.rstrip(b'\x00').decode('ascii'))
+        features[name] = np.frombuffer(data, dtype=dtype, count=size, offset=offset)
+        offset += size * dtype.itemsize
+    return (version, close, volume), features
+
+
+def compute_features(ti, df: pd.DataFrame, tail: Optional[int] = 256) -> Features:
+    """
+    SignalGenerator'ın kullandığı indikatörleri hesaplar
+
+    Args:
+        ti: TechnicalIndicators örneği
+        tail: Saklanacak son değer sayısı (None: tamamı)
+    """
+    close = df['close']
+    macd = ti.macd(close)
+    bb = ti.bollinger_bands(close)
+    features = {
+        'rsi': ti.rsi(close),
+        'macd': macd['macd'],
+        'macd_signal': macd['signal'],
+        'macd_histogram': macd['histogram'],
+        'bb_upper': bb['upper'],
+        'bb_middle': bb['middle'],
+        'bb_lower': bb['lower']
+    }
+    window = slice(-tail, None) if tail else slice(None)
+    return {name: np.asarray(values, dtype=np.float64)[window] for name, values in features.items()}
+
+
+# ---- Paylaşılan katmanlar ----
+
+class LocalTier:
+    """
+    Redis'in GET/SET PX alt kümesini taklit eden süreç içi katman (testler için)
+
+    Süre dolan anahtarlar okunurken temizlenir.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.monotonic() >= expires:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None):
+        expires = time.monotonic() + px / 1000 if px else None
+        with self._lock:
+            self._data[key] = (value, expires)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisTier:
+    """Redis katmanı (redis paketi gerekli); değerler ham bayt olarak saklanır"""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", client=None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("RedisTier için redis gerekli (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self.url = url
+        self.client = client
+
+    def __getstate__(self) -> Dict:
+        # Soket/kilit taşıyan istemci yerine bağlantı ayarları aktarılır; alt süreçte yeniden kurulur
+        pool = getattr(self.client, 'connection_pool', None)
+        kwargs = dict(pool.connection_kwargs) if pool is not None else None
+        return {'url': self.url, 'connection_kwargs': kwargs}
+
+    def __setstate__(self, state: Dict):
+        self.url = state['url']
+        kwargs = state.get('connection_kwargs')
+        self.client = redis.Redis(**kwargs) if kwargs else redis.Redis.from_url(self.url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None):
+        self.client.set(key, value, px=px)
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+
+# ---- Feature store ----
+
+class FeatureStore:
+    """
+    (sembol, timeframe) başına son indikatör vektörleri için iki katmanlı depo
+
+    1. katman süreç içi LRU'dur. 2. katman Redis uyumlu paylaşılan depodur;
+    değerler paketlenmiş ikili dizi olarak tutulur, böylece farklı süreçlerdeki
+    strateji işçileri RSI/MACD'yi yeniden hesaplamadan okur. Her kayıt son mumun
+    damgasıyla (kapanış zamanı + son fiyat/hacim) sürümlenir; damgası
+    uyuşmayan kayıt bayat sayılır. Paylaşılan katmandaki kayıtların süresi
+    varsayılan olarak iki mum uzunluğudur.
+    """
+
+    def __init__(self, shared=None, max_entries: int = 1024, ttl: Optional[float] = None,
+                 prefix: str = "features"):
+        """
+        Args:
+            shared: LocalTier, RedisTier veya get/set(px=) sağlayan herhangi bir istemci (None: yalnızca LRU)
+            max_entries: Süreç içi LRU kapasitesi
+            ttl: Paylaşılan katman süresi (saniye); None ise 2 × timeframe
+            prefix: Anahtar öneki
+        """
+        self.shared = shared
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local: "OrderedDict[Hashable, Tuple[Tuple[int, float, float], Features]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _key(self, symbol: str, timeframe: str) -> str:
+        return f"{self.prefix}:{symbol}:{timeframe}"
+
+    def put(self, symbol: str, timeframe: str, stamp: Tuple[int, float, float], features: Features):
+        """Vektörleri iki katmana da yazar"""
+        with self._lock:
+            key = (symbol, timeframe)
+            self._local[key] = (stamp, features)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+        if self.shared is not None:
+            ttl = self.ttl if self.ttl is not None else 2 * timeframe_to_ns(timeframe) / 1e9
+            self.shared.set(self._key(symbol, timeframe), pack_features(stamp, features), px=int(ttl * 1000))
+
+    def get(self, symbol: str, timeframe: str,
+            stamp: Optional[Tuple[int, float, float]] = None) -> Optional[Features]:
+        """
+        Vektörleri döndürür; stamp verilirse yalnızca aynı mum sürümüne ait kayıt kabul edilir
+
+        Dönen diziler paylaşılır; yerinde değiştirilmemelidir.
+        """
+        key = (symbol, timeframe)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and (stamp is None or entry[0] == stamp):
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return entry[1]
+
+        if self.shared is not None:
+            data = self.shared.get(self._key(symbol, timeframe))
+            if data is not None:
+                stored, features = unpack_features(data)
+                if stamp is None or stored == stamp:
+                    with self._lock:
+                        self._local[key] = (stored, features)
+                        self._local.move_to_end(key)
+                        while len(self._local) > self.max_entries:
+                            self._local.popitem(last=False)
+                    self.shared_hits += 1
+                    return features
+
+        self.misses += 1
+        return None
+
+    def get_or_compute(self, symbol: str, timeframe: str, df: pd.DataFrame,
+                       compute: Callable[[], Features]) -> Features:
+        """Son mumun sürümüne ait vektörler varsa okur, yoksa hesaplayıp yayınlar"""
+        stamp = candle_stamp(df, timeframe)
+        if stamp is None:
+            return compute()
+        features = self.get(symbol, timeframe, stamp)
+        if features is None:
+            features = compute()
+            self.put(symbol, timeframe, stamp, features)
+        return features
+
+    def stats(self) -> Dict[str, float]:
+        total = self.local_hits + self.shared_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': (self.local_hits + self.shared_hits) / total if total else 0.0,
+            'entries': len(self._local)
+        }
+
+    def __getstate__(self) -> Dict:
+        # Süreç havuzuna aktarılırken LRU boş başlar. RedisTier bağlantı ayarlarıyla
+        # taşınır; süreç içi LocalTier alt süreçte anlamsız olduğundan bırakılır.
+        state = self.__dict__.copy()
+        state['_local'] = OrderedDict()
+        if isinstance(self.shared, LocalTier):
+            state['shared'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Artımlı (Streaming) İndikatör Motoru
+Her yeni mum için O(1) güncelleme yapan, TechnicalIndicators ile aynı sonuçları veren sınıflar
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+Candle = Union[float, int, Mapping[str, float], pd.Series]
+
+
+class RunningSMA:
+    """
+    Kayan pencere toplamı ile Simple Moving Average (rolling(window).mean() ile aynı)
+
+    NaN değerler toplama katılmaz, penceredeki sayıları tutulur: pencerede NaN
+    varken sonuç NaN'dır, NaN pencereden çıkınca hesap kendiliğinden düzelir.
+    """
+
+    __slots__ = ('period', '_window', '_sum', '_comp', '_nans', 'value')
+
+    def __init__(self, period: int = 14):
+        if period < 1:
+            raise ValueError("period en az 1 olmalı")
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._comp = 0.0  # Kahan düzeltmesi (uzun akışlarda hata birikmesin)
+        self._nans = 0
+        self.value = math.nan
+
+    def _add(self, x: float):
+        y = x - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum = t
+
+    def update(self, x: float) -> float:
+        """Yeni değeri ekler, pencereden çıkanı düşer"""
+        self._window.append(x)
+        if x == x:
+            self._add(x)
+        else:
+            self._nans += 1
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if old == old:
+                self._add(-old)
+            else:
+                self._nans -= 1
+
+        full = len(self._window) == self.period and not self._nans
+        self.value = self._sum / self.period if full else math.nan
+        return self.value
+
+
+class RunningEMA:
+    """
+    Exponential Moving Average - pd.Series.ewm(span=period).mean() (adjust=True) ile aynı
+
+    pandas'ın ağırlıklı ortalama özyinelemesi birebir uygulanır: durum yalnızca
+    son ortalama ve toplam eski ağırlıktan oluşur. adjust=False ve min_periods
+    ile Wilder yumuşatması (RSI, ATR) için de kullanılır.
+    """
+
+    __slots__ = ('period', 'alpha', 'adjust', 'min_periods', '_old_wt', '_weighted', '_nobs', 'value')
+
+    def __init__(self, period: int = 14, alpha: Optional[float] = None,
+                 adjust: bool = True, min_periods: int = 0):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1.0)
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self._old_wt = 1.0
+        self._weighted = math.nan
+        self._nobs = 0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        """Yeni değeri EMA durumuna işler"""
+        weighted = self._weighted
+        is_obs = x == x
+        self._nobs += is_obs
+        new_wt = 1.0 if self.adjust else self.alpha
+
+        if weighted == weighted:
+            self._old_wt *= 1.0 - self.alpha
+            if is_obs:
+                if weighted != x:
+                    weighted = (self._old_wt * weighted + new_wt * x) / (self._old_wt + new_wt)
+                self._old_wt = self._old_wt + new_wt if self.adjust else 1.0
+        elif is_obs:
+            weighted = x
+
+        self._weighted = weighted
+        self.value = weighted if self._nobs >= self.min_periods else math.nan
+        return self.value
+
+
+class RunningMACD:
+    """MACD çizgisi, sinyal çizgisi ve histogram - TechnicalIndicators.macd ile aynı"""
+
+    __slots__ = ('_fast', '_slow', '_signal', 'macd', 'signal', 'histogram')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = RunningEMA(fast)
+        self._slow = RunningEMA(slow)
+        self._signal = RunningEMA(signal)
+        self.macd = math.nan
+        self.signal = math.nan
+        self.histogram = math.nan
+
+    def update(self, x: float) -> Dict[str, float]:
+        self.macd = self._fast.update(x) - self._slow.update(x)
+        self.signal = self._signal.update(self.macd)
+        self.histogram = self.macd - self.signal
+        return {'macd': self.macd, 'signal': self.signal, 'histogram': self.histogram}
+
+
+class RunningRSI:
+    """Wilder RSI - TechnicalIndicators.rsi ile aynı"""
+
+    __slots__ = ('_prev', '_gain', '_loss', 'value')
+
+    def __init__(self, period: int = 14):
+        self._prev = math.nan
+        self._gain = RunningEMA(period, alpha=1.0 / period, adjust=False, min_periods=period)
+        self._loss = RunningEMA(period, alpha=1.0 / period, adjust=False, min_periods=period)
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        delta = x - self._prev
+        self._prev = x
+        avg_gain = self._gain.update(max(delta, 0.0) if delta == delta else math.nan)
+        avg_loss = self._loss.update(max(-delta, 0.0) if delta == delta else math.nan)
+
+        if avg_gain != avg_gain or avg_loss != avg_loss or (avg_gain == 0.0 and avg_loss == 0.0):
+            self.value = math.nan
+        elif avg_loss == 0.0:
+            self.value = 100.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        return self.value
+
+
+class RunningBollinger:
+    """
+    Bollinger Bands - kayan pencere ortalaması ve varyansı (Welford ekle/çıkar)
+
+    TechnicalIndicators.bollinger_bands ile kayan nokta hassasiyetinde aynıdır.
+    NaN değerler Welford durumuna girmez; pencerede NaN varken bantlar NaN'dır.
+    Ekle/çıkar adımlarının yuvarlama artığı birikmesin diye ortalama ve M2
+    her RESYNC_INTERVAL güncellemede pencereden iki geçişle yeniden hesaplanır
+    (amortize O(period / RESYNC_INTERVAL)).
+    """
+
+    RESYNC_INTERVAL = 4096
+
+    __slots__ = ('period', 'std_dev', '_window', '_count', '_mean', '_m2', '_updates',
+                 'upper', 'middle', 'lower')
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        if period < 2:
+            raise ValueError("period en az 2 olmalı")
+        self.period = period
+        self.std_dev = std_dev
+        self._window = deque()
+        self._count = 0  # Penceredeki NaN olmayan değer sayısı
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+        self.upper = self.middle = self.lower = math.nan
+
+    def _resync(self):
+        """Ortalama ve M2'yi penceredeki geçerli değerlerden yeniden hesaplar"""
+        values = [v for v in self._window if v == v]
+        self._count = len(values)
+        self._mean = math.fsum(values) / self._count if values else 0.0
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in values)
+
+    def update(self, x: float) -> Dict[str, float]:
+        if len(self._window) == self.period:
+            old = self._window.popleft()
+            if old == old:
+                self._count -= 1
+                if self._count:
+                    delta = old - self._mean
+                    self._mean -= delta / self._count
+                    self._m2 -= delta * (old - self._mean)
+                else:
+                    self._mean = self._m2 = 0.0
+
+        self._window.append(x)
+        if x == x:
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+
+        self._updates += 1
+        if self._updates % self.RESYNC_INTERVAL == 0:
+            self._resync()
+
+        if self._count == self.period:
+            std = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+            self.middle = self._mean
+            self.upper = self._mean + self.std_dev * std
+            self.lower = self._mean - self.std_dev * std
+        else:
+            self.upper = self.middle = self.lower = math.nan
+        return {'upper': self.upper, 'middle': self.middle, 'lower': self.lower}
+
+
+class IncrementalIndicators:
+    """
+    Tek sembol için durum tutan indikatör hesaplayıcı
+
+    TechnicalIndicators her çağrıda tüm geçmişi yeniden hesaplar; bu sınıf ise
+    her mumda yalnızca son değeri günceller (O(1)). Canlı sinyal üretiminde
+    sembol başına bir örnek tutulur.
+    """
+
+    def __init__(
+        self,
+        sma_periods: Sequence[int] = (20,),
+        ema_periods: Sequence[int] = (12, 26),
+        macd_params: Optional[Sequence[int]] = (12, 26, 9),
+        rsi_period: Optional[int] = 14,
+        bb_params: Optional[Sequence[float]] = (20, 2),
+        price_field: str = 'close'
+    ):
+        self.price_field = price_field
+        self.sma = {p: RunningSMA(p) for p in sma_periods}
+        self.ema = {p: RunningEMA(p) for p in ema_periods}
+        self.macd = RunningMACD(*macd_params) if macd_params else None
+        self.rsi = RunningRSI(rsi_period) if rsi_period else None
+        self.bollinger = RunningBollinger(*bb_params) if bb_params else None
+        self.count = 0
+
+    def _price(self, candle: Candle) -> float:
+        if isinstance(candle, (int, float, np.floating, np.integer)):
+            return float(candle)
+        return float(candle[self.price_field])
+
+    def update(self, candle: Candle) -> Dict[str, float]:
+        """
+        Yeni mumu işler ve güncel indikatör değerlerini döndürür
+
+        Args:
+            candle: Fiyat değeri veya 'close' alanı olan mum (dict / pd.Series)
+
+        Returns:
+            İndikatör adı -> son değer sözlüğü
+        """
+        price = self._price(candle)
+        self.count += 1
+
+        for indicator in self.sma.values():
+            indicator.update(price)
+        for indicator in self.ema.values():
+            indicator.update(price)
+        if self.macd is not None:
+            self.macd.update(price)
+        if self.rsi is not None:
+            self.rsi.update(price)
+        if self.bollinger is not None:
+            self.bollinger.update(price)
+
+        return self.values()
+
+    def warmup(self, history: Union[pd.Series, np.ndarray, Iterable[float]]) -> Dict[str, float]:
+        """Geçmiş fiyatlarla durumu bir kez doldurur (canlı akıştan önce)"""
+        for price in np.asarray(history, dtype=np.float64):
+            self.update(price)
+        return self.values()
+
+    def values(self) -> Dict[str, float]:
+        """Son indikatör değerleri"""
+        result = {f'sma_{p}': ind.value for p, ind in self.sma.items()}
+        result.update({f'ema_{p}': ind.value for p, ind in self.ema.items()})
+        if self.macd is not None:
+            result['macd'] = self.macd.macd
+            result['macd_signal'] = self.macd.signal
+            result['macd_histogram'] = self.macd.histogram
+        if self.rsi is not None:
+            result['rsi'] = self.rsi.value
+        if self.bollinger is not None:
+            result['bb_upper'] = self.bollinger.upper
+            result['bb_middle'] = self.bollinger.middle
+            result['bb_lower'] = self.bollinger.lower
+        return result
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İndikatör Önbelleği
+Aynı seri üzerinde tekrar tekrar hesaplanan indikatörler için LRU memoization katmanı
+"""
+
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _owner(arr: np.ndarray) -> np.ndarray:
+    """View zincirini izleyerek belleğin sahibi olan diziyi bulur"""
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+def _checksum(arr: np.ndarray) -> Optional[int]:
+    """Tamponun CRC32 özeti; yerinde yapılan her değişiklik anahtarı değiştirir (nesne dizilerinde None)"""
+    if arr.dtype.hasobject:
+        return None
+    return zlib.crc32(np.ascontiguousarray(arr).view(np.uint8).ravel())
+
+
+def _index_key(data: Any) -> Optional[Tuple]:
+    """
+    Series indeksinin anahtarı: sonuçlar girdinin indeksini taşıdığından aynı
+    tampona farklı indeksle bakan seriler (set_axis, copy-on-write) ayrı kayıttır
+    """
+    if not isinstance(data, pd.Series):
+        return None
+    index = data.index
+    if isinstance(index, pd.RangeIndex):
+        return ('range', index.start, index.stop, index.step)
+    values = index.to_numpy()
+    if values.dtype.hasobject:
+        return ('object', hash(tuple(values.tolist())))
+    return (values.dtype.str, _checksum(values))
+
+
+def _nbytes(value: Any) -> int:
+    """Önbellekteki sonucun yaklaşık bellek kullanımı"""
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.asarray(value.values).nbytes)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    return 64
+
+
+class IndicatorCache:
+    """
+    (seri kimliği/sürümü, indikatör, parametreler) anahtarlı LRU önbellek
+
+    Seri kimliği veri tamponunun adresi, şekli, adımları ve içeriğinin CRC32
+    özetinden, Series'lerde ayrıca indeksinden oluşur; böylece df['close'] her çağrıda yeni bir Series nesnesi
+    döndürse de aynı kolon aynı anahtara düşer, herhangi bir değerin (yalnızca
+    son mumun değil) yerinde değiştirilmesi ise yeni hesaplamaya yol açar. Özet
+    tek doğrusal geçiştir ve indikatör hesabının yanında küçüktür. Tamponun sahibi
+    diziye zayıf referans tutulur: sahip çöp toplandığında kayıt geçersiz sayılır,
+    adres yeniden kullanılsa bile eski sonuç dönmez.
+
+    Dönen pandas nesneleri paylaşılır; çağıran taraf bunları yerinde değiştirmemelidir.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(data: Any, version: Optional[Hashable] = None) -> Tuple[Tuple, Tuple]:
+        """
+        Seri için önbellek anahtarı parçası ve sahip dizilere zayıf referanslar üretir
+
+        Returns:
+            (anahtar, weakref listesi)
+        """
+        arr = data.to_numpy() if isinstance(data, pd.Series) else np.asarray(data)
+        if arr.size == 0:
+            return ('empty', arr.shape, arr.dtype.str, _index_key(data), version), ()
+
+        key = (
+            arr.__array_interface__['data'][0],
+            arr.shape,
+            arr.strides,
+            arr.dtype.str,
+            _checksum(arr),
+            _index_key(data),
+            version
+        )
+        try:
+            refs = (weakref.ref(_owner(arr)),)
+        except TypeError:
+            refs = ()
+        return key, refs
+
+    def get_or_compute(
+        self,
+        name: str,
+        inputs: Tuple,
+        params: Tuple,
+        compute: Callable[[], Any],
+        version: Optional[Hashable] = None
+    ) -> Any:
+        """
+        Önbellekte varsa sonucu döndürür, yoksa hesaplayıp saklar
+
+        Args:
+            name: İndikatör adı
+            inputs: Girdi serileri (close, high, low ...)
+            params: Parametreler (period, std_dev ...)
+            compute: Önbellekte yoksa çağrılacak hesaplama fonksiyonu
+            version: Özetin göremediği değişiklikler (ör. nesne dizileri) için isteğe bağlı sürüm etiketi
+        """
+        parts = [self.fingerprint(data, version) for data in inputs]
+        key = (name, tuple(p[0] for p in parts), params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if all(ref() is not None for ref in entry[2]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+            self.misses += 1
+
+        value = compute()
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, tuple(ref for p in parts for ref in p[1]))
+            self.current_bytes += size
+            self._evict()
+        return value
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _evict(self):
+        """Kayıt sayısı ve bellek sınırı aşılınca en eski kayıtları çıkarır"""
+        while self._entries and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Önbelleği temizler (sayaçlar korunur)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss sayaçları ve bellek kullanımı"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> Dict:
+        # Süreç havuzuna aktarılırken yalnızca ayarlar taşınır
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: Dict):
+        self.__init__(**state)
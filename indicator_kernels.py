@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumPy İndikatör Çekirdekleri
+pandas nesnesi zincirlemeden, doğrudan float64 diziler üzerinde çalışan saf NumPy fonksiyonlar
+
+Tüm çekirdeklerde zaman ekseni 0'dır: 1 boyutlu seri (zaman,) veya çok sembollü
+matris (zaman × sembol) aynı fonksiyonla hesaplanır. Baştaki NaN değerler (yeni
+listelenen pariteler) pandas ile aynı şekilde ele alınır; aradaki boşluklar
+özyinelemeli yumuşatmalarda son geçerli değerle doldurulur.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+import jit_backend
+
+_CHUNK_ROWS = 4096      # Kayan pencere hesaplarında bellek sınırı için zaman bloğu
+_MAX_EXPONENT = 500.0   # Blok halinde doğrusal filtrede a^-i taşmasın diye üst sınır (e^500)
+
+
+# ========================================
+# YARDIMCI FONKSİYONLAR
+# ========================================
+
+def _prep(x) -> Tuple[np.ndarray, bool]:
+    """Girdiyi (zaman × sembol) float64 matrise çevirir, 1 boyutlu olup olmadığını döndürür"""
+    arr = np.asarray(x, dtype=np.float64)
+    if arr.ndim == 1:
+        return arr[:, None], True
+    return arr, False
+
+
+def _finish(out: np.ndarray, squeeze: bool) -> np.ndarray:
+    return out[:, 0] if squeeze else out
+
+
+def _shift(x: np.ndarray, n: int) -> np.ndarray:
+    """Zaman ekseninde n adım kaydırma (pozitif: ileri, boşluklar NaN)"""
+    out = np.full(x.shape, np.nan)
+    if n > 0:
+        out[n:] = x[:-n]
+    elif n < 0:
+        out[:n] = x[-n:]
+    else:
+        out[:] = x
+    return out
+
+
+def _linear_filter(x: np.ndarray, a: float, y0: np.ndarray) -> np.ndarray:
+    """
+    y[t] = a * y[t-1] + x[t] özyinelemesini zaman ekseninde vektörize çözer
+
+    Blok içinde kapalı form kullanılır: y[s+j] = a^(j+1) y[s-1] + a^j * cumsum(x[s+i] a^-i).
+    Blok boyu a^-L taşmayacak şekilde seçilir, böylece Python döngüsü T/L kez döner.
+    """
+    out = np.empty_like(x)
+    if a == 0.0:
+        out[:] = x
+        return out
+
+    block = min(max(1, int(_MAX_EXPONENT / -np.log(a))), x.shape[0])
+    steps = np.arange(block, dtype=np.float64)[:, None]
+    growth = a ** -steps   # a^-i
+    decay = a ** steps     # a^i
+    prev = y0.astype(np.float64)
+    for start in range(0, x.shape[0], block):
+        blk = x[start:start + block]
+        n = blk.shape[0]
+        res = np.multiply(blk, growth[:n], out=out[start:start + n])
+        if res.shape[1] == 1:
+            np.cumsum(res[:, 0], out=res[:, 0])  # Tek sütunda 1 boyutlu cumsum çok daha hızlı
+        else:
+            np.cumsum(res, axis=0, out=res)
+        res += a * prev
+        res *= decay[:n]
+        prev = res[-1].copy()
+    return out
+
+
+def _rolling_sum(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Kayan pencere toplamı ve penceredeki geçerli gözlem sayısı (NaN'lar 0 sayılır)"""
+    sums = np.full(x.shape, np.nan)
+    counts = np.zeros(x.shape, dtype=np.int64)
+    if x.shape[0] < period:
+        return sums, counts
+
+    valid = ~np.isnan(x)
+    complete = valid.all()
+    first = x[valid.argmax(axis=0), np.arange(x.shape[1])]
+    offset = np.where(valid.any(axis=0), first, 0.0)  # Sayısal kararlılık için öteleme
+
+    csum = np.empty((x.shape[0] + 1, x.shape[1]))
+    csum[0] = 0.0
+    if complete:
+        np.subtract(x, offset, out=csum[1:])
+    else:
+        csum[1:] = np.where(valid, x - offset, 0.0)
+    np.cumsum(csum[1:], axis=0, out=csum[1:])
+
+    if complete:
+        counts[period - 1:] = period
+    else:
+        ccount = np.zeros((x.shape[0] + 1, x.shape[1]), dtype=np.int64)
+        np.cumsum(valid, axis=0, out=ccount[1:])
+        counts[period - 1:] = ccount[period:] - ccount[:-period]
+
+    window = sums[period - 1:]
+    np.subtract(csum[period:], csum[:-period], out=window)
+    window += offset * counts[period - 1:]
+    return sums, counts
+
+
+def _rolling_var(x: np.ndarray, period: int, ddof: int = 1) -> np.ndarray:
+    """
+    Kayan pencere varyansı - rolling(period).var(ddof), pencere kopyası olmadan
+
+    Toplam ve kareler toplamının kümülatifleri zaman bloklarında (period - 1 satır
+    örtüşmeli) yeniden başlatılır ve her blok kendi sütun ortalamasına ötelenir;
+    böylece iptal hatası seri uzunluğuyla değil blok uzunluğuyla sınırlı kalır.
+    Penceresinde NaN olan barlar NaN'dır.
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] < period or period <= ddof:
+        return out
+    for start in range(period - 1, x.shape[0], _CHUNK_ROWS):
+        stop = min(start + _CHUNK_ROWS, x.shape[0])
+        blk = x[start - period + 1:stop]
+        valid = ~np.isnan(blk)
+        with np.errstate(invalid='ignore'):
+            offset = np.where(valid.any(axis=0), np.nanmean(np.where(valid, blk, np.nan), axis=0), 0.0)
+        y = np.where(valid, blk - offset, 0.0)
+
+        csum = np.zeros((len(y) + 1, y.shape[1]))
+        np.cumsum(y, axis=0, out=csum[1:])
+        s1 = csum[period:] - csum[:-period]
+        np.cumsum(y * y, axis=0, out=csum[1:])
+        s2 = csum[period:] - csum[:-period]
+        ccount = np.zeros((len(y) + 1, y.shape[1]), dtype=np.int64)
+        np.cumsum(valid, axis=0, out=ccount[1:])
+        complete = (ccount[period:] - ccount[:-period]) == period
+
+        ssd = s2 - s1 * s1 / period
+        # Sabit pencerelerde iptal artığı negatif/çok küçük kalabilir
+        ssd[ssd <= s2 * 1e-13] = 0.0
+        out[start:stop] = np.where(complete, ssd / (period - ddof), np.nan)
+    return out
+
+
+def _rolling_reduce(x: np.ndarray, period: int, func) -> np.ndarray:
+    """Kayan pencere üzerinde son eksen indirgemesi (max, min, ...) - bloklar halinde"""
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] < period:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(x, period, axis=0)  # (T-p+1, N, p)
+    # Blok boyu sütun × pencere çarpımına göre: ara kopya ~_CHUNK_ROWS × 64 eleman
+    rows = max(1, _CHUNK_ROWS * 64 // (x.shape[1] * period))
+    for start in range(0, windows.shape[0], rows):
+        blk = windows[start:start + rows]
+        out[period - 1 + start:period - 1 + start + blk.shape[0]] = func(blk)
+    return out
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _shift(close, 1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr
+
+
+def _wilder(x: np.ndarray, period: int) -> np.ndarray:
+    """Wilder yumuşatması: ewm(alpha=1/period, adjust=False, min_periods=period)"""
+    return _ewm(x, alpha=1.0 / period, adjust=False, min_periods=period)
+
+
+def _ewm_recursive(x: np.ndarray, valid: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    adjust=False özyinelemesi: y = (1 - alpha) * y + alpha * x (pandas ignore_na=False)
+
+    NaN barlarda önceki değer taşınır ve eski ağırlık sönmeye devam eder; k barlık
+    boşluktan sonraki ilk gözlemde y = (a^(k+1) y + alpha x) / (a^(k+1) + alpha).
+    Boşluksuz sütunlar tek bir vektörize filtreyle, boşluklu sütunlar kesintisiz
+    gözlem parçaları halinde çözülür (döngü parça sayısı kadar döner).
+    """
+    a = 1.0 - alpha
+    out = np.full(x.shape, np.nan)
+    complete = valid.all(axis=0)
+    if complete.any():
+        cols = np.flatnonzero(complete)
+        out[:, cols] = _linear_filter(alpha * x[:, cols], a, x[0, cols])
+
+    for j in np.flatnonzero(~complete):
+        rows = np.flatnonzero(valid[:, j])
+        if not len(rows):
+            continue
+        # Kesintisiz gözlem parçalarının başlangıç/bitiş satırları
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        starts = np.concatenate([rows[:1], rows[breaks + 1]])
+        ends = np.concatenate([rows[breaks], rows[-1:]]) + 1
+        y = x[starts[0], j]
+        prev_end = starts[0]
+        for start, end in zip(starts, ends):
+            if start > prev_end:
+                out[prev_end:start, j] = y  # Boşlukta son değer taşınır
+                old_wt = a ** (start - prev_end + 1)
+                y = (old_wt * y + alpha * x[start, j]) / (old_wt + alpha)
+            out[start, j] = y
+            if end - start > 1:
+                out[start + 1:end, j] = _linear_filter(alpha * x[start + 1:end, j, None], a, np.array([y]))[:, 0]
+                y = out[end - 1, j]
+            prev_end = end
+        out[prev_end:, j] = y
+    return out
+
+
+def _ewm(x: np.ndarray, alpha: float, adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+    """pd.DataFrame.ewm(alpha=..., adjust=...).mean() karşılığı (2 boyutlu girdi)"""
+    if jit_backend.enabled():
+        return jit_backend.ewm_loop(np.ascontiguousarray(x), alpha, adjust, min_periods)
+
+    a = 1.0 - alpha
+    valid = ~np.isnan(x)
+    zeros = np.zeros(x.shape[1])
+
+    if adjust:
+        # Ağırlıklı toplam / ağırlık toplamı; NaN gözlemler ağırlığı yalnızca sönümler
+        if valid.all():
+            num = _linear_filter(x, a, zeros)
+            # Ağırlık toplamı kapalı formda: (1 - a^(t+1)) / alpha; a^t sönünce sabit kalır
+            den = np.full((x.shape[0], 1), 1.0 / alpha)
+            head = min(x.shape[0], int(40.0 / -np.log(a)) + 1) if a > 0 else 0
+            den[:head, 0] = (1.0 - a ** np.arange(1, head + 1, dtype=np.float64)) / alpha
+        else:
+            num = _linear_filter(np.where(valid, x, 0.0), a, zeros)
+            den = _linear_filter(valid.astype(np.float64), a, zeros)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out = num / den
+    else:
+        out = _ewm_recursive(x, valid, alpha)
+
+    minp = max(min_periods, 1)
+    if minp > 1 or not valid.all():
+        out[np.cumsum(valid, axis=0) < minp] = np.nan
+    return out
+
+
+# ========================================
+# TREND İNDİKATÖRLERİ
+# ========================================
+
+def sma(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """Simple Moving Average - rolling(period).mean()"""
+    x2, squeeze = _prep(x)
+    sums, counts = _rolling_sum(x2, period)
+    sums /= period
+    sums[counts < period] = np.nan
+    return _finish(sums, squeeze)
+
+
+def ema(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """Exponential Moving Average - ewm(span=period).mean()"""
+    x2, squeeze = _prep(x)
+    return _finish(_ewm(x2, alpha=2.0 / (period + 1.0)), squeeze)
+
+
+def ewm_mean(x: np.ndarray, alpha: float, adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+    """Genel üssel ağırlıklı ortalama - ewm(alpha, adjust, min_periods).mean()"""
+    x2, squeeze = _prep(x)
+    return _finish(_ewm(x2, alpha, adjust, min_periods), squeeze)
+
+
+def wma(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """Weighted Moving Average (doğrusal ağırlıklar)"""
+    x2, squeeze = _prep(x)
+    weights = np.arange(1, period + 1, dtype=np.float64)
+    out = _rolling_reduce(x2, period, lambda w: w @ weights / weights.sum())
+    return _finish(out, squeeze)
+
+
+def macd(x: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD çizgisi, sinyal çizgisi ve histogram"""
+    x2, squeeze = _prep(x)
+    macd_line = _ewm(x2, 2.0 / (fast + 1.0)) - _ewm(x2, 2.0 / (slow + 1.0))
+    signal_line = _ewm(macd_line, 2.0 / (signal + 1.0))
+    return {
+        'macd': _finish(macd_line, squeeze),
+        'signal': _finish(signal_line, squeeze),
+        'histogram': _finish(macd_line - signal_line, squeeze)
+    }
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> Dict[str, np.ndarray]:
+    """Average Directional Index ve yön göstergeleri (+DI / -DI)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    up_move = h - _shift(h, 1)
+    down_move = _shift(l, 1) - l
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    plus_dm[0] = minus_dm[0] = np.nan
+
+    atr_values = _wilder(_true_range(h, l, c), period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100.0 * _wilder(plus_dm, period) / atr_values
+        minus_di = 100.0 * _wilder(minus_dm, period) / atr_values
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+    return {
+        'adx': _finish(_wilder(dx, period), squeeze),
+        'plus_di': _finish(plus_di, squeeze),
+        'minus_di': _finish(minus_di, squeeze)
+    }
+
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+    """Parabolic SAR (Stop and Reverse) - yol bağımlı, zaman boyunca tüm sembollerde birlikte yürür"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    out = np.full(h.shape, np.nan)
+    if h.shape[0] == 0:
+        return _finish(out, squeeze)
+
+    up = np.ones(h.shape[1], dtype=bool)
+    sar = l[0].copy()
+    ep = h[0].copy()
+    af = np.full(h.shape[1], step)
+    out[0] = sar
+
+    for i in range(1, h.shape[0]):
+        sar = sar + af * (ep - sar)
+        prev_low = l[i - 1] if i < 2 else np.fmin(l[i - 1], l[i - 2])
+        prev_high = h[i - 1] if i < 2 else np.fmax(h[i - 1], h[i - 2])
+        sar = np.where(up, np.fmin(sar, prev_low), np.fmax(sar, prev_high))
+
+        reverse = np.where(up, l[i] < sar, h[i] > sar)
+        new_extreme = np.where(up, h[i] > ep, l[i] < ep) & ~reverse
+
+        sar = np.where(reverse, ep, sar)
+        ep = np.where(reverse, np.where(up, l[i], h[i]), np.where(new_extreme, np.where(up, h[i], l[i]), ep))
+        af = np.where(reverse, step, np.where(new_extreme, np.minimum(af + step, max_step), af))
+        up = up ^ reverse
+        out[i] = sar
+
+    return _finish(out, squeeze)
+
+
+def ichimoku(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+             tenkan: int = 9, kijun: int = 26, senkou: int = 52) -> Dict[str, np.ndarray]:
+    """Ichimoku Kinko Hyo bileşenleri (senkou çizgileri kijun periyodu kadar ileri kaydırılır)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    def midpoint(period):
+        return (_rolling_reduce(h, period, lambda w: w.max(axis=-1)) +
+                _rolling_reduce(l, period, lambda w: w.min(axis=-1))) / 2.0
+
+    tenkan_sen = midpoint(tenkan)
+    kijun_sen = midpoint(kijun)
+    return {
+        'tenkan_sen': _finish(tenkan_sen, squeeze),
+        'kijun_sen': _finish(kijun_sen, squeeze),
+        'senkou_span_a': _finish(_shift((tenkan_sen + kijun_sen) / 2.0, kijun), squeeze),
+        'senkou_span_b': _finish(_shift(midpoint(senkou), kijun), squeeze),
+        'chikou_span': _finish(_shift(c, -kijun), squeeze)
+    }
+
+
+# ========================================
+# MOMENTUM İNDİKATÖRLERİ
+# ========================================
+
+def rsi(x: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder yumuşatması)"""
+    x2, squeeze = _prep(x)
+    delta = x2 - _shift(x2, 1)
+    nan = np.isnan(delta)
+    gain = np.where(nan, np.nan, np.maximum(delta, 0.0))
+    loss = np.where(nan, np.nan, np.maximum(-delta, 0.0))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = _wilder(gain, period) / _wilder(loss, period)
+        out = 100.0 - 100.0 / (1.0 + rs)
+    return _finish(out, squeeze)
+
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               k_period: int = 14, d_period: int = 3) -> Dict[str, np.ndarray]:
+    """Stochastic Oscillator (%K ve %D)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    highest = _rolling_reduce(h, k_period, lambda w: w.max(axis=-1))
+    lowest = _rolling_reduce(l, k_period, lambda w: w.min(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k = 100.0 * (c - lowest) / (highest - lowest)
+    sums, counts = _rolling_sum(k, d_period)
+    d = np.where(counts == d_period, sums / d_period, np.nan)
+    return {'k': _finish(k, squeeze), 'd': _finish(d, squeeze)}
+
+
+def williams_r(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Williams %R (-100 ile 0 arası)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    highest = _rolling_reduce(h, period, lambda w: w.max(axis=-1))
+    lowest = _rolling_reduce(l, period, lambda w: w.min(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = -100.0 * (highest - c) / (highest - lowest)
+    return _finish(out, squeeze)
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Commodity Channel Index"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    typical = (h + l + c) / 3.0
+    sums, counts = _rolling_sum(typical, period)
+    mean = np.where(counts == period, sums / period, np.nan)
+    mad = _rolling_reduce(typical, period,
+                          lambda w: np.abs(w - w.mean(axis=-1, keepdims=True)).mean(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = (typical - mean) / (0.015 * mad)
+    return _finish(out, squeeze)
+
+
+def roc(x: np.ndarray, period: int = 12) -> np.ndarray:
+    """Rate of Change (%)"""
+    x2, squeeze = _prep(x)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = 100.0 * (x2 / _shift(x2, period) - 1.0)
+    return _finish(out, squeeze)
+
+
+# ========================================
+# VOLATİLİTE İNDİKATÖRLERİ
+# ========================================
+
+def rolling_std(x: np.ndarray, period: int = 20, ddof: int = 1) -> np.ndarray:
+    """Kayan pencere standart sapması - rolling(period).std(ddof)"""
+    x2, squeeze = _prep(x)
+    return _finish(np.sqrt(_rolling_var(x2, period, ddof)), squeeze)
+
+
+def bollinger_bands(x: np.ndarray, period: int = 20, std_dev: float = 2) -> Dict[str, np.ndarray]:
+    """Bollinger Bands (SMA ± std_dev × örneklem standart sapması)"""
+    x2, squeeze = _prep(x)
+    sums, counts = _rolling_sum(x2, period)
+    middle = np.where(counts == period, sums / period, np.nan)
+    std = np.sqrt(_rolling_var(x2, period))
+    return {
+        'upper': _finish(middle + std_dev * std, squeeze),
+        'middle': _finish(middle, squeeze),
+        'lower': _finish(middle - std_dev * std, squeeze)
+    }
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range (Wilder yumuşatması)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+    return _finish(_wilder(_true_range(h, l, c), period), squeeze)
+
+
+def keltner_channels(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     period: int = 20, atr_period: int = 10, multiplier: float = 2) -> Dict[str, np.ndarray]:
+    """Keltner Channels (EMA ± multiplier × ATR)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+
+    middle = _ewm(c, 2.0 / (period + 1.0))
+    band = multiplier * _wilder(_true_range(h, l, c), atr_period)
+    return {
+        'upper': _finish(middle + band, squeeze),
+        'middle': _finish(middle, squeeze),
+        'lower': _finish(middle - band, squeeze)
+    }
+
+
+def donchian_channels(high: np.ndarray, low: np.ndarray, period: int = 20) -> Dict[str, np.ndarray]:
+    """Donchian Channels (en yüksek / en düşük / orta)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+
+    upper = _rolling_reduce(h, period, lambda w: w.max(axis=-1))
+    lower = _rolling_reduce(l, period, lambda w: w.min(axis=-1))
+    return {
+        'upper': _finish(upper, squeeze),
+        'middle': _finish((upper + lower) / 2.0, squeeze),
+        'lower': _finish(lower, squeeze)
+    }
+
+
+# ========================================
+# HACİM İNDİKATÖRLERİ
+# ========================================
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On Balance Volume"""
+    c, squeeze = _prep(close)
+    v, _ = _prep(volume)
+    direction = np.sign(c - _shift(c, 1))
+    direction[0] = 0.0
+    return _finish(np.cumsum(np.nan_to_num(direction) * v, axis=0), squeeze)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         period: int = None) -> np.ndarray:
+    """Volume Weighted Average Price (period verilirse kayan pencereli, yoksa kümülatif)"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+    v, _ = _prep(volume)
+
+    pv = (h + l + c) / 3.0 * v
+    if period is None:
+        num = np.cumsum(pv, axis=0)
+        den = np.cumsum(v, axis=0)
+    else:
+        num, _ = _rolling_sum(pv, period)
+        den, _ = _rolling_sum(v, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _finish(num / den, squeeze)
+
+
+def _money_flow_volume(h, l, c, v) -> np.ndarray:
+    rng = h - l
+    with np.errstate(invalid='ignore', divide='ignore'):
+        multiplier = np.where(rng > 0, ((c - l) - (h - c)) / rng, 0.0)
+    return multiplier * v
+
+
+def accumulation_distribution(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                              volume: np.ndarray) -> np.ndarray:
+    """Accumulation/Distribution Line"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+    v, _ = _prep(volume)
+    return _finish(np.cumsum(_money_flow_volume(h, l, c, v), axis=0), squeeze)
+
+
+def chaikin_money_flow(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """Chaikin Money Flow"""
+    h, squeeze = _prep(high)
+    l, _ = _prep(low)
+    c, _ = _prep(close)
+    v, _ = _prep(volume)
+
+    mfv, _ = _rolling_sum(_money_flow_volume(h, l, c, v), period)
+    vol, _ = _rolling_sum(v, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _finish(mfv / vol, squeeze)
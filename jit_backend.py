@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İsteğe Bağlı JIT Arka Ucu
+Özyinelemeli indikatör yumuşatmaları ve yol bağımlı stop taraması için Numba ile derlenen döngüler
+
+Numba kuruluysa döngüler ilk çağrıda derlenir ve sonuç diske önbelleklenir
+(cache=True, __pycache__ altında); sonraki süreçler derlemeyi beklemez.
+Numba yoksa aynı fonksiyonlar saf Python olarak tanımlı kalır ancak
+kullanılmaz: indicator_kernels ve backtest_engine NumPy yollarına düşer.
+Arka uç JIT_BACKEND=numpy ortam değişkeniyle veya use_jit(False) ile
+kapatılabilir.
+"""
+
+import logging
+import math
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+_enabled = NUMBA_AVAILABLE and os.environ.get('JIT_BACKEND', 'numba').lower() != 'numpy'
+
+
+def _jit(func):
+    """Numba varsa nopython + disk önbellekli derleme, yoksa fonksiyonun kendisi"""
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True, nogil=True)(func)
+    return func
+
+
+def enabled() -> bool:
+    """Derlenmiş çekirdekler kullanılıyor mu"""
+    return _enabled
+
+
+def use_jit(flag: bool = True) -> bool:
+    """JIT arka ucunu açar/kapatır; Numba yoksa açılamaz. Etkin durumu döndürür"""
+    global _enabled
+    if flag and not NUMBA_AVAILABLE:
+        logger.warning("numba kurulu değil; NumPy arka ucu kullanılıyor")
+    _enabled = bool(flag) and NUMBA_AVAILABLE
+    return _enabled
+
+
+# ========================================
+# İNDİKATÖR ÇEKİRDEKLERİ
+# ========================================
+
+@_jit
+def ewm_loop(x, alpha, adjust, min_periods):
+    """
+    indicator_kernels._ewm karşılığı: (zaman × sembol) üzerinde tek geçişli özyineleme
+
+    adjust=True: ağırlıklı toplam / ağırlık toplamı, NaN gözlem ağırlıkları yalnızca sönümler.
+    adjust=False: ilk geçerli değerden başlar; NaN barlarda değer taşınır, eski ağırlık
+    sönmeye devam eder (pandas ignore_na=False): boşluk sonrası ilk gözlemde
+    y = (w y + alpha x) / (w + alpha), w = (1 - alpha)^(boşluk + 1).
+    Geçerli gözlem sayısı min_periods'tan az olan barlar NaN'dır.
+    """
+    n_rows, n_cols = x.shape
+    a = 1.0 - alpha
+    minp = max(min_periods, 1)
+    out = np.empty((n_rows, n_cols))
+    for j in range(n_cols):
+        num = 0.0
+        den = 0.0
+        y = np.nan
+        old_wt = 1.0
+        count = 0
+        for t in range(n_rows):
+            value = x[t, j]
+            valid = not math.isnan(value)
+            if adjust:
+                num = a * num + (value if valid else 0.0)
+                den = a * den + (1.0 if valid else 0.0)
+                y = num / den if den > 0.0 else np.nan
+            elif count > 0:
+                old_wt *= a
+                if valid:
+                    y = (old_wt * y + alpha * value) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif valid:
+                y = value
+            if valid:
+                count += 1
+            out[t, j] = y if count >= minp else np.nan
+    return out
+
+
+# ========================================
+# SİMÜLASYON ÇEKİRDEKLERİ
+# ========================================
+
+@_jit
+def stop_exit_loop(closes, bar, end, stop_loss, trail_pct):
+    """
+    bar'da açılan long pozisyon için (bar, end] aralığında stop'un tetiklendiği ilk bar (yoksa -1)
+
+    trail_pct > 0 ise stop, görülen en yüksek kapanışın (giriş barı dahil)
+    trail_pct altına çekilir ve yalnızca yukarı hareket eder. Her bar önce mevcut
+    stop'a karşı kontrol edilir, ardından stop o barın kapanışıyla güncellenir
+    (PaperTrader.check_stop_losses ile aynı sıra). NaN kapanışlar atlanır.
+    """
+    stop = stop_loss
+    peak = closes[bar]
+    if trail_pct > 0.0:
+        stop = max(stop, peak * (1.0 - trail_pct))
+    for t in range(bar + 1, end + 1):
+        price = closes[t]
+        if price <= stop:
+            return t
+        if trail_pct > 0.0 and price > peak:
+            peak = price
+            stop = max(stop, peak * (1.0 - trail_pct))
+    return -1
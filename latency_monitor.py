@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gecikme İzleme
+Mum gelişinden emir kararına kadar aşama bazlı gecikme histogramları (p50/p99/max, Prometheus çıktısı)
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 1µs'den ~16s'ye √2 katlı kova sınırları: yüzdelik hatası kova başına en fazla ~%41
+DEFAULT_BUCKETS = tuple(1e-6 * 2 ** (i / 2) for i in range(49))
+
+LabelKey = Tuple[str, Optional[str], Optional[str]]  # (aşama, sembol, timeframe)
+
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı; kayıt O(log kova), bellek sabit"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # son kova: +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Kova üst sınırıyla yüzdelik tahmini (gözlenen en büyük değerle sınırlı)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.50),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+
+class _NullTimer:
+    """Kapalı izleyicinin döndürdüğü boş bağlam yöneticisi"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('monitor', 'key', 'started')
+
+    def __init__(self, monitor: 'LatencyMonitor', key: LabelKey):
+        self.monitor = monitor
+        self.key = key
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor._record(self.key, time.perf_counter() - self.started)
+        return False
+
+
+class LatencyMonitor:
+    """
+    Aşama × sembol × timeframe gecikme histogramları
+
+    Kapalıyken stage() paylaşılan boş bir bağlam yöneticisi döndürür ve timed()
+    sarmalayıcısı yalnızca bir bayrak kontrolü yapar; ölçüm maliyeti yalnızca
+    izleme açıkken ödenir.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[LabelKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    # ---- Ölçüm ----
+
+    def stage(self, name: str, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """
+        Aşama süresini ölçen bağlam yöneticisi
+
+        Örnek:
+            with monitor.stage('consensus', symbol):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, (name, symbol, timeframe))
+
+    def record(self, name: str, seconds: float, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Dışarıda ölçülmüş bir süreyi kaydeder (ör. mum gelişinden karara)"""
+        if self.enabled:
+            self._record((name, symbol, timeframe), float(seconds))
+
+    def _record(self, key: LabelKey, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+            histogram.record(seconds)
+
+    def timed(self, name: Optional[str] = None, symbol_arg: Optional[str] = None,
+              timeframe_arg: Optional[str] = None) -> Callable:
+        """
+        Fonksiyon süresini ölçen dekoratör
+
+        Args:
+            name: Aşama adı (varsayılan: fonksiyonun __qualname__'i)
+            symbol_arg: Sembol etiketi olarak okunacak parametre adı
+            timeframe_arg: Timeframe etiketi olarak okunacak parametre adı
+        """
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__qualname__
+            params = list(inspect.signature(func).parameters)
+            positions = {arg: params.index(arg) if arg in params else None
+                         for arg in (symbol_arg, timeframe_arg) if arg}
+
+            def label(arg: Optional[str], args: Tuple, kwargs: Dict) -> Optional[str]:
+                if arg is None:
+                    return None
+                if arg in kwargs:
+                    return kwargs[arg]
+                index = positions[arg]
+                return args[index] if index is not None and index < len(args) else None
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    key = (stage_name, label(symbol_arg, args, kwargs), label(timeframe_arg, args, kwargs))
+                    self._record(key, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    # ---- Dışa aktarım ----
+
+    def histogram(self, name: str, symbol: Optional[str] = None,
+                  timeframe: Optional[str] = None) -> Optional[LatencyHistogram]:
+        return self._histograms.get((name, symbol, timeframe))
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """
+        Aşama -> [{'symbol', 'timeframe', 'count', 'mean', 'p50', 'p99', 'max'}, ...]
+
+        Süreler saniye cinsindendir.
+        """
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda kv: tuple(str(k or '') for k in kv[0]))
+            result: Dict[str, List[Dict]] = {}
+            for (stage_name, symbol, timeframe), histogram in items:
+                result.setdefault(stage_name, []).append(
+                    {'symbol': symbol, 'timeframe': timeframe, **histogram.summary()})
+        return result
+
+    def prometheus(self, metric: str = "trading_stage_latency_seconds") -> str:
+        """Prometheus metin biçimi: histogram (_bucket/_sum/_count) + en büyük değer gauge'u"""
+        lines = [
+            f"# HELP {metric} Aşama bazlı gecikme (saniye)",
+            f"# TYPE {metric} histogram"
+        ]
+        max_lines = [
+            f"# HELP {metric}_max Gözlenen en büyük gecikme (saniye)",
+            f"# TYPE {metric}_max gauge"
+        ]
+        with self._lock:
+            for (stage_name, symbol, timeframe), histogram in sorted(
+                    self._histograms.items(), key=lambda kv: tuple(str(k or '') for k in kv[0])):
+                labels = f'stage="{_escape(stage_name)}",symbol="{_escape(symbol)}",timeframe="{_escape(timeframe)}"'
+                cumulative = 0
+                for bound, n in zip(self.buckets, histogram.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{{labels}}} {histogram.total:.9g}')
+                lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+                max_lines.append(f'{metric}_max{{{labels}}} {histogram.max:.9g}')
+        return "\n".join(lines + max_lines) + "\n"
+
+    def serve(self, port: int = 9108, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """
+        /metrics uç noktasını arka planda sunar (Prometheus scrape hedefi)
+
+        dashboard_setup altındaki Prometheus bu adresi hedef olarak eklediğinde
+        Grafana'da histogram_quantile ile tick-to-decision gecikmesi çizilebilir.
+        """
+        monitor = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = monitor.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="latency-metrics").start()
+        return self._server
+
+    def stop_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self) -> str:
+        """Okunabilir özet tablo (milisaniye)"""
+        lines = [f"{'Aşama':<28} {'Sembol':<10} {'TF':<4} {'Adet':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for stage_name, rows in self.snapshot().items():
+            for row in rows:
+                lines.append(
+                    f"{stage_name:<28} {row['symbol'] or '-':<10} {row['timeframe'] or '-':<4} {row['count']:>8} "
+                    f"{row['p50'] * 1e3:>9.3f} {row['p99'] * 1e3:>9.3f} {row['max'] * 1e3:>9.3f}")
+        return "\n".join(lines)
+
+
+def _escape(value: Optional[str]) -> str:
+    if value is None:
+        return ""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Süreç geneli izleyici: LATENCY_MONITOR=1 ile açık başlar, monitor.enable() ile çalışırken açılabilir
+monitor = LatencyMonitor(enabled=os.environ.get('LATENCY_MONITOR', '0') not in ('', '0', 'false', 'False'))
+stage = monitor.stage
+timed = monitor.timed
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentetik Piyasa Verisi Üreteci
+Vektörize GBM: volatilite rejimleri, sıçramalar, pump/dump olayları, gerçekçi OHLC ve hacim
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from timeframe_pyramid import timeframe_to_ns
+
+_YEAR_NS = 365 * 24 * 3600 * 1_000_000_000  # Kripto piyasası 7/24 işler
+
+
+@dataclass
+class MarketConfig:
+    """Üreteç parametreleri (drift ve volatilite yıllık)"""
+    timeframe: str = "1h"
+    start_price: float = 50000.0
+    price_dispersion: float = 0.0       # Sembollerin başlangıç fiyatlarının log-normal yayılımı
+    mu: float = 0.0                     # Yıllık drift
+    sigma: float = 0.8                  # Yıllık volatilite (sakin rejim)
+    # Volatilite rejimleri: iki durumlu Markov zinciri
+    high_vol_mult: float = 2.5          # Oynak rejimde volatilite çarpanı (1.0: rejim yok)
+    regime_switch_prob: float = 0.002   # Bar başına rejim değişim olasılığı
+    # Merton sıçramaları
+    jump_prob: float = 0.0              # Sembol × bar başına sıçrama olasılığı
+    jump_mean: float = 0.0              # Sıçramanın log getiri ortalaması
+    jump_std: float = 0.05
+    # Pump & dump olayları
+    pump_prob: float = 0.0              # Sembol × bar başına pump başlama olasılığı
+    pump_size: float = 0.3              # Pump boyunca toplam log getiri
+    pump_bars: int = 5                  # Yükseliş süresi (bar)
+    dump_bars: int = 15                 # Geri çekilme süresi (bar)
+    pump_retrace: float = 0.7           # Yükselişin geri verilen oranı
+    pump_volume_mult: float = 10.0      # Pump zirvesindeki hacim çarpanı
+    # Mum şekli ve hacim
+    wick: float = 0.5                   # Fitil uzunluğu (bar volatilitesi cinsinden)
+    base_volume: float = 1000.0
+    volume_dispersion: float = 1.0      # Sembollerin ortalama hacimlerinin log-normal yayılımı
+    volume_sigma: float = 0.4           # Bar hacmi gürültüsü (log)
+    volume_beta: float = 0.5            # |getiri| / bar volatilitesi başına hacim artışı (6σ'da sınırlı)
+
+
+class MarketDataGenerator:
+    """
+    Çok sembollü, parça parça devam ettirilebilen OHLCV üreteci
+
+    Tüm semboller tek (bar × sembol) matrisiyle üretilir; Python döngüsü yoktur.
+    Kapanışlar log getirilerin kümülatif toplamının üsteli ile bulunur
+    (kümülatif çarpımla aynı, milyonlarca barda sayısal olarak kararlı). Nadir
+    olaylar (rejim değişimi, sıçrama, pump) tam matris üzerinde rastgele sayı
+    çekmek yerine binom dağılımından sayılıp konumları örneklenir. Durum (son
+    fiyat, rejim, devam eden pump'lar, zaman) parçalar arasında korunur; bu
+    sayede diske parça parça yazılan seri tek seferde üretilenle aynı
+    süreçtendir.
+    """
+
+    def __init__(self, symbols: Union[int, Sequence[str]] = 1, config: Optional[MarketConfig] = None,
+                 seed: Optional[int] = None, start=None):
+        """
+        Args:
+            symbols: Sembol listesi veya sayısı (SYM0000USDT, SYM0001USDT, ...)
+            config: Üreteç parametreleri
+            seed: Rastgele tohum (aynı tohum aynı veriyi üretir)
+            start: İlk barın açılış zamanı (varsayılan: 2024-01-01)
+        """
+        if isinstance(symbols, int):
+            symbols = [f"SYM{i:04d}USDT" for i in range(symbols)]
+        self.symbols: List[str] = list(symbols)
+        self.config = config or MarketConfig()
+        self.rng = np.random.default_rng(seed)
+
+        cfg = self.config
+        n = len(self.symbols)
+        self.step_ns = timeframe_to_ns(cfg.timeframe)
+        self.bar_sigma = cfg.sigma * math.sqrt(self.step_ns / _YEAR_NS)
+        self.bar_mu = cfg.mu * self.step_ns / _YEAR_NS
+
+        self._next_ns = pd.Timestamp(start if start is not None else "2024-01-01").value
+        self._bar = 0
+        self._log_price = np.log(cfg.start_price) + cfg.price_dispersion * self.rng.standard_normal(n)
+        self._log_volume = (np.log(cfg.base_volume) + cfg.volume_dispersion * self.rng.standard_normal(n)
+                            - 0.5 * cfg.volume_sigma ** 2)
+        self._regime = np.zeros(n, dtype=np.uint8)
+
+        # Pump çekirdekleri: log getiri profili ve ek hacim çarpanı
+        rise = np.full(cfg.pump_bars, cfg.pump_size / cfg.pump_bars)
+        fall = np.full(cfg.dump_bars, -cfg.pump_size * cfg.pump_retrace / cfg.dump_bars)
+        self._pump_returns = np.concatenate([rise, fall])
+        extra = cfg.pump_volume_mult - 1.0
+        self._pump_volume = np.concatenate([
+            extra * np.linspace(1 / cfg.pump_bars, 1.0, cfg.pump_bars),
+            extra * np.exp(-np.arange(1, cfg.dump_bars + 1) * 4.0 / cfg.dump_bars)
+        ])
+        span = len(self._pump_returns)
+        self._carry_returns = np.zeros((span, n))
+        self._carry_volume = np.zeros((span, n))
+        self.pump_events: List[Tuple[str, int, pd.Timestamp]] = []
+
+    def _event_positions(self, n_bars: int, prob: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(bar, sembol) matrisinde olasılığı prob olan olayların konumları"""
+        total = n_bars * len(self.symbols)
+        if prob <= 0 or total == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if prob >= 0.01:
+            return np.nonzero(self.rng.random((n_bars, len(self.symbols)), dtype=np.float32) < prob)
+        flat = np.unique(self.rng.integers(0, total, self.rng.binomial(total, prob)))
+        return np.unravel_index(flat, (n_bars, len(self.symbols)))
+
+    def _apply_pumps(self, returns: np.ndarray, volume_mult: np.ndarray, times: np.ndarray):
+        """Devam eden ve yeni başlayan pump'ları getiri / hacim matrislerine ekler"""
+        n_bars = len(returns)
+        span = len(self._pump_returns)
+        k = min(n_bars, span)
+        returns[:k] += self._carry_returns[:k]
+        volume_mult[:k] += self._carry_volume[:k]
+        carry_returns = np.zeros_like(self._carry_returns)
+        carry_volume = np.zeros_like(self._carry_volume)
+        carry_returns[:span - k] = self._carry_returns[k:]
+        carry_volume[:span - k] = self._carry_volume[k:]
+
+        rows, cols = self._event_positions(n_bars, self.config.pump_prob)
+        if len(rows):
+            idx = rows[:, None] + np.arange(span)
+            cols_b = np.broadcast_to(cols[:, None], idx.shape)
+            kr = np.broadcast_to(self._pump_returns, idx.shape)
+            kv = np.broadcast_to(self._pump_volume, idx.shape)
+            inside = idx < n_bars
+            np.add.at(returns, (idx[inside], cols_b[inside]), kr[inside])
+            np.add.at(volume_mult, (idx[inside], cols_b[inside]), kv[inside])
+            outside = ~inside
+            np.add.at(carry_returns, (idx[outside] - n_bars, cols_b[outside]), kr[outside])
+            np.add.at(carry_volume, (idx[outside] - n_bars, cols_b[outside]), kv[outside])
+            order = np.argsort(rows, kind='stable')
+            self.pump_events.extend(
+                (self.symbols[c], self._bar + int(r), pd.Timestamp(int(times[r])))
+                for r, c in zip(rows[order], cols[order]))
+
+        self._carry_returns = carry_returns
+        self._carry_volume = carry_volume
+
+    def next_chunk(self, n_bars: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Sonraki n_bars barı üretir
+
+        Returns:
+            (times int64 ns (n_bars,), {'open','high','low','close','volume'} -> (n_bars, n_sembol) float64)
+        """
+        cfg = self.config
+        rng = self.rng
+        n = len(self.symbols)
+        shape = (n_bars, n)
+        times = self._next_ns + np.arange(n_bars, dtype=np.int64) * self.step_ns
+
+        # Volatilite rejimi: değişim noktalarının XOR birikimi
+        if cfg.high_vol_mult != 1.0 and cfg.regime_switch_prob > 0:
+            flips = np.zeros(shape, dtype=np.uint8)
+            flips[self._event_positions(n_bars, cfg.regime_switch_prob)] = 1
+            flips[0] ^= self._regime
+            regime = np.bitwise_xor.accumulate(flips, axis=0)
+            self._regime = regime[-1].copy() if n_bars else self._regime
+            vol = self.bar_sigma * (1.0 + (cfg.high_vol_mult - 1.0) * regime)
+        else:
+            vol = np.full(shape, self.bar_sigma)
+
+        z = rng.standard_normal(shape, dtype=np.float32)
+        returns = self.bar_mu - 0.5 * vol ** 2 + vol * z
+
+        rows, cols = self._event_positions(n_bars, cfg.jump_prob)
+        if len(rows):
+            returns[rows, cols] += rng.normal(cfg.jump_mean, cfg.jump_std, len(rows))
+
+        volume_mult = np.ones(shape)
+        if cfg.pump_prob > 0 or self._carry_volume.any():
+            self._apply_pumps(returns, volume_mult, times)
+
+        log_close = self._log_price + np.cumsum(returns, axis=0)
+        close = np.exp(log_close)
+        open_ = np.empty(shape)
+        open_[0] = np.exp(self._log_price)
+        open_[1:] = close[:-1]
+
+        # Fitiller: gövdenin dışına, bar volatilitesiyle ölçeklenen yarı-normal uzantı
+        wick = cfg.wick * vol
+        high = np.maximum(open_, close) * np.exp(wick * np.abs(rng.standard_normal(shape, dtype=np.float32)))
+        low = np.minimum(open_, close) * np.exp(-wick * np.abs(rng.standard_normal(shape, dtype=np.float32)))
+
+        # Hacim: log-normal gürültü × büyük hareketlerde (sınırlı) artış × pump çarpanı
+        activity = 1.0 + cfg.volume_beta * np.minimum(np.abs(returns) / self.bar_sigma, 6.0)
+        volume = np.exp(self._log_volume + cfg.volume_sigma * rng.standard_normal(shape, dtype=np.float32))
+        volume *= activity * volume_mult
+
+        if n_bars:
+            self._log_price = log_close[-1].copy()
+        self._next_ns += n_bars * self.step_ns
+        self._bar += n_bars
+        return times, {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+    def generate(self, n_bars: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Tek seferde n_bars bar (next_chunk ile aynı çıktı biçimi)"""
+        return self.next_chunk(n_bars)
+
+    def frames(self, n_bars: int) -> Dict[str, pd.DataFrame]:
+        """sembol -> 'timestamp' + OHLCV DataFrame (PaperTrader / BacktestEngine girdisi)"""
+        times, arrays = self.next_chunk(n_bars)
+        timestamps = times.view('datetime64[ns]')
+        return {
+            symbol: pd.DataFrame({'timestamp': timestamps,
+                                  **{col: arrays[col][:, i].copy() for col in arrays}})
+            for i, symbol in enumerate(self.symbols)
+        }
+
+    def write_store(self, store, n_bars: int, chunk_bars: int = 100_000, timeframe: Optional[str] = None) -> int:
+        """
+        n_bars barı parça parça üretip CandleStore'a ekler; bellek parça boyutuyla sınırlıdır
+
+        Args:
+            store: CandleStore
+            chunk_bars: Parça başına bar sayısı (bellek ≈ chunk_bars × sembol × 8 bayt × ~10)
+            timeframe: Depodaki timeframe adı (varsayılan: config.timeframe)
+
+        Returns:
+            Yazılan toplam satır sayısı
+        """
+        timeframe = timeframe or self.config.timeframe
+        written = 0
+        remaining = n_bars
+        while remaining > 0:
+            size = min(chunk_bars, remaining)
+            times, arrays = self.next_chunk(size)
+            for i, symbol in enumerate(self.symbols):
+                written += store.append_arrays(symbol, timeframe, times,
+                                               {col: arrays[col][:, i] for col in arrays})
+            remaining -= size
+        return written
+
+
+def generate_market_data(symbols: Union[int, Sequence[str]], n_bars: int, timeframe: str = "1h",
+                         seed: Optional[int] = 42, start=None, **config) -> Dict[str, pd.DataFrame]:
+    """
+    Kısa yol: sembol -> OHLCV DataFrame
+
+    Örnek:
+        data = generate_market_data(['BTCUSDT', 'ETHUSDT'], 24 * 30, pump_prob=1e-3)
+    """
+    generator = MarketDataGenerator(symbols, MarketConfig(timeframe=timeframe, **config), seed=seed, start=start)
+    return generator.frames(n_bars)
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asenkron Piyasa Verisi Hattı
+Kaynak -> sınırlı kuyruk (geri basınç) -> mum birleştirici -> SignalGenerator / PaperTrader
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from latency_monitor import monitor
+from timeframe_pyramid import TimeframePyramid, timeframe_to_ns, timestamp_to_ns
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+QUEUE_POLICIES = ("block", "drop_newest", "drop_oldest", "coalesce")
+
+
+# ---- Kaynaklar ----
+
+class MarketDataSource(ABC):
+    """
+    Takılabilir veri kaynağı arayüzü
+
+    stream() sözlük mesajlar üretir: kline mesajları 'symbol', 'timestamp' ve
+    OHLCV alanları (isteğe bağlı 'closed'), işlem mesajları 'symbol',
+    'timestamp', 'price', 'qty' alanları taşır. stream() tanımlamayan kaynak
+    oluşturulurken hata verir.
+    """
+
+    @abstractmethod
+    def stream(self) -> AsyncIterator[Dict]:
+        """Mesajları üreten async generator"""
+
+    async def close(self):
+        pass
+
+
+class ReplaySource(MarketDataSource):
+    """
+    Geçmiş OHLCV verisini zaman sırasıyla tekrar oynatan yerel kaynak (test / simülasyon)
+
+    Tüm sembollerin barları tek seferde zamana göre birleştirilir; speed None ise
+    olabildiğince hızlı, verilirse gerçek zamanın speed katı hızla oynatılır.
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame], speed: Optional[float] = None, yield_every: int = 256):
+        self.speed = speed
+        self.yield_every = yield_every
+        frames = [df.assign(symbol=symbol) for symbol, df in data.items() if len(df)]
+        merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['timestamp', 'symbol', 'open', 'high', 'low', 'close', 'volume'])
+        order = np.argsort(pd.to_datetime(merged['timestamp']).to_numpy(dtype='datetime64[ns]'), kind='stable')
+        self._rows = merged.iloc[order][['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume']]
+
+    async def stream(self) -> AsyncIterator[Dict]:
+        columns = [self._rows[c].tolist() for c in self._rows.columns]
+        previous = None
+        for i, (symbol, ts, o, h, l, c, v) in enumerate(zip(*columns)):
+            if self.speed:
+                ts_ns = timestamp_to_ns(ts)
+                if previous is not None and ts_ns > previous:
+                    await asyncio.sleep((ts_ns - previous) / 1e9 / self.speed)
+                previous = ts_ns
+            elif i % self.yield_every == 0:
+                await asyncio.sleep(0)
+            yield {'symbol': symbol, 'timestamp': ts, 'open': o, 'high': h, 'low': l,
+                   'close': c, 'volume': v, 'closed': True}
+
+
+class BinanceKlineSource(MarketDataSource):
+    """Binance birleşik kline WebSocket akışı (websockets paketi gerekli)"""
+
+    URL = "wss://stream.binance.com:9443/stream?streams="
+
+    def __init__(self, symbols: Sequence[str], interval: str = "1m"):
+        if not WEBSOCKETS_AVAILABLE:
+            raise ImportError("BinanceKlineSource için websockets gerekli (pip install websockets)")
+        self.streams = "/".join(f"{s.lower()}@kline_{interval}" for s in symbols)
+
+    async def stream(self) -> AsyncIterator[Dict]:
+        async with websockets.connect(self.URL + self.streams) as ws:
+            async for raw in ws:
+                k = json.loads(raw)['data']['k']
+                yield {'symbol': k['s'], 'timestamp': k['t'], 'open': float(k['o']), 'high': float(k['h']),
+                       'low': float(k['l']), 'close': float(k['c']), 'volume': float(k['v']), 'closed': k['x']}
+
+
+# ---- Kuyruk ----
+
+class BoundedQueue:
+    """
+    Taşma politikalı sınırlı asyncio kuyruğu
+
+    Politikalar:
+        block: Kuyruk doluysa üretici bekler (geri basınç)
+        drop_newest: Kuyruk doluysa gelen mesaj atılır
+        drop_oldest: Kuyruk doluysa en eski mesaj atılır
+        coalesce: Aynı anahtarlı (ör. aynı sembolün aynı barı) bekleyen mesaj yerinde
+            güncellenir; anahtarsız mesajlar ve yeni anahtarlar için kuyruk doluysa
+            üretici bekler
+    """
+
+    def __init__(self, maxsize: int = 10000, policy: str = "block"):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Geçersiz kuyruk politikası: {policy} (seçenekler: {QUEUE_POLICIES})")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._seq = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    async def put(self, item: Any, key: Optional[Hashable] = None) -> bool:
+        """Mesajı ekler; atıldıysa False döner"""
+        if self.policy == "coalesce" and key is not None and key in self._items:
+            self._items[key] = item
+            self.coalesced += 1
+            return True
+
+        while self.full():
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return False
+            if self.policy == "drop_oldest":
+                self._items.popitem(last=False)
+                self.dropped += 1
+                break
+            self._not_full.clear()
+            await self._not_full.wait()
+
+        if key is None or self.policy != "coalesce":
+            self._seq += 1
+            key = ('_seq', self._seq)
+        self._items[key] = item
+        self._not_empty.set()
+        return True
+
+    def close(self):
+        """Akış sonu: kuyruk boşaldığında get() None döndürür"""
+        self.closed = True
+        self._not_empty.set()
+
+    async def get(self) -> Any:
+        """Sıradaki mesaj; kuyruk kapatılmış ve boşsa None"""
+        while not self._items:
+            if self.closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _, item = self._items.popitem(last=False)
+        self._not_full.set()
+        return item
+
+
+# ---- Mum birleştirici ----
+
+class CandleAggregator:
+    """
+    Sembol başına temel timeframe (1m) mum birleştirici
+
+    İşlem mesajlarından mevcut barı kurar, kline mesajlarında barı günceller ve
+    bar kapandığında (kline 'closed' bayrağı veya daha yeni bir barın gelmesi)
+    kapanan barı döndürür.
+    """
+
+    def __init__(self, timeframe: str = "1m"):
+        self.tf_ns = timeframe_to_ns(timeframe)
+        self.current: Dict[str, Dict] = {}
+        self._last_closed: Dict[str, int] = {}
+
+    def update(self, message: Mapping) -> List[Dict]:
+        """Mesajı işler; kapanan barları (genellikle 0 veya 1) döndürür"""
+        symbol = message['symbol']
+        ts = timestamp_to_ns(message['timestamp'])
+        bucket = ts - ts % self.tf_ns
+        closed = []
+        if bucket <= self._last_closed.get(symbol, -1):
+            return closed  # Geç gelen mesaj: kapanmış bara ait
+        bar = self.current.get(symbol)
+        if bar is not None and bucket > bar['timestamp']:
+            closed.append(self.current.pop(symbol))
+            self._last_closed[symbol] = bar['timestamp']
+            bar = None
+
+        if 'price' in message:
+            price, qty = float(message['price']), float(message.get('qty', 0.0))
+            if bar is None:
+                self.current[symbol] = {'timestamp': bucket, 'open': price, 'high': price,
+                                        'low': price, 'close': price, 'volume': qty}
+            else:
+                bar['high'] = max(bar['high'], price)
+                bar['low'] = min(bar['low'], price)
+                bar['close'] = price
+                bar['volume'] += qty
+        else:
+            bar = {'timestamp': bucket, 'open': float(message['open']), 'high': float(message['high']),
+                   'low': float(message['low']), 'close': float(message['close']),
+                   'volume': float(message['volume'])}
+            if message.get('closed'):
+                # Kapanmış kline hemen yayınlanır
+                self.current.pop(symbol, None)
+                self._last_closed[symbol] = bucket
+                closed.append(bar)
+            else:
+                self.current[symbol] = bar
+        return closed
+
+    def flush(self) -> Dict[str, Dict]:
+        """Açık barları kapanmış sayıp döndürür (akış sonunda)"""
+        bars, self.current = self.current, {}
+        for symbol, bar in bars.items():
+            self._last_closed[symbol] = bar['timestamp']
+        return bars
+
+
+# ---- Hat ----
+
+class MarketDataPipeline:
+    """
+    Kaynak -> BoundedQueue -> CandleAggregator -> TimeframePyramid -> SignalGenerator -> PaperTrader
+
+    Olay döngüsü yalnızca ucuz işleri yapar (kuyruk, bar birleştirme, piramit
+    güncellemesi, stop kontrolü). İndikatör hesabı executor'da çalışır; aynı
+    sembol için aynı anda en fazla bir değerlendirme yapılır, değerlendirme
+    sürerken kapanan yeni barlar tek bir sonraki değerlendirmede birleştirilir.
+    """
+
+    def __init__(
+        self,
+        source: MarketDataSource,
+        signal_generator: Any = None,
+        trader: Any = None,
+        timeframes: Sequence[str] = ('1m', '5m', '15m', '1h'),
+        queue_size: int = 10000,
+        policy: str = "block",
+        executor: Optional[Executor] = None,
+        min_bars: int = 50,
+        lookback: int = 500,
+        stop_loss_pct: float = 0.05,
+        on_signal: Optional[Callable[[str, Dict, float], None]] = None,
+        anomaly_detector: Any = None,
+        on_anomaly: Optional[Callable[[str, Dict], None]] = None
+    ):
+        """
+        Args:
+            source: Veri kaynağı
+            signal_generator: generate_consensus_signal(frames, symbol) sağlayan nesne
+            trader: PaperTrader benzeri nesne (positions, position_sizer, open/close_position)
+            timeframes: Piramitte üretilecek timeframe'ler (ilki temel akış)
+            queue_size: Kuyruk kapasitesi
+            policy: Kuyruk taşma politikası (QUEUE_POLICIES)
+            executor: İndikatör hesabı için havuz (varsayılan: tek iş parçacığı)
+            min_bars: Değerlendirme için gereken en az temel bar sayısı
+            lookback: Değerlendirmeye verilen son bar sayısı
+            stop_loss_pct: Açılan pozisyonların stop yüzdesi
+            on_signal: (sembol, sinyal sözlüğü, fiyat) geri çağrısı
+            anomaly_detector: Her kapanan temel barla güncellenen StreamingAnomalyDetector
+            on_anomaly: (sembol, anomali kaydı) geri çağrısı; pump aynı mum içinde bildirilir
+        """
+        self.source = source
+        self.signal_generator = signal_generator
+        self.trader = trader
+        self.timeframes = list(timeframes)
+        self.queue = BoundedQueue(queue_size, policy)
+        self.executor = executor
+        self.min_bars = min_bars
+        self.lookback = lookback
+        self.stop_loss_pct = stop_loss_pct
+        self.on_signal = on_signal
+        self.anomaly_detector = anomaly_detector
+        self.on_anomaly = on_anomaly
+
+        self.aggregator = CandleAggregator(self.timeframes[0])
+        self.pyramids: Dict[str, TimeframePyramid] = {}
+        self.last_price: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._dirty: Set[str] = set()
+        # Değerlendirmesi bekleyen en eski barın geliş anı (tick-to-decision ölçümü)
+        self._arrived: Dict[str, float] = {}
+        self.stats = {'messages': 0, 'bars': 0, 'evaluations': 0, 'signals': 0, 'anomalies': 0, 'errors': 0}
+
+    async def run(self) -> Dict[str, float]:
+        """Kaynak tükenene kadar çalışır; özet istatistikleri döndürür"""
+        own_executor = self.executor is None and self.signal_generator is not None
+        if own_executor:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="signals")
+        started = time.perf_counter()
+        try:
+            producer = asyncio.ensure_future(self._produce())
+            await self._consume()
+            await producer
+            for symbol, bar in self.aggregator.flush().items():
+                self._on_bar(symbol, bar)
+            while self._inflight:
+                await asyncio.gather(*list(self._inflight.values()), return_exceptions=True)
+        finally:
+            await self.source.close()
+            if own_executor:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+
+        elapsed = time.perf_counter() - started
+        return {
+            **self.stats,
+            'dropped': self.queue.dropped,
+            'coalesced': self.queue.coalesced,
+            'elapsed_sec': elapsed,
+            'messages_per_sec': self.stats['messages'] / elapsed if elapsed > 0 else 0.0
+        }
+
+    async def _produce(self):
+        try:
+            async for message in self.source.stream():
+                await self.queue.put(message, key=self._coalesce_key(message))
+        finally:
+            self.queue.close()
+
+    def _coalesce_key(self, message: Mapping) -> Optional[Hashable]:
+        """
+        Yalnızca kline mesajları birleştirilir: aynı barın sonraki güncellemesi tam
+        OHLCV taşır. İşlem tikleri her biri hacim ve fiyat uçları taşıdığı için
+        anahtarsız (birleştirilmeden) kuyruğa girer.
+        """
+        if 'price' in message:
+            return None
+        ts = timestamp_to_ns(message['timestamp'])
+        return message['symbol'], ts - ts % self.aggregator.tf_ns
+
+    async def _consume(self):
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                return
+            self.stats['messages'] += 1
+            for bar in self.aggregator.update(message):
+                self._on_bar(message['symbol'], bar)
+
+    def _on_bar(self, symbol: str, bar: Dict):
+        """Kapanan temel bar: piramidi günceller, stop'ları kontrol eder, değerlendirme planlar"""
+        self.stats['bars'] += 1
+        pyramid = self.pyramids.get(symbol)
+        if pyramid is None:
+            pyramid = self.pyramids[symbol] = TimeframePyramid(self.timeframes, max_bars=self.lookback)
+        pyramid.update({**bar, 'timestamp': pd.Timestamp(bar['timestamp'])})
+        price = bar['close']
+        self.last_price[symbol] = price
+
+        if self.anomaly_detector is not None:
+            anomaly = self.anomaly_detector.update_one(symbol, price, bar['volume'])
+            if anomaly is not None:
+                self.stats['anomalies'] += 1
+                if self.on_anomaly is not None:
+                    self.on_anomaly(symbol, anomaly)
+
+        if self.trader is not None:
+            for position, exit_price, reason in self.trader.check_stop_losses({symbol: price}):
+                self.trader.close_position(position, exit_price, reason)
+
+        if self.signal_generator is None or pyramid.bars[pyramid.base].size < self.min_bars:
+            return
+        self._arrived.setdefault(symbol, time.perf_counter())
+        if symbol in self._inflight:
+            self._dirty.add(symbol)
+        else:
+            self._schedule(symbol)
+
+    def _schedule(self, symbol: str):
+        # Piramit tamponları yerinde değiştiği için executor'a kopya verilir
+        frames = self.pyramids[symbol].frames(tail=self.lookback, copy=True)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.signal_generator.generate_consensus_signal, frames, symbol)
+        self._inflight[symbol] = future
+        self.stats['evaluations'] += 1
+        arrived = self._arrived.pop(symbol, None)
+        future.add_done_callback(lambda f, s=symbol, t=arrived: self._on_evaluated(s, f, t))
+
+    def _on_evaluated(self, symbol: str, future: asyncio.Future, arrived: Optional[float] = None):
+        del self._inflight[symbol]
+        try:
+            result = future.result()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"{symbol} sinyal hatası: {e}")
+            result = None
+
+        if result is not None:
+            self._apply_signal(symbol, result, self.last_price[symbol])
+        if arrived is not None:
+            monitor.record('tick_to_decision', time.perf_counter() - arrived, symbol, self.timeframes[0])
+        if symbol in self._dirty:
+            self._dirty.discard(symbol)
+            self._schedule(symbol)
+
+    def _apply_signal(self, symbol: str, result: Dict, price: float):
+        """PaperTrader.start_simulation ile aynı giriş/çıkış kuralları"""
+        signal = str(result.get('signal', 'HOLD'))
+        if 'BUY' in signal or 'SELL' in signal:
+            self.stats['signals'] += 1
+        if self.on_signal is not None:
+            self.on_signal(symbol, result, price)
+        if self.trader is None:
+            return
+
+        existing = self.trader.positions.get(symbol)
+        if 'BUY' in signal and existing is None:
+            stop_loss = price * (1 - self.stop_loss_pct)
+            sizing = self.trader.position_sizer.calculate_position_size(
+                symbol=symbol,
+                entry_price=price,
+                stop_loss=stop_loss,
+                portfolio_value=self.trader.balance,
+                strategy_type="fixed_fractional"
+            )
+            if sizing['size'] > 0:
+                self.trader.open_position(symbol, price, sizing['size'], stop_loss)
+        elif 'SELL' in signal and existing is not None:
+            self.trader.close_position(existing, price, "Signal Exit")
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesaj Veriyolu
+Mum, sinyal ve emir mesajları için partisyonlu, toplu üretici/tüketici soyutlaması (yerel / Kafka)
+"""
+
+import json
+import logging
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from kafka import KafkaConsumer, KafkaProducer, TopicPartition
+    KAFKA_AVAILABLE = True
+except ImportError:
+    KAFKA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# kafka_setup/setup.sh'deki crypto-trading önekli konular
+CANDLES_TOPIC = "crypto-trading.candles"
+SIGNALS_TOPIC = "crypto-trading.signals"
+ORDERS_TOPIC = "crypto-trading.orders"
+
+Serializer = Callable[[Any], bytes]
+Deserializer = Callable[[bytes], Any]
+
+
+def _json_serialize(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def _json_deserialize(data: bytes) -> Any:
+    return json.loads(data.decode('utf-8'))
+
+
+def partition_for(key: str, num_partitions: int) -> int:
+    """
+    Anahtarın (sembol) partisyonu
+
+    Her iki uygulamada da aynı crc32 tabanlı eşleme kullanılır; böylece bir
+    sembolün tüm mesajları aynı partisyona düşer ve sırası korunur.
+    """
+    return zlib.crc32(key.encode('utf-8')) % num_partitions
+
+
+def assigned_partitions(num_partitions: int, member_index: int, members: int) -> List[int]:
+    """Grup üyesine düşen partisyonlar (round-robin)"""
+    return [p for p in range(num_partitions) if p % members == member_index]
+
+
+@dataclass
+class Message:
+    """Tüketiciye teslim edilen mesaj"""
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[str]
+    value: Any
+    timestamp: float
+
+
+class Producer(ABC):
+    """
+    Toplu üretici tabanı (alt sınıflar num_partitions ve _deliver tanımlar)
+
+    Mesajlar (konu, partisyon) başına biriktirilir; partide batch_size mesaj
+    olduğunda hemen, aksi halde ilk mesaj linger_ms kadar beklediğinde arka plan
+    zamanlayıcısı tarafından teslim edilir (sessiz partisyonlarda da). flush()
+    tüm partileri hemen gönderir. Partiler tek bir teslim kilidi altında
+    kuyruktan alınıp teslim edilir; eşzamanlı göndericilerde de bir partisyonun
+    partileri sırasıyla yazılır.
+    """
+
+    def __init__(self, batch_size: int = 500, linger_ms: float = 5.0):
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._deliver_lock = threading.Lock()
+        self._batches: Dict[Tuple[str, int], List[Tuple[Optional[str], Any, float]]] = defaultdict(list)
+        self._first_added: Dict[Tuple[str, int], float] = {}
+        self._timer: Optional[threading.Thread] = None
+        self._closed = False
+        self.sent = 0
+
+    @abstractmethod
+    def num_partitions(self, topic: str) -> int:
+        """Konunun partisyon sayısı"""
+
+    @abstractmethod
+    def _deliver(self, topic: str, partition: int, batch: List[Tuple[Optional[str], Any, float]]):
+        """Bir partiyi (anahtar, değer, zaman) sırasıyla partisyona yazar"""
+
+    def send(self, topic: str, value: Any, key: Optional[str] = None):
+        """Mesajı sembol anahtarının partisyonuna sıraya koyar"""
+        partition = partition_for(key, self.num_partitions(topic)) if key is not None else 0
+        slot = (topic, partition)
+        with self._cond:
+            batch = self._batches[slot]
+            if not batch:
+                self._first_added[slot] = time.monotonic()
+                self._start_timer()
+                self._cond.notify()
+            batch.append((key, value, time.time()))
+            full = len(batch) >= self.batch_size
+        if full:
+            self._deliver_slots(lambda slot_, first: slot_ == slot)
+
+    def send_many(self, topic: str, items: Iterable[Tuple[Optional[str], Any]]):
+        """(anahtar, değer) çiftlerini sıraya koyar"""
+        for key, value in items:
+            self.send(topic, value, key)
+
+    def _deliver_slots(self, select: Callable[[Tuple[str, int], float], bool]):
+        """Seçilen partileri kuyruktan alıp teslim eder (alma ve teslim aynı kilit altında: sıra korunur)"""
+        with self._deliver_lock:
+            with self._lock:
+                slots = [slot for slot, first in self._first_added.items() if select(slot, first)]
+                ready = [(slot, self._batches.pop(slot)) for slot in slots]
+                for slot in slots:
+                    del self._first_added[slot]
+            for (topic, partition), batch in ready:
+                self._deliver(topic, partition, batch)
+                self.sent += len(batch)
+
+    def _start_timer(self):
+        """linger_ms için arka plan zamanlayıcısı (kilit altında çağrılır)"""
+        if self._timer is None and self.linger_ms > 0 and not self._closed:
+            self._timer = threading.Thread(target=self._linger_loop, name="producer-linger", daemon=True)
+            self._timer.start()
+
+    def _linger_loop(self):
+        linger = self.linger_ms / 1000.0
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._first_added:
+                        wait = min(self._first_added.values()) + linger - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+            now = time.monotonic()
+            self._deliver_slots(lambda slot, first: now - first >= linger)
+
+    def flush(self):
+        """Bekleyen tüm partileri gönderir"""
+        self._deliver_slots(lambda slot, first: True)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Consumer(ABC):
+    """Tüketici arayüzü: atanan partisyonlardan sıralı okuma ve offset commit"""
+
+    @abstractmethod
+    def poll(self, max_records: int = 500, timeout: float = 0.0) -> List[Message]:
+        """En fazla max_records mesajı partisyon sırasıyla döndürür"""
+
+    @abstractmethod
+    def commit(self):
+        """Okunan offset'leri kalıcılaştırır"""
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            records = self.poll(timeout=1.0)
+            if not records:
+                return
+            yield from records
+
+
+# ---- Yerel (süreç içi) uygulama ----
+
+class LocalBus:
+    """
+    Süreç içi mesaj veriyolu (testler ve tek süreçli çalıştırma için)
+
+    Her konu, partisyon başına yalnızca eklenen bir mesaj günlüğüdür; tüketici
+    grupları partisyon başına commit edilmiş offset tutar. Kafka ile aynı
+    partisyonlama ve sıralama garantilerini verir.
+    """
+
+    def __init__(self, num_partitions: int = 8):
+        self.default_partitions = num_partitions
+        self._logs: Dict[str, List[List[Message]]] = {}
+        self._offsets: Dict[Tuple[str, str, int], int] = {}
+        self._cond = threading.Condition()
+
+    def create_topic(self, topic: str, num_partitions: Optional[int] = None):
+        with self._cond:
+            if topic not in self._logs:
+                self._logs[topic] = [[] for _ in range(num_partitions or self.default_partitions)]
+
+    def num_partitions(self, topic: str) -> int:
+        self.create_topic(topic)
+        return len(self._logs[topic])
+
+    def producer(self, batch_size: int = 500, linger_ms: float = 5.0) -> Producer:
+        return _LocalProducer(self, batch_size, linger_ms)
+
+    def consumer(self, topic: str, group: str, partitions: Optional[Sequence[int]] = None,
+                 member_index: int = 0, members: int = 1) -> Consumer:
+        """
+        Args:
+            partitions: Okunacak partisyonlar; verilmezse member_index/members ile dağıtılır
+        """
+        n = self.num_partitions(topic)
+        if partitions is None:
+            partitions = assigned_partitions(n, member_index, members)
+        return _LocalConsumer(self, topic, group, list(partitions))
+
+    def _append(self, topic: str, partition: int, batch: List[Tuple[Optional[str], Any, float]]):
+        with self._cond:
+            log = self._logs[topic][partition]
+            offset = len(log)
+            log.extend(Message(topic, partition, offset + i, key, value, ts)
+                       for i, (key, value, ts) in enumerate(batch))
+            self._cond.notify_all()
+
+
+class _LocalProducer(Producer):
+    def __init__(self, bus: LocalBus, batch_size: int, linger_ms: float):
+        super().__init__(batch_size, linger_ms)
+        self.bus = bus
+
+    def num_partitions(self, topic: str) -> int:
+        return self.bus.num_partitions(topic)
+
+    def _deliver(self, topic, partition, batch):
+        self.bus._append(topic, partition, batch)
+
+
+class _LocalConsumer(Consumer):
+    def __init__(self, bus: LocalBus, topic: str, group: str, partitions: List[int]):
+        self.bus = bus
+        self.topic = topic
+        self.group = group
+        self.partitions = partitions
+        with bus._cond:
+            self._positions = {p: bus._offsets.get((group, topic, p), 0) for p in partitions}
+
+    def poll(self, max_records: int = 500, timeout: float = 0.0) -> List[Message]:
+        deadline = time.monotonic() + timeout
+        with self.bus._cond:
+            while True:
+                records = []
+                logs = self.bus._logs[self.topic]
+                for p in self.partitions:
+                    if len(records) >= max_records:
+                        break
+                    start = self._positions[p]
+                    chunk = logs[p][start:start + max_records - len(records)]
+                    self._positions[p] = start + len(chunk)
+                    records.extend(chunk)
+                remaining = deadline - time.monotonic()
+                if records or remaining <= 0:
+                    return records
+                self.bus._cond.wait(remaining)
+
+    def commit(self):
+        with self.bus._cond:
+            for p, position in self._positions.items():
+                self.bus._offsets[(self.group, self.topic, p)] = position
+
+
+# ---- Kafka uygulaması ----
+
+class KafkaBus:
+    """
+    Kafka mesaj veriyolu (kafka-python gerekli)
+
+    Partisyon, yerel veriyoluyla aynı olması için partition_for ile açıkça
+    seçilir. Toplama, kafka-python üreticisinin kendi linger_ms/batch_size
+    ayarlarıyla yapılır. Her süreç veya düğüm farklı partisyon kümesini tüketerek
+    sinyal üretimi yatay ölçeklenir.
+    """
+
+    def __init__(self, bootstrap_servers: str = "localhost:9092",
+                 serializer: Serializer = _json_serialize, deserializer: Deserializer = _json_deserialize):
+        if not KAFKA_AVAILABLE:
+            raise ImportError("KafkaBus için kafka-python gerekli (pip install kafka-python)")
+        self.bootstrap_servers = bootstrap_servers
+        self.serializer = serializer
+        self.deserializer = deserializer
+
+    def producer(self, batch_size: int = 500, linger_ms: float = 5.0) -> Producer:
+        return _KafkaProducer(self, batch_size, linger_ms)
+
+    def consumer(self, topic: str, group: str, partitions: Optional[Sequence[int]] = None,
+                 member_index: int = 0, members: int = 1) -> Consumer:
+        return _KafkaConsumer(self, topic, group, partitions, member_index, members)
+
+
+class _KafkaProducer(Producer):
+    def __init__(self, bus: KafkaBus, batch_size: int, linger_ms: float):
+        # Partiler kafka-python içinde oluşur; taban sınıfın tamponu kullanılmaz
+        super().__init__(batch_size=1, linger_ms=0)
+        self.producer = KafkaProducer(
+            bootstrap_servers=bus.bootstrap_servers,
+            linger_ms=int(linger_ms),
+            batch_size=batch_size * 256,  # kafka-python batch_size bayt cinsindendir
+            key_serializer=lambda k: k.encode('utf-8') if k is not None else None,
+            value_serializer=bus.serializer
+        )
+        self._partitions: Dict[str, int] = {}
+
+    def num_partitions(self, topic: str) -> int:
+        n = self._partitions.get(topic)
+        if n is None:
+            n = self._partitions[topic] = len(self.producer.partitions_for(topic) or [0])
+        return n
+
+    def _deliver(self, topic, partition, batch):
+        for key, value, ts in batch:
+            self.producer.send(topic, value=value, key=key, partition=partition, timestamp_ms=int(ts * 1000))
+
+    def flush(self):
+        super().flush()
+        self.producer.flush()
+
+    def close(self):
+        self.flush()
+        self.producer.close()
+
+
+class _KafkaConsumer(Consumer):
+    def __init__(self, bus: KafkaBus, topic: str, group: str, partitions: Optional[Sequence[int]],
+                 member_index: int, members: int):
+        self.consumer = KafkaConsumer(
+            bootstrap_servers=bus.bootstrap_servers,
+            group_id=group,
+            enable_auto_commit=False,
+            auto_offset_reset='earliest',
+            key_deserializer=lambda k: k.decode('utf-8') if k is not None else None,
+            value_deserializer=bus.deserializer
+        )
+        if partitions is None and members > 1:
+            n = len(self.consumer.partitions_for_topic(topic) or [0])
+            partitions = assigned_partitions(n, member_index, members)
+        if partitions is None:
+            self.consumer.subscribe([topic])
+        else:
+            self.consumer.assign([TopicPartition(topic, p) for p in partitions])
+
+    def poll(self, max_records: int = 500, timeout: float = 0.0) -> List[Message]:
+        batches = self.consumer.poll(timeout_ms=int(timeout * 1000), max_records=max_records)
+        return [
+            Message(r.topic, r.partition, r.offset, r.key, r.value, r.timestamp / 1000)
+            for tp in sorted(batches, key=lambda tp: tp.partition)
+            for r in batches[tp]
+        ]
+
+    def commit(self):
+        self.consumer.commit()
+
+    def close(self):
+        self.consumer.close()
+
+
+# ---- Partisyon tabanlı sinyal işçisi ----
+
+def run_signal_worker(bus, signal_generator, group: str = "signal-workers", member_index: int = 0,
+                      members: int = 1, timeframes: Sequence[str] = ('1m', '5m', '15m', '1h'),
+                      min_bars: int = 50, max_idle: Optional[float] = None,
+                      candles_topic: str = CANDLES_TOPIC, signals_topic: str = SIGNALS_TOPIC) -> int:
+    """
+    Atanan partisyonlardaki mumları tüketip sinyal üretir ve sinyal konusuna yazar
+
+    Aynı sembol hep aynı partisyonda olduğundan her işçi kendi sembollerinin
+    piramidini tutar; işçi sayısı artırılarak süreç veya düğümler arasında
+    ölçeklenir.
+
+    Args:
+        max_idle: Bu kadar saniye mesaj gelmezse döner (None: sonsuza kadar)
+
+    Returns:
+        Üretilen sinyal sayısı
+    """
+    from timeframe_pyramid import TimeframePyramid
+
+    consumer = bus.consumer(candles_topic, group, member_index=member_index, members=members)
+    producer = bus.producer()
+    pyramids: Dict[str, TimeframePyramid] = {}
+    produced = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            records = consumer.poll(timeout=0.5)
+            if not records:
+                if max_idle is not None and time.monotonic() - idle_since >= max_idle:
+                    return produced
+                continue
+            idle_since = time.monotonic()
+
+            touched = {}
+            for record in records:
+                candle = record.value
+                pyramid = pyramids.get(record.key)
+                if pyramid is None:
+                    pyramid = pyramids[record.key] = TimeframePyramid(timeframes)
+                pyramid.update(candle)
+                touched[record.key] = candle
+            # Bir poll içinde aynı sembol için yalnızca son bar değerlendirilir
+            for symbol, candle in touched.items():
+                pyramid = pyramids[symbol]
+                if pyramid.bars[pyramid.base].size < min_bars:
+                    continue
+                try:
+                    result = signal_generator.generate_consensus_signal(pyramid.frames(), symbol)
+                except Exception as e:
+                    logger.error(f"{symbol} sinyal hatası: {e}")
+                    continue
+                producer.send(signals_topic, {
+                    'symbol': symbol,
+                    'timestamp': candle['timestamp'],
+                    'signal': result.get('signal'),
+                    'confidence': result.get('confidence'),
+                    'price': candle['close']
+                }, key=symbol)
+                produced += 1
+            producer.flush()
+            consumer.commit()
+    finally:
+        producer.close()
+        consumer.close()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Emir Defteri ve Eşleştirme Motoru
+Fiyat seviyesi yığınları, limit/piyasa emirleri, kısmi dolumlar ve TWAP/VWAP alt emir zamanlayıcıları
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+BUY = "BUY"
+SELL = "SELL"
+
+_EPS = 1e-12
+
+
+class Fill(NamedTuple):
+    """Tek bir eşleşme (taker emrin bakış açısından)"""
+    order_id: int
+    side: str
+    price: float
+    qty: float
+    maker_id: int
+    maker_owner: Optional[str]
+    owner: Optional[str]
+
+
+class ExecutionReport(NamedTuple):
+    """Bir emrin toplam sonucu"""
+    filled: float
+    avg_price: float
+    remaining: float
+    fills: List[Fill]
+
+
+class _Order:
+    __slots__ = ('id', 'side', 'price', 'remaining', 'owner')
+
+    def __init__(self, order_id: int, side: str, price: float, qty: float, owner: Optional[str]):
+        self.id = order_id
+        self.side = side
+        self.price = price
+        self.remaining = qty
+        self.owner = owner
+
+
+class _Level:
+    """Tek fiyat seviyesi: FIFO emir kuyruğu ve toplam miktar"""
+    __slots__ = ('qty', 'orders', 'depth')
+
+    def __init__(self):
+        self.qty = 0.0
+        self.orders: Deque[_Order] = deque()
+        self.depth: Optional[_Order] = None  # Borsa L2 akışından gelen isimsiz miktar
+
+
+def _report(fills: List[Fill], remaining: float) -> ExecutionReport:
+    filled = sum(f.qty for f in fills)
+    notional = sum(f.qty * f.price for f in fills)
+    return ExecutionReport(filled, notional / filled if filled > 0 else float('nan'), remaining, fills)
+
+
+class OrderBook:
+    """
+    Tek sembol için süreç içi limit emir defteri
+
+    Her tarafta fiyat -> seviye sözlüğü ve en iyi fiyat için bir yığın tutulur
+    (alışlar negatif fiyatla). Yeni seviye ve iptal O(log n); boşalan seviyelerin
+    yığın kayıtları tembel silinir, en iyi fiyat okunurken atlanır. Seviye
+    içinde fiyat-zaman önceliği vardır. Borsadan gelen L2 derinlik güncellemeleri
+    (set_level) seviyedeki isimsiz bir emrin miktarını ayarlar; karşı tarafı
+    kesen artışlar, bekleyen limit emirlerle eşleşir - böylece kendi emirlerimiz
+    gerçek derinliğe karşı pasif olarak dolar.
+    """
+
+    def __init__(self, symbol: str = "", tick_size: float = 0.0):
+        """
+        Args:
+            symbol: İşlem sembolü
+            tick_size: Fiyat adımı (> 0 ise fiyatlar bu adıma yuvarlanır)
+        """
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self._levels: Dict[str, Dict[float, _Level]] = {BUY: {}, SELL: {}}
+        self._heaps: Dict[str, List[float]] = {BUY: [], SELL: []}
+        self._in_heap: Dict[str, Set[float]] = {BUY: set(), SELL: set()}
+        self._orders: Dict[int, _Order] = {}
+        self._ids = itertools.count(1)
+        self.updates = 0
+        self.last_trade: Optional[float] = None
+
+    def _price(self, price: float) -> float:
+        if self.tick_size > 0:
+            return round(round(price / self.tick_size) * self.tick_size, 12)
+        return float(price)
+
+    # ---- Seviye yönetimi ----
+
+    def _level(self, side: str, price: float) -> _Level:
+        levels = self._levels[side]
+        level = levels.get(price)
+        if level is None:
+            level = levels[price] = _Level()
+            if price not in self._in_heap[side]:
+                self._in_heap[side].add(price)
+                heapq.heappush(self._heaps[side], -price if side == BUY else price)
+        return level
+
+    def _best(self, side: str) -> Optional[float]:
+        """En iyi fiyat; boşalmış seviyelerin yığın kayıtları burada atılır"""
+        heap = self._heaps[side]
+        levels = self._levels[side]
+        while heap:
+            price = -heap[0] if side == BUY else heap[0]
+            level = levels.get(price)
+            if level is not None and level.qty > _EPS:
+                return price
+            heapq.heappop(heap)
+            self._in_heap[side].discard(price)
+            if level is not None:
+                del levels[price]
+        return None
+
+    def best_bid(self) -> Optional[float]:
+        return self._best(BUY)
+
+    def best_ask(self) -> Optional[float]:
+        return self._best(SELL)
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self._best(BUY), self._best(SELL)
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+
+    def spread(self) -> Optional[float]:
+        bid, ask = self._best(BUY), self._best(SELL)
+        return ask - bid if bid is not None and ask is not None else None
+
+    def depth(self, side: str, levels: int = 10) -> List[Tuple[float, float]]:
+        """En iyi fiyattan başlayarak (fiyat, miktar) listesi"""
+        book = self._levels[side]
+        prices = [p for p, level in book.items() if level.qty > _EPS]
+        best = heapq.nlargest(levels, prices) if side == BUY else heapq.nsmallest(levels, prices)
+        return [(p, book[p].qty) for p in best]
+
+    # ---- Eşleştirme ----
+
+    def _match(self, order: _Order, limit: Optional[float]) -> List[Fill]:
+        """Gelen emri karşı tarafla fiyat-zaman önceliğinde eşleştirir"""
+        opposite = SELL if order.side == BUY else BUY
+        levels = self._levels[opposite]
+        fills = []
+        while order.remaining > _EPS:
+            price = self._best(opposite)
+            if price is None:
+                break
+            if limit is not None and (price > limit if order.side == BUY else price < limit):
+                break
+            level = levels[price]
+            queue = level.orders
+            while order.remaining > _EPS and queue:
+                maker = queue[0]
+                if maker.remaining <= _EPS:
+                    queue.popleft()  # İptal edilmiş (tembel silinen) emir
+                    continue
+                qty = min(order.remaining, maker.remaining)
+                maker.remaining -= qty
+                order.remaining -= qty
+                level.qty -= qty
+                fills.append(Fill(order.id, order.side, price, qty, maker.id, maker.owner, order.owner))
+                if maker.remaining <= _EPS:
+                    queue.popleft()
+                    self._orders.pop(maker.id, None)
+                    if maker is level.depth:
+                        level.depth = None
+            if not queue:
+                level.qty = 0.0
+        if fills:
+            self.last_trade = fills[-1].price
+        return fills
+
+    def _rest(self, order: _Order):
+        level = self._level(order.side, order.price)
+        level.orders.append(order)
+        level.qty += order.remaining
+        self._orders[order.id] = order
+
+    # ---- Emirler ----
+
+    def submit_limit(self, side: str, price: float, qty: float, owner: Optional[str] = None) -> Tuple[int, ExecutionReport]:
+        """
+        Limit emir: karşı tarafı kesen kısmı hemen dolar, kalanı deftere yazılır
+
+        Returns:
+            (emir no, anlık dolum raporu)
+        """
+        order = _Order(next(self._ids), side, self._price(price), float(qty), owner)
+        fills = self._match(order, order.price)
+        if order.remaining > _EPS:
+            self._rest(order)
+        return order.id, _report(fills, order.remaining)
+
+    def submit_market(self, side: str, qty: float, owner: Optional[str] = None,
+                      limit_price: Optional[float] = None) -> ExecutionReport:
+        """
+        Piyasa emri: derinliği en iyi fiyattan yürür; dolmayan kısım iptal edilir
+
+        Args:
+            limit_price: Koruma fiyatı (bu fiyatın ötesindeki seviyelere gidilmez)
+        """
+        order = _Order(next(self._ids), side, 0.0, float(qty), owner)
+        fills = self._match(order, limit_price)
+        return _report(fills, order.remaining)
+
+    def submit_market_notional(self, side: str, notional: float, owner: Optional[str] = None,
+                               limit_price: Optional[float] = None) -> ExecutionReport:
+        """Tutar (quote) cinsinden piyasa emri: miktar derinlikten yürüyerek bulunur"""
+        qty = self.quantity_for_notional(side, notional, limit_price)
+        if qty <= 0:
+            return _report([], 0.0)
+        return self.submit_market(side, qty, owner, limit_price)
+
+    def cancel(self, order_id: int) -> bool:
+        """Bekleyen emri iptal eder (kuyruk kaydı tembel silinir)"""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        level = self._levels[order.side].get(order.price)
+        if level is not None:
+            level.qty -= order.remaining
+            if level.depth is order:
+                level.depth = None
+        order.remaining = 0.0
+        return True
+
+    def order(self, order_id: int) -> Optional[Dict]:
+        order = self._orders.get(order_id)
+        if order is None:
+            return None
+        return {'id': order.id, 'side': order.side, 'price': order.price,
+                'remaining': order.remaining, 'owner': order.owner}
+
+    # ---- Piyasa verisi ----
+
+    def set_level(self, side: str, price: float, qty: float) -> List[Fill]:
+        """
+        L2 derinlik güncellemesi: seviyedeki borsa miktarını qty yapar (0: siler)
+
+        Artış karşı taraftaki bekleyen emirlerle kesişiyorsa önce eşleşir; dönen
+        dolumlar bekleyen (kendi) emirlerimizin pasif dolumlarıdır.
+        """
+        self.updates += 1
+        price = self._price(price)
+        level = self._levels[side].get(price)
+        current = level.depth.remaining if level is not None and level.depth is not None else 0.0
+        delta = qty - current
+        if delta < -_EPS:
+            depth = level.depth
+            depth.remaining += delta
+            level.qty += delta
+            if depth.remaining <= _EPS:
+                # Kuyruktaki kaydı tembel silinir
+                depth.remaining = 0.0
+                level.depth = None
+                self._orders.pop(depth.id, None)
+            return []
+        if delta <= _EPS:
+            return []
+
+        incoming = _Order(next(self._ids), side, price, delta, None)
+        fills = self._match(incoming, price)
+        if incoming.remaining > _EPS:
+            level = self._level(side, price)
+            if level.depth is not None:
+                level.depth.remaining += incoming.remaining
+                level.qty += incoming.remaining
+            else:
+                level.depth = incoming
+                self._rest(incoming)
+        # Pasif dolumlar kendi emirlerimizin bakış açısıyla raporlanır (bayat borsa seviyeleriyle kesişmeler hariç)
+        return [Fill(f.maker_id, BUY if f.side == SELL else SELL, f.price, f.qty, f.order_id, None, f.maker_owner)
+                for f in fills if f.maker_owner is not None]
+
+    def apply_updates(self, sides: Sequence[str], prices: Sequence[float], qtys: Sequence[float]) -> List[Fill]:
+        """Toplu L2 güncellemesi (kayıttan tekrar oynatma); tüm pasif dolumları döndürür"""
+        fills = []
+        set_level = self.set_level
+        for side, price, qty in zip(sides, np.asarray(prices, dtype=np.float64).tolist(),
+                                    np.asarray(qtys, dtype=np.float64).tolist()):
+            result = set_level(side, price, qty)
+            if result:
+                fills.extend(result)
+        return fills
+
+    def apply_snapshot(self, bids: Iterable[Tuple[float, float]], asks: Iterable[Tuple[float, float]]):
+        """Tam derinlik görüntüsü: borsa miktarları sıfırlanır, kendi bekleyen emirler korunur"""
+        for side in (BUY, SELL):
+            for price, level in list(self._levels[side].items()):
+                if level.depth is not None:
+                    self.set_level(side, price, 0.0)
+        for price, qty in bids:
+            self.set_level(BUY, price, qty)
+        for price, qty in asks:
+            self.set_level(SELL, price, qty)
+
+    # ---- Tahmin ----
+
+    def quantity_for_notional(self, side: str, notional: float, limit_price: Optional[float] = None) -> float:
+        """side yönünde notional tutarla alınabilecek/satılabilecek miktar (emir göndermeden)"""
+        opposite = SELL if side == BUY else BUY
+        remaining = notional
+        qty = 0.0
+        for price, level_qty in self.depth(opposite, levels=len(self._levels[opposite])):
+            if limit_price is not None and (price > limit_price if side == BUY else price < limit_price):
+                break
+            take = min(level_qty, remaining / price)
+            qty += take
+            remaining -= take * price
+            if remaining <= _EPS:
+                break
+        return qty
+
+    def estimate(self, side: str, qty: float) -> ExecutionReport:
+        """Piyasa emrinin ortalama fiyatı ve dolabilecek miktarı (defter değişmez)"""
+        opposite = SELL if side == BUY else BUY
+        remaining = qty
+        fills = []
+        for price, level_qty in self.depth(opposite, levels=len(self._levels[opposite])):
+            take = min(level_qty, remaining)
+            fills.append(Fill(0, side, price, take, 0, None, None))
+            remaining -= take
+            if remaining <= _EPS:
+                break
+        return _report(fills, max(remaining, 0.0))
+
+
+# ---- Alt emir zamanlayıcıları ----
+
+class _SlicedExecution:
+    """Ebeveyn emri zamana yayılmış piyasa alt emirleriyle yürütür"""
+
+    def __init__(self, book: OrderBook, side: str, quantity: float, times: Sequence[int],
+                 weights: Sequence[float], limit_price: Optional[float] = None, owner: Optional[str] = None):
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(times) != len(weights) or len(times) == 0 or weights.sum() <= 0:
+            raise ValueError("Dilim zamanları ve ağırlıkları aynı uzunlukta ve pozitif olmalı")
+        self.book = book
+        self.side = side
+        self.quantity = float(quantity)
+        self.limit_price = limit_price
+        self.owner = owner
+        self.times = np.asarray(times, dtype=np.int64)
+        self.targets = np.cumsum(weights / weights.sum()) * self.quantity  # Dilim sonunda ulaşılacak kümülatif hedef
+        self._next = 0
+        self.fills: List[Fill] = []
+        self.filled = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self._next >= len(self.times) or self.quantity - self.filled <= _EPS
+
+    @property
+    def avg_price(self) -> float:
+        return _report(self.fills, 0.0).avg_price
+
+    def step(self, now) -> List[Fill]:
+        """
+        Zamanı gelen dilimleri yürütür
+
+        Dolmayan miktar (derinlik yetersizliği veya limit) sonraki dilime aktarılır;
+        son dilim kalan her şeyi limit dahilinde süpürür.
+        """
+        now = int(now.value if hasattr(now, 'value') else now)
+        fills = []
+        while self._next < len(self.times) and self.times[self._next] <= now:
+            target = self.quantity if self._next == len(self.times) - 1 else self.targets[self._next]
+            qty = target - self.filled
+            self._next += 1
+            if qty <= _EPS:
+                continue
+            report = self.book.submit_market(self.side, qty, self.owner, self.limit_price)
+            fills.extend(report.fills)
+            self.filled += report.filled
+        self.fills.extend(fills)
+        return fills
+
+    def report(self) -> ExecutionReport:
+        return _report(self.fills, self.quantity - self.filled)
+
+
+class TWAPScheduler(_SlicedExecution):
+    """Eşit aralıklı, eşit büyüklükte dilimler"""
+
+    def __init__(self, book: OrderBook, side: str, quantity: float, start, end, slices: int,
+                 limit_price: Optional[float] = None, owner: Optional[str] = None):
+        start, end = (int(t.value if hasattr(t, 'value') else t) for t in (start, end))
+        times = np.linspace(start, end, slices).astype(np.int64)
+        super().__init__(book, side, quantity, times, np.ones(slices), limit_price, owner)
+
+
+class VWAPScheduler(_SlicedExecution):
+    """
+    Hacim profiline orantılı dilimler
+
+    volume_profile genellikle geçmiş günlerin aynı saat dilimlerindeki ortalama
+    hacimleridir; dilim büyüklükleri bu paylara göre dağıtılır.
+    """
+
+    def __init__(self, book: OrderBook, side: str, quantity: float, start, end,
+                 volume_profile: Sequence[float], limit_price: Optional[float] = None, owner: Optional[str] = None):
+        start, end = (int(t.value if hasattr(t, 'value') else t) for t in (start, end))
+        times = np.linspace(start, end, len(volume_profile)).astype(np.int64)
+        super().__init__(book, side, quantity, times, volume_profile, limit_price, owner)
+
+
+# ---- PaperTrader entegrasyonu ----
+
+class ExecutionVenue:
+    """
+    Sembol -> OrderBook; PaperTrader emirlerini gerçek derinliğe karşı doldurur
+
+    Defteri olmayan (veya boş) sembollerde execute None döner ve çağıran taraf
+    referans fiyatla anında dolum varsayımına geri düşer.
+    """
+
+    def __init__(self, tick_size: float = 0.0, owner: str = "paper"):
+        self.tick_size = tick_size
+        self.owner = owner
+        self.books: Dict[str, OrderBook] = {}
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol, self.tick_size)
+        return book
+
+    def execute(self, symbol: str, side: str, qty: Optional[float] = None, notional: Optional[float] = None,
+                limit_price: Optional[float] = None) -> Optional[ExecutionReport]:
+        """Miktar veya tutar cinsinden piyasa emri; karşı tarafta derinlik yoksa None"""
+        book = self.books.get(symbol)
+        if book is None or (book.best_ask() if side == BUY else book.best_bid()) is None:
+            return None
+        if notional is not None:
+            return book.submit_market_notional(side, notional, self.owner, limit_price)
+        return book.submit_market(side, qty, self.owner, limit_price)
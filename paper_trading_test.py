@@ -7,18 +7,27 @@ Simülasyon ortamında trading sistemini test et
 import sys
 import os
 import time
-from typing import Dict, List, Tuple
+import logging
+from typing import Dict, List, Sequence, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 
+logger = logging.getLogger(__name__)
+
 # Add current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import custom modules
 try:
     from position_sizing import PositionSizer, RiskConfig
+    from portfolio_risk import PortfolioRiskLedger
+    from position_book import PositionBook
+    from trade_journal import TradeJournal
+    from latency_monitor import timed
+    from market_data_generator import generate_market_data
+    from order_book import BUY, SELL, ExecutionVenue
     print("✅ Position Sizer modülü yüklendi")
 except ImportError as e:
     print(f"❌ Position Sizer yüklenemedi: {e}")
@@ -38,36 +47,58 @@ class PaperTrader:
     Kağıt Trading Simülatörü
     """
     
-    def __init__(self, initial_balance: float = 10000):
+    def __init__(self, initial_balance: float = 10000, risk_config: RiskConfig = None,
+                 venue: ExecutionVenue = None, trailing_stop_pct: float = None):
+        """
+        Args:
+            venue: Verilirse emirler sembolün emir defterindeki derinliğe karşı doldurulur
+                (defteri olmayan sembollerde referans fiyattan anında dolum)
+            trailing_stop_pct: Verilirse stop'lar her kontrolde fiyatın bu oran altına
+                çekilir (yalnızca yukarı); risk defteri başlangıç stop'uyla kalır
+        """
         self.initial_balance = initial_balance
+        self.venue = venue
+        self.trailing_stop_pct = trailing_stop_pct
         self.balance = initial_balance
-        self.positions = []
-        self.trades = []
-        self.pnl_history = []
-        self.position_sizer = PositionSizer()
+        self.positions = PositionBook()
+        self.journal = TradeJournal(initial_balance)
+        self.risk_ledger = PortfolioRiskLedger(risk_config)
+        self.position_sizer = PositionSizer(self.risk_ledger.risk_config, ledger=self.risk_ledger)
         
+    @property
+    def trades(self) -> Sequence[Dict]:
+        """İşlem kayıtları (günlüğün salt okunur list-of-dict görünümü)"""
+        return self.journal.trades
+    
+    @property
+    def pnl_history(self) -> Sequence[Dict]:
+        """Günlük portföy kayıtları (günlüğün salt okunur list-of-dict görünümü)"""
+        return self.journal.pnl_history
+    
     def calculate_portfolio_value(self, current_prices: Dict[str, float]) -> float:
         """Mevcut portföy değerini hesapla"""
-        total_value = self.balance
-        
-        for position in self.positions:
-            symbol = position['symbol']
-            size = position['size']
-            entry_price = position['entry_price']
-            
-            if symbol in current_prices:
-                current_value = size * current_prices[symbol]
-                entry_value = size * entry_price
-                unrealized_pnl = current_value - entry_value
-                total_value += unrealized_pnl
-                
-        return total_value
+        # Sembol başına toplam miktar/maliyet üzerinden: pozisyon sayısından bağımsız
+        return self.balance + self.positions.unrealized_pnl(current_prices)
     
+    @timed('open_position', symbol_arg='symbol')
     def open_position(self, symbol: str, entry_price: float, size: float, 
                      stop_loss: float, strategy_type: str = "fixed_fractional") -> bool:
         """Yeni pozisyon aç"""
         if size > self.balance:
             return False
+        if not self.risk_ledger.can_open(size, entry_price, stop_loss, self.balance):
+            print(f"⚠️ Risk limiti: {symbol} pozisyonu açılmadı")
+            return False
+        
+        if self.venue is not None:
+            report = self.venue.execute(symbol, BUY, notional=size)
+            if report is not None:
+                if report.filled <= 0:
+                    logger.warning(f"Derinlik yok: {symbol} pozisyonu açılmadı")
+                    return False
+                # Kayma ve kısmi dolum: giriş ortalama dolum fiyatı, tutar dolan kısım
+                entry_price = report.avg_price
+                size = report.filled * report.avg_price
             
         position = {
             'symbol': symbol,
@@ -78,52 +109,82 @@ class PaperTrader:
             'timestamp': datetime.now()
         }
         
-        self.positions.append(position)
+        self.positions.add(position)
         self.balance -= size
+        self.risk_ledger.add(id(position), symbol, size, entry_price, stop_loss)
         
         print(f"📈 Pozisyon açıldı: {symbol} - {size:.2f} @ {entry_price}")
         return True
     
+    @timed('close_position')
     def close_position(self, position: dict, exit_price: float, reason: str = "Exit") -> float:
-        """Pozisyonu kapat"""
+        """
+        Pozisyonu kapat
+        
+        Venue derinliği yetmezse yalnızca dolan miktar kapanır (kısmi kapanış olarak
+        kaydedilir); kalan kısım aynı giriş fiyatı ve stop'la açık kalır.
+        """
         size = position['size']
         entry_price = position['entry_price']
         symbol = position['symbol']
+        remaining = 0.0
         
-        pnl = (exit_price - entry_price) * size
+        if self.venue is not None:
+            qty = size / entry_price
+            report = self.venue.execute(symbol, SELL, qty=qty)
+            if report is not None:
+                if report.filled <= 0:
+                    logger.warning(f"Derinlik yok: {symbol} pozisyonu kapatılamadı")
+                    self._keep_open(position, size)
+                    return 0.0
+                # Kapanan tutar dolan miktardan; PnL yalnızca bu kısım için
+                exit_price = report.avg_price
+                closed = min(size, report.filled * entry_price)
+                remaining = size - closed if report.remaining > 0 else 0.0
+                size = closed
+                if remaining > 0:
+                    reason += " (Kısmi)"
         
-        # Trade kaydı
-        trade = {
-            'symbol': symbol,
-            'size': size,
-            'entry_price': entry_price,
-            'exit_price': exit_price,
-            'pnl': pnl,
-            'reason': reason,
-            'timestamp': datetime.now()
-        }
+        # size quote cinsinden tutardır: getiri oranı × tutar
+        pnl = size * (exit_price / entry_price - 1)
         
-        self.trades.append(trade)
+        # Trade kaydı
+        self.journal.record_trade(symbol, size, entry_price, exit_price, pnl, reason, datetime.now())
         self.balance += size + pnl
+        if remaining > 0:
+            self._keep_open(position, remaining)
+        else:
+            self.positions.remove(position)
+            self.risk_ledger.remove(id(position))
         
         print(f"📉 Pozisyon kapandı: {symbol} - PnL: {pnl:.2f} ({reason})")
         return pnl
     
+    def _keep_open(self, position: dict, size: float):
+        """Kapanamayan kısmı deftere geri koyar (stop yığınından çekilmiş olabilir)"""
+        self.positions.remove(position)
+        if size != position['size']:
+            self.risk_ledger.resize(id(position), size)
+        position['size'] = size
+        self.positions.add(position)
+    
     def check_stop_losses(self, current_prices: Dict[str, float]) -> List[dict]:
         """Stop loss kontrolü"""
         closed_positions = []
         
-        for position in self.positions[:]:  # Liste üzerinde iterasyon
-            symbol = position['symbol']
-            stop_loss = position['stop_loss']
-            
-            if symbol in current_prices:
-                current_price = current_prices[symbol]
-                
-                # Long pozisyon için stop loss kontrolü
-                if current_price <= stop_loss:
-                    closed_positions.append((position, current_price, "Stop Loss"))
-                    self.positions.remove(position)
+        # Yalnızca fiyatı gelen sembollerde, stop'u geçilen pozisyonlar yığından çekilir
+        for symbol, current_price in current_prices.items():
+            if symbol not in self.positions:
+                continue
+            # Long pozisyon için stop loss kontrolü
+            for position in self.positions.pop_triggered(symbol, current_price):
+                closed_positions.append((position, current_price, "Stop Loss"))
+            # Trailing stop: kalan pozisyonların stop'u bu fiyata göre yukarı çekilir
+            if self.trailing_stop_pct:
+                trail = current_price * (1 - self.trailing_stop_pct)
+                for position in self.positions.positions_for(symbol):
+                    if trail > position['stop_loss']:
+                        self.positions.update_stop(position, trail)
                     
         return closed_positions
     
@@ -172,7 +233,7 @@ class PaperTrader:
                 signal = self.generate_simple_signal(df)
                 
                 # Pozisyon yönetimi
-                existing_position = next((p for p in self.positions if p['symbol'] == symbol), None)
+                existing_position = self.positions.get(symbol)
                 
                 if signal == "BUY" and not existing_position:
                     # Yeni pozisyon aç
@@ -203,14 +264,9 @@ class PaperTrader:
             
             # Portföy durumu
             portfolio_value = self.calculate_portfolio_value(current_prices)
-            daily_pnl = portfolio_value - (self.initial_balance + sum([t['pnl'] for t in self.trades]))
+            daily_pnl = portfolio_value - (self.initial_balance + self.journal.total_pnl)
             
-            self.pnl_history.append({
-                'date': start_date + timedelta(days=day),
-                'portfolio_value': portfolio_value,
-                'daily_pnl': daily_pnl,
-                'balance': self.balance
-            })
+            self.journal.record_equity(start_date + timedelta(days=day), portfolio_value, daily_pnl, self.balance)
             
             print(f"💼 Portföy Değeri: ${portfolio_value:.2f}")
             print(f"📈 Günlük P&L: ${daily_pnl:.2f}")
@@ -219,43 +275,42 @@ class PaperTrader:
     
     def generate_report(self) -> str:
         """Simülasyon raporu üret"""
-        if not self.pnl_history:
+        journal = self.journal
+        if not len(journal.equity_column('portfolio_value')):
             return "Henüz simülasyon yapılmadı."
-            
-        final_value = self.pnl_history[-1]['portfolio_value']
-        total_return = ((final_value - self.initial_balance) / self.initial_balance) * 100
-        
-        winning_trades = [t for t in self.trades if t['pnl'] > 0]
-        losing_trades = [t for t in self.trades if t['pnl'] < 0]
-        
-        win_rate = len(winning_trades) / len(self.trades) * 100 if self.trades else 0
         
+        # Tüm değerler günlükteki artımlı sayaçlardan gelir (işlem sayısından bağımsız)
         report = f"""
 📊 PAPER TRADING SİMÜLASYONU RAPORU
 =====================================
 💰 Başlangıç Bakiyesi: ${self.initial_balance:.2f}
-📈 Final Portföy Değeri: ${final_value:.2f}
-🎯 Toplam Getiri: {total_return:.2f}%
+📈 Final Portföy Değeri: ${journal.final_value:.2f}
+🎯 Toplam Getiri: {journal.total_return_pct:.2f}%
 
 📈 İŞLEM İSTATİSTİKLERİ:
-• Toplam İşlem: {len(self.trades)}
-• Kazanan İşlem: {len(winning_trades)}
-• Kaybeden İşlem: {len(losing_trades)}
-• Başarı Oranı: {win_rate:.1f}%
+• Toplam İşlem: {journal.num_trades}
+• Kazanan İşlem: {journal.wins}
+• Kaybeden İşlem: {journal.losses}
+• Başarı Oranı: {journal.win_rate:.1f}%
 
 💵 KAR/ZARAR DETAYLARI:
-• Toplam Kar: ${sum([t['pnl'] for t in winning_trades]):.2f}
-• Toplam Zarar: ${sum([t['pnl'] for t in losing_trades]):.2f}
-• Net P&L: ${sum([t['pnl'] for t in self.trades]):.2f}
+• Toplam Kar: ${journal.gross_profit:.2f}
+• Toplam Zarar: ${journal.gross_loss:.2f}
+• Net P&L: ${journal.total_pnl:.2f}
 
 🎲 ORTALAMA İŞLEM:
-• Ortalama Kazanç: ${np.mean([t['pnl'] for t in winning_trades]):.2f} (Kazanan)
-• Ortalama Kayıp: ${np.mean([t['pnl'] for t in losing_trades]):.2f} (Kaybeden)
+• Ortalama Kazanç: ${journal.avg_win:.2f} (Kazanan)
+• Ortalama Kayıp: ${journal.avg_loss:.2f} (Kaybeden)
+
+📉 RİSK METRİKLERİ:
+• Maksimum Drawdown: {journal.max_drawdown * 100:.2f}%
+• Sharpe Oranı (yıllık): {journal.sharpe_ratio(365):.2f}
+• Sortino Oranı (yıllık): {journal.sortino_ratio(365):.2f}
 """
         
-        if self.trades:
-            best_trade = max(self.trades, key=lambda x: x['pnl'])
-            worst_trade = min(self.trades, key=lambda x: x['pnl'])
+        if journal.num_trades:
+            best_trade = journal.best_trade
+            worst_trade = journal.worst_trade
             
             report += f"""
 🏆 EN İYİ İŞLEM:
@@ -269,15 +324,16 @@ class PaperTrader:
     
     def plot_performance(self, save_path: str = "paper_trading_results.png"):
         """Performans grafiği çiz"""
-        if not self.pnl_history:
+        history = self.journal.equity_frame()
+        if history.empty:
             print("Performans verisi bulunamadı.")
             return
             
         plt.figure(figsize=(12, 8))
         
-        dates = [p['date'] for p in self.pnl_history]
-        portfolio_values = [p['portfolio_value'] for p in self.pnl_history]
-        balances = [p['balance'] for p in self.pnl_history]
+        dates = history['date'].tolist()
+        portfolio_values = history['portfolio_value'].to_numpy()
+        balances = history['balance'].to_numpy()
         
         # Portföy değeri grafiği
         plt.subplot(2, 1, 1)
@@ -290,7 +346,7 @@ class PaperTrader:
         
         # Günlük P&L grafiği
         plt.subplot(2, 1, 2)
-        daily_pnls = [p['daily_pnl'] for p in self.pnl_history]
+        daily_pnls = history['daily_pnl'].to_numpy()
         colors = ['green' if pnl >= 0 else 'red' for pnl in daily_pnls]
         plt.bar(dates, daily_pnls, color=colors, alpha=0.7)
         plt.title('Günlük P&L')
@@ -303,36 +359,11 @@ class PaperTrader:
         print(f"📈 Performans grafiği kaydedildi: {save_path}")
         plt.show()
 
-def create_sample_data(symbols: List[str], days: int = 30) -> Dict[str, pd.DataFrame]:
-    """Örnek veri üret (test için)"""
-    np.random.seed(42)  # Sabit sonuçlar için
-    data = {}
-    
-    for symbol in symbols:
-        dates = pd.date_range(start=datetime.now() - timedelta(days=days), 
-                             end=datetime.now(), freq='H')
-        
-        # Rastgele fiyat hareketi simülasyonu
-        returns = np.random.normal(0, 0.02, len(dates))
-        prices = [50000]  # Başlangıç fiyatı (BTC için)
-        
-        for i in range(1, len(dates)):
-            new_price = prices[-1] * (1 + returns[i])
-            prices.append(new_price)
-        
-        # DataFrame oluştur
-        df = pd.DataFrame({
-            'timestamp': dates,
-            'open': prices,
-            'high': [p * 1.01 for p in prices],
-            'low': [p * 0.99 for p in prices],
-            'close': prices,
-            'volume': np.random.uniform(100, 1000, len(dates))
-        })
-        
-        data[symbol] = df
-        
-    return data
+def create_sample_data(symbols: List[str], days: int = 30, **config) -> Dict[str, pd.DataFrame]:
+    """Örnek veri üret (test için) - vektörize GBM üreteci, saatlik barlar"""
+    start = pd.Timestamp(datetime.now() - timedelta(days=days)).floor('h')
+    # Sabit tohum: sabit sonuçlar için
+    return generate_market_data(symbols, days * 24 + 1, timeframe="1h", seed=42, start=start, **config)
 
 def main():
     """Ana test fonksiyonu"""
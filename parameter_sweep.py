@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parametre Taraması (Grid Backtest)
+MA pencereleri, stop-loss yüzdesi ve RiskConfig limitleri için tüm kombinasyonları paralel çalıştırır
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import BacktestEngine, ma_crossover_signals
+from portfolio_risk import PortfolioRiskLedger
+from position_sizing import PositionSizer, RiskConfig
+
+_RISK_FIELDS = {f.name for f in fields(RiskConfig)}
+
+# İşçi süreçte paylaşılan bellekten açılan fiyat matrisi
+_worker_state: Dict[str, Any] = {}
+
+
+def _attach_worker(shm_name: str, shape: Tuple[int, int], times: np.ndarray, symbols: List[str],
+                   initial_balance: float):
+    """Süreç başlatıcı: paylaşılan fiyat matrisini kopyalamadan salt-okunur görünüm olarak bağlar"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    closes = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    closes.flags.writeable = False
+    _worker_state.update(shm=shm, closes=closes, times=times, symbols=symbols, initial_balance=initial_balance)
+
+
+def _run_combination(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Tek parametre kombinasyonu için backtest (işçi süreçte)"""
+    state = _worker_state
+    return run_single(state['times'], state['symbols'], state['closes'], params, state['initial_balance'])
+
+
+def run_single(times: np.ndarray, symbols: Sequence[str], closes: np.ndarray,
+               params: Dict[str, Any], initial_balance: float = 10000) -> Dict[str, Any]:
+    """
+    Bir kombinasyonu çalıştırır ve özet metrikleri döndürür
+
+    Tanınan anahtarlar: fast, slow, stop_loss_pct, strategy_type ve RiskConfig alanları
+    """
+    risk_config = RiskConfig(**{k: v for k, v in params.items() if k in _RISK_FIELDS})
+    engine = BacktestEngine(
+        initial_balance=initial_balance,
+        position_sizer=PositionSizer(risk_config, ledger=PortfolioRiskLedger(risk_config)),
+        stop_loss_pct=params.get('stop_loss_pct', 0.05),
+        strategy_type=params.get('strategy_type', "fixed_fractional")
+    )
+    signals = ma_crossover_signals(closes, params.get('fast', 5), params.get('slow', 20))
+    summary = engine.run_arrays(times, symbols, closes, signals=signals).summary()
+    return {**params, **summary}
+
+
+def expand_grid(grid: Dict[str, Iterable]) -> List[Dict[str, Any]]:
+    """{'fast': [5, 10], 'slow': [20, 50]} -> tüm kombinasyonların listesi (fast < slow olmayanlar atılır)"""
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    return [c for c in combos if c.get('fast', 5) < c.get('slow', 20)]
+
+
+class ParameterSweep:
+    """
+    Parametre ızgarası üzerinde paralel paper-trading simülasyonu
+
+    Fiyat matrisi bir kez paylaşılan belleğe (multiprocessing.shared_memory)
+    yazılır; işçiler onu kopyalamadan salt-okunur NumPy görünümü olarak açar.
+    Böylece her kombinasyon için yalnızca küçük parametre sözlüğü pickle'lanır.
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame], initial_balance: float = 10000):
+        self.times, self.symbols, self.closes = BacktestEngine.prepare(data)
+        self.initial_balance = initial_balance
+
+    def run(self, grid: Dict[str, Iterable], max_workers: Optional[int] = None,
+            chunksize: int = 1) -> pd.DataFrame:
+        """
+        Izgaradaki tüm kombinasyonları çalıştırır
+
+        Args:
+            grid: Parametre adı -> denenecek değerler
+            max_workers: Süreç sayısı (varsayılan: CPU sayısı; 1 ise süreç açılmaz)
+            chunksize: Bir işçiye tek seferde gönderilecek kombinasyon sayısı
+
+        Returns:
+            Kombinasyon başına getiri, başarı oranı ve drawdown tablosu (getiriye göre sıralı)
+        """
+        combos = expand_grid(grid)
+        max_workers = max_workers or os.cpu_count() or 1
+
+        if max_workers == 1 or len(combos) <= 1:
+            rows = [run_single(self.times, self.symbols, self.closes, c, self.initial_balance) for c in combos]
+        else:
+            rows = self._run_parallel(combos, max_workers, chunksize)
+
+        results = pd.DataFrame(rows)
+        if len(results):
+            results = results.sort_values('total_return_pct', ascending=False, kind='stable').reset_index(drop=True)
+        return results
+
+    def _run_parallel(self, combos: List[Dict], max_workers: int, chunksize: int) -> List[Dict]:
+        shm = shared_memory.SharedMemory(create=True, size=max(self.closes.nbytes, 1))
+        shared = None
+        try:
+            shared = np.ndarray(self.closes.shape, dtype=np.float64, buffer=shm.buf)
+            shared[:] = self.closes
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_attach_worker,
+                initargs=(shm.name, self.closes.shape, self.times, self.symbols, self.initial_balance)
+            ) as pool:
+                rows = list(pool.map(_run_combination, combos, chunksize=chunksize))
+        finally:
+            # Tampona bakan görünüm kalırsa close() BufferError verir ve unlink atlanır
+            del shared
+            shm.close()
+            shm.unlink()
+        return rows
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Portföy Risk Defteri
+Açık pozisyonların toplam maruziyetini ve riskini O(1) güncellenen sayaçlarla izler
+"""
+
+import math
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from position_sizing import RiskConfig
+
+
+class PortfolioRiskLedger:
+    """
+    Açık pozisyonlar için artımlı risk defteri
+
+    Pozisyon riski, stop'a kadar olan kayıptır: size * |entry - stop| / entry
+    (calculate_position_size'daki price_risk_pct ile aynı tanım). Toplamlar ve
+    sembol bazlı değerler ekleme/çıkarmada güncellenir; yeni bir boyutlandırma
+    isteği açık pozisyonlar yeniden taranmadan kalan risk bütçesi ve pozisyon
+    slotu ile sınırlandırılır.
+    """
+
+    def __init__(self, risk_config: Optional[RiskConfig] = None):
+        self.risk_config = risk_config or RiskConfig()
+        self._entries: Dict[Hashable, Tuple[str, float, float]] = {}
+        self._symbol_exposure: Dict[str, float] = {}
+        self._symbol_risk: Dict[str, float] = {}
+        self._symbol_count: Dict[str, int] = {}
+        self.total_exposure = 0.0
+        self.total_risk = 0.0
+
+    @staticmethod
+    def position_risk(size: float, entry_price: float, stop_loss: float) -> float:
+        """Stop tetiklenirse oluşacak kayıp (USDT)"""
+        if entry_price <= 0:
+            return 0.0
+        return size * abs(entry_price - stop_loss) / entry_price
+
+    def add(self, key: Hashable, symbol: str, size: float, entry_price: float, stop_loss: float) -> float:
+        """
+        Açılan pozisyonu deftere ekler
+
+        Args:
+            key: Pozisyonun benzersiz anahtarı (ör. id(position))
+
+        Returns:
+            Pozisyonun riski
+        """
+        if key in self._entries:
+            self.remove(key)
+        risk = self.position_risk(size, entry_price, stop_loss)
+        self._entries[key] = (symbol, size, risk)
+        self._symbol_exposure[symbol] = self._symbol_exposure.get(symbol, 0.0) + size
+        self._symbol_risk[symbol] = self._symbol_risk.get(symbol, 0.0) + risk
+        self._symbol_count[symbol] = self._symbol_count.get(symbol, 0) + 1
+        self.total_exposure += size
+        self.total_risk += risk
+        return risk
+
+    def remove(self, key: Hashable) -> bool:
+        """Kapanan pozisyonu defterden çıkarır (kayıtlı değilse False)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        symbol, size, risk = entry
+        count = self._symbol_count[symbol] - 1
+        if count:
+            self._symbol_count[symbol] = count
+            self._symbol_exposure[symbol] -= size
+            self._symbol_risk[symbol] -= risk
+        else:
+            del self._symbol_count[symbol], self._symbol_exposure[symbol], self._symbol_risk[symbol]
+
+        if self._entries:
+            self.total_exposure -= size
+            self.total_risk -= risk
+        else:
+            # Kayan nokta birikimini sıfırla
+            self.total_exposure = 0.0
+            self.total_risk = 0.0
+        return True
+
+    def update_stop(self, key: Hashable, entry_price: float, stop_loss: float):
+        """Stop seviyesi değişen (ör. trailing stop) pozisyonun riskini günceller"""
+        symbol, size, old_risk = self._entries[key]
+        risk = self.position_risk(size, entry_price, stop_loss)
+        self._entries[key] = (symbol, size, risk)
+        self._symbol_risk[symbol] += risk - old_risk
+        self.total_risk += risk - old_risk
+
+    def resize(self, key: Hashable, size: float):
+        """Kısmen kapanan pozisyonun tutarını küçültür; risk aynı oranda azalır"""
+        symbol, old_size, old_risk = self._entries[key]
+        risk = old_risk * size / old_size if old_size else 0.0
+        self._entries[key] = (symbol, size, risk)
+        self._symbol_exposure[symbol] += size - old_size
+        self._symbol_risk[symbol] += risk - old_risk
+        self.total_exposure += size - old_size
+        self.total_risk += risk - old_risk
+
+    def exposure(self, symbol: str) -> float:
+        return self._symbol_exposure.get(symbol, 0.0)
+
+    def risk(self, symbol: str) -> float:
+        return self._symbol_risk.get(symbol, 0.0)
+
+    @property
+    def open_positions(self) -> int:
+        return len(self._entries)
+
+    def remaining_slots(self) -> int:
+        return max(0, self.risk_config.max_positions - len(self._entries))
+
+    def remaining_risk(self, portfolio_value: float) -> float:
+        """Portföy risk bütçesinden kalan (USDT)"""
+        return max(0.0, portfolio_value * self.risk_config.max_portfolio_risk - self.total_risk)
+
+    def cap_size(self, size: float, price_risk_pct: float, portfolio_value: float) -> Tuple[float, str]:
+        """
+        Boyutu kalan slot ve risk bütçesine göre sınırlar
+
+        Returns:
+            (sınırlandırılmış boyut, açıklama eki; sınırlama yoksa boş)
+        """
+        if self.remaining_slots() <= 0:
+            return 0.0, " (Maksimum pozisyon sayısı dolu)"
+        if price_risk_pct <= 0 or size * price_risk_pct <= self.remaining_risk(portfolio_value):
+            return size, ""
+
+        # Kuruşa aşağı yuvarla: sonraki round(size, 2) bütçeyi aşmasın
+        capped = math.floor(self.remaining_risk(portfolio_value) / price_risk_pct * 100) / 100
+        if capped < self.risk_config.min_trade_size:
+            return 0.0, " (Portföy risk bütçesi dolu)"
+        return capped, " (Risk bütçesiyle sınırlandı)"
+
+    def cap_sizes(self, sizes: np.ndarray, price_risk_pct: np.ndarray,
+                  portfolio_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        cap_size'ın dizi sürümü: her satır mevcut deftere karşı bağımsız sınırlandırılır
+
+        Returns:
+            (sınırlandırılmış boyutlar, açıklama ekleri; sınırlama yoksa boş metin)
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        notes = np.full(len(sizes), "", dtype=object)
+        if self.remaining_slots() <= 0:
+            notes[:] = " (Maksimum pozisyon sayısı dolu)"
+            return np.zeros_like(sizes), notes
+
+        remaining = np.maximum(0.0, portfolio_values * self.risk_config.max_portfolio_risk - self.total_risk)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            over = (price_risk_pct > 0) & (sizes * price_risk_pct > remaining)
+            capped = np.floor(remaining / price_risk_pct * 100) / 100
+        full = over & (capped < self.risk_config.min_trade_size)
+        sizes = np.where(full, 0.0, np.where(over, capped, sizes))
+        notes[over] = " (Risk bütçesiyle sınırlandı)"
+        notes[full] = " (Portföy risk bütçesi dolu)"
+        return sizes, notes
+
+    def can_open(self, size: float, entry_price: float, stop_loss: float, portfolio_value: float) -> bool:
+        """Pozisyon açılırsa slot ve toplam risk limitleri aşılır mı"""
+        if self.remaining_slots() <= 0:
+            return False
+        risk = self.position_risk(size, entry_price, stop_loss)
+        return risk <= self.remaining_risk(portfolio_value) + 1e-9
+
+    def clear(self):
+        self._entries.clear()
+        self._symbol_exposure.clear()
+        self._symbol_risk.clear()
+        self._symbol_count.clear()
+        self.total_exposure = 0.0
+        self.total_risk = 0.0
+
+    def snapshot(self, portfolio_value: Optional[float] = None) -> Dict:
+        """Anlık risk özeti"""
+        summary = {
+            'open_positions': len(self._entries),
+            'remaining_slots': self.remaining_slots(),
+            'total_exposure': self.total_exposure,
+            'total_risk': self.total_risk,
+            'by_symbol': {
+                symbol: {'exposure': self._symbol_exposure[symbol], 'risk': self._symbol_risk[symbol]}
+                for symbol in self._symbol_count
+            }
+        }
+        if portfolio_value:
+            summary['portfolio_risk_pct'] = self.total_risk / portfolio_value * 100
+            summary['remaining_risk'] = self.remaining_risk(portfolio_value)
+        return summary
+
+    def __len__(self) -> int:
+        return len(self._entries)
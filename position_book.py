@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pozisyon Defteri
+Sembole göre indekslenmiş açık pozisyonlar ve stop fiyatına göre sıralı yığınlar
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class PositionBook:
+    """
+    Sembol -> pozisyonlar indeksi ve sembol başına stop-loss yığını
+
+    Long pozisyonlar fiyat stop'un altına indiğinde kapanır; bu yüzden her sembol
+    için en yüksek stop en üstte olacak şekilde bir max-heap tutulur. Fiyat
+    güncellemesinde yalnızca stop'u gerçekten geçilen pozisyonlar yığından çekilir
+    (O(k log n)). Kapanan veya stop'u değişen pozisyonların eski yığın kayıtları
+    tembel silinir: çekilirken geçersiz olanlar atlanır, çok birikirse yığın
+    yeniden kurulur.
+
+    Pozisyon 'size' alanı quote cinsinden tutardır. Sembol başına toplam tutar ve
+    birim sayısı (size / entry_price) tutulur; gerçekleşmemiş PnL (birim × fiyat -
+    tutar) ve piyasa değeri tüm pozisyonlar taranmadan sembol sayısı kadar
+    işlemle hesaplanır.
+    """
+
+    def __init__(self):
+        self._by_symbol: Dict[str, Dict[int, Dict]] = {}
+        self._stops: Dict[str, List[Tuple[float, int, int]]] = {}
+        self._size: Dict[str, float] = {}
+        self._units: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._count = 0
+
+    def add(self, position: Dict):
+        """Pozisyonu deftere ekler ('symbol', 'size', 'entry_price', 'stop_loss' alanları gerekli)"""
+        symbol = position['symbol']
+        book = self._by_symbol.setdefault(symbol, {})
+        key = id(position)
+        if key in book:
+            return
+        book[key] = position
+        self._count += 1
+        self._size[symbol] = self._size.get(symbol, 0.0) + position['size']
+        self._units[symbol] = self._units.get(symbol, 0.0) + position['size'] / position['entry_price']
+        self._push_stop(symbol, position)
+
+    def remove(self, position: Dict) -> bool:
+        """Pozisyonu defterden çıkarır (yığın kaydı tembel silinir); defterde yoksa False"""
+        symbol = position['symbol']
+        book = self._by_symbol.get(symbol)
+        if not book or book.pop(id(position), None) is None:
+            return False
+        self._count -= 1
+        if book:
+            self._size[symbol] -= position['size']
+            self._units[symbol] -= position['size'] / position['entry_price']
+        else:
+            # Son pozisyon: kayan nokta birikimi ve eski yığın kayıtları temizlenir
+            del self._by_symbol[symbol], self._size[symbol], self._units[symbol]
+            del self._stops[symbol]
+        return True
+
+    def update_stop(self, position: Dict, stop_loss: float):
+        """Stop seviyesini değiştirir (ör. trailing stop); eski yığın kaydı geçersiz olur"""
+        position['stop_loss'] = stop_loss
+        if id(position) in self._by_symbol.get(position['symbol'], {}):
+            self._push_stop(position['symbol'], position)
+
+    def _push_stop(self, symbol: str, position: Dict):
+        heap = self._stops.setdefault(symbol, [])
+        heapq.heappush(heap, (-position['stop_loss'], next(self._seq), id(position)))
+        if len(heap) > 2 * len(self._by_symbol[symbol]) + 16:
+            self._compact(symbol)
+
+    def _compact(self, symbol: str):
+        """Geçersiz kayıtları atarak yığını yeniden kurar"""
+        book = self._by_symbol[symbol]
+        heap = [entry for entry in self._stops[symbol]
+                if entry[2] in book and -entry[0] == book[entry[2]]['stop_loss']]
+        heapq.heapify(heap)
+        self._stops[symbol] = heap
+
+    def pop_triggered(self, symbol: str, price: float) -> List[Dict]:
+        """
+        Fiyatın stop'u geçtiği (price <= stop_loss) pozisyonları defterden çıkarıp döndürür
+
+        Dönen liste stop fiyatına göre azalan sıradadır.
+        """
+        heap = self._stops.get(symbol)
+        triggered = []
+        while heap and -heap[0][0] >= price:
+            neg_stop, _, key = heapq.heappop(heap)
+            position = self._by_symbol[symbol].get(key)
+            if position is None or position['stop_loss'] != -neg_stop:
+                continue  # Kapanmış veya stop'u değişmiş pozisyonun eski kaydı
+            triggered.append(position)
+            self.remove(position)
+            heap = self._stops.get(symbol)
+        return triggered
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Sembolün ilk açılan pozisyonu (yoksa None)"""
+        book = self._by_symbol.get(symbol)
+        return next(iter(book.values())) if book else None
+
+    def positions_for(self, symbol: str) -> List[Dict]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def unrealized_pnl(self, current_prices: Dict[str, float]) -> float:
+        """Fiyatı bilinen semboller için toplam gerçekleşmemiş PnL"""
+        return sum(
+            self._units[symbol] * current_prices[symbol] - self._size[symbol]
+            for symbol in self._by_symbol if symbol in current_prices
+        )
+
+    def exposures(self, current_prices: Dict[str, float]) -> Dict[str, float]:
+        """Fiyatı bilinen semboller için piyasa değeri: birim sayısı (size / entry_price) × fiyat"""
+        return {
+            symbol: self._units[symbol] * current_prices[symbol]
+            for symbol in self._by_symbol if symbol in current_prices
+        }
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for book in list(self._by_symbol.values()):
+            yield from list(book.values())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
@@ -3,11 +3,13 @@
 Position Sizer - Güvenli Test Script
 """
 
+import math
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass
 import logging
+from latency_monitor import timed
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +22,212 @@ class RiskConfig:
     min_trade_size: float = 10.0      # Minimum işlem büyüklüğü (USDT)
     max_trade_size: float = 1000.0    # Maksimum işlem büyüklüğü (USDT)
 
+class EWMACovariance:
+    """
+    İşlem evreni için artımlı EWMA kovaryans matrisi (RiskMetrics, sıfır ortalama)
+
+    Her bar yalnızca o barın log getirileriyle yerinde güncellenir:
+    Σ ← λΣ + (1 - λ) r rᵀ. Dış çarpım önceden ayrılmış çalışma dizisine yazılır;
+    bir bar O(n²)'dir ve tam geçmiş hiç yeniden okunmaz. Evren
+    büyüdükçe matris kapasitesi ikiye katlanarak genişler.
+    """
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None, halflife: float = 120.0, warmup: int = 30):
+        """
+        Args:
+            symbols: Başlangıç evreni (sonradan yeni semboller otomatik eklenir)
+            halflife: EWMA yarı ömrü (bar)
+            warmup: Sembolün risk hesabına girmesi için gereken en az getiri sayısı
+        """
+        self.decay = math.exp(math.log(0.5) / halflife)
+        self.warmup = warmup
+        self.version = 0  # Her güncellemede artar (ağırlık önbelleği için)
+
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._capacity = 0
+        self._cov = np.zeros((0, 0))
+        self._work = np.zeros((0, 0))
+        self._last = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._allocate(64)
+        if symbols is not None:
+            self.add_symbols(symbols)
+
+    def _allocate(self, capacity: int):
+        n = self._capacity
+        cov = np.zeros((capacity, capacity))
+        cov[:n, :n] = self._cov[:n, :n]
+        last = np.full(capacity, np.nan)
+        last[:n] = self._last[:n]
+        count = np.zeros(capacity, dtype=np.int64)
+        count[:n] = self._count[:n]
+        self._cov, self._last, self._count = cov, last, count
+        self._work = np.empty((capacity, capacity))
+        self._capacity = capacity
+
+    def add_symbols(self, symbols: Iterable[str]) -> np.ndarray:
+        """Sembolleri evrene ekler (varsa atlar); dizinlerini döndürür"""
+        idx = []
+        for symbol in symbols:
+            i = self.index.get(symbol)
+            if i is None:
+                i = self.index[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+            idx.append(i)
+        if len(self.symbols) > self._capacity:
+            self._allocate(max(len(self.symbols), 2 * self._capacity))
+        return np.asarray(idx, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def update(self, prices, symbols: Optional[Sequence[str]] = None):
+        """
+        Bir barlık fiyatlarla kovaryansı günceller
+
+        Args:
+            prices: Kapanış fiyatları (dizi) veya sembol -> fiyat
+            symbols: prices dizisinin sembolleri (None: evrenin tamamı, evren sırasıyla)
+
+        Bu barda fiyatı gelmeyen semboller için getiri 0 kabul edilir.
+        """
+        if isinstance(prices, Mapping):
+            symbols, prices = list(prices), list(prices.values())
+        prices = np.asarray(prices, dtype=np.float64)
+        if symbols is None:
+            if len(prices) != len(self.symbols):
+                raise ValueError("symbols verilmediğinde prices evren uzunluğunda olmalı")
+            idx = np.arange(len(self.symbols))
+        else:
+            idx = self.add_symbols(symbols)
+
+        n = len(self.symbols)
+        r = np.zeros(n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.log(prices / self._last[idx])
+        has_return = np.isfinite(step)
+        r[idx[has_return]] = step[has_return]
+        self._count[idx[has_return]] += 1
+        valid = np.isfinite(prices) & (prices > 0)
+        self._last[idx[valid]] = prices[valid]
+
+        cov, work = self._cov[:n, :n], self._work[:n, :n]
+        np.multiply(r[:, None], r * (1.0 - self.decay), out=work)
+        cov *= self.decay
+        cov += work
+        self.version += 1
+
+    def ready(self) -> List[str]:
+        """Isınmasını tamamlamış ve varyansı pozitif semboller"""
+        n = len(self.symbols)
+        ok = (self._count[:n] >= self.warmup) & (np.diagonal(self._cov)[:n] > 0)
+        return [self.symbols[i] for i in np.nonzero(ok)[0]]
+
+    def matrix(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Kovaryans matrisi (kopya); symbols verilirse o sırayla alt matris"""
+        n = len(self.symbols)
+        if symbols is None:
+            return self._cov[:n, :n].copy()
+        idx = np.asarray([self.index[s] for s in symbols], dtype=np.intp)
+        return self._cov[np.ix_(idx, idx)]
+
+    def shrinkage(self, symbols: Sequence[str]) -> float:
+        """
+        Alt matris için köşegene büzülme oranı δ = n / (n + gözlem)
+
+        Gözlem, sembollerin en az getiri sayısıdır ve EWMA'nın etkin örneklem
+        boyutuyla, (1 + λ) / (1 - λ), sınırlanır. Az gözlemle çok sembol
+        (tekil Σ) güçlü, uzun geçmişli küçük evren zayıf büzülür.
+        """
+        if not symbols:
+            return 0.0
+        idx = np.asarray([self.index[s] for s in symbols], dtype=np.intp)
+        effective = (1.0 + self.decay) / (1.0 - self.decay)
+        observations = min(float(self._count[idx].min()), effective)
+        return len(idx) / (len(idx) + observations)
+
+    def volatility(self, symbol: str) -> float:
+        """Sembolün bar başına EWMA volatilitesi"""
+        i = self.index[symbol]
+        return math.sqrt(self._cov[i, i])
+
+
+def risk_parity_weights(cov: np.ndarray, budgets: Optional[np.ndarray] = None,
+                        x0: Optional[np.ndarray] = None, tol: float = 1e-8,
+                        max_iter: int = 50, shrinkage: float = 0.0) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Eşit (veya verilen bütçeli) risk katkısı ağırlıkları
+
+    min ½xᵀΣx - Σ bᵢ log xᵢ dışbükey problemi sönümlü Newton ile çözülür
+    (Spinu); optimumda xᵢ(Σx)ᵢ = bᵢ, yani risk katkıları bütçelerle orantılıdır.
+    x0 önceki barın çözümü verildiğinde kovaryans az değiştiğinden genellikle
+    0-2 Newton adımı yeter.
+
+    Σ tekil olduğunda (gözlem sayısı sembol sayısından az) problemin alttan
+    sınırı olmayabilir; shrinkage > 0 ise Σ önce köşegenine doğru büzülür:
+    (1 - δ)Σ + δ diag(Σ), böylece pozitif tanımlı olur. Adımlar x > 0 kalacak
+    şekilde yarıya indirilerek geri izlenir. Yakınsama olmazsa uyarı loglanır
+    ve ters volatilite ağırlıkları döner.
+
+    Returns:
+        (toplamı 1 olan ağırlıklar, ölçeklenmemiş çözüm x (sonraki x0), Newton adım sayısı)
+    """
+    n = len(cov)
+    if budgets is not None and not np.all(np.asarray(budgets, dtype=np.float64) > 0):
+        raise ValueError("Risk bütçeleri pozitif olmalı (bütçesiz semboller çözümden çıkarılmalı)")
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=np.float64) / np.sum(budgets)
+    if shrinkage > 0:
+        cov = (1.0 - shrinkage) * cov + shrinkage * np.diag(np.diagonal(cov))
+    # Ters volatilite: başlangıç ve yakınsamama durumunda dönülecek çözüm (xᵀΣx = 1)
+    inverse_vol = 1.0 / np.sqrt(np.diagonal(cov))
+    inverse_vol /= math.sqrt(inverse_vol @ cov @ inverse_vol)
+    if x0 is None or len(x0) != n or not np.all(x0 > 0):
+        x = inverse_vol.copy()
+    else:
+        x = np.array(x0, dtype=np.float64)
+
+    for steps in range(max_iter + 1):
+        sx = cov @ x
+        if np.max(np.abs(x * sx - b) / b) < tol:
+            return x / x.sum(), x, steps
+        if steps == max_iter:
+            break
+        grad = sx - b / x
+        hess = cov + np.diag(b / (x * x))
+        dx = np.linalg.solve(hess, -grad)
+        decrement = math.sqrt(max(-grad @ dx, 0.0))
+        # Newton azalması büyükse sönümlü adım; yine de x > 0 kalana kadar yarıya indirilir
+        t = 1.0 / (1.0 + decrement) if decrement > 0.25 else 1.0
+        while np.any(x + t * dx <= 0):
+            t *= 0.5
+        x = x + t * dx
+
+    logger.warning(f"Risk parity {max_iter} adımda yakınsamadı (n={n}); ters volatilite ağırlıkları kullanılıyor")
+    return inverse_vol / inverse_vol.sum(), inverse_vol, max_iter
+
+
 class PositionSizer:
     """
     Pozisyon boyutlandırma algoritmaları
     """
     
-    def __init__(self, risk_config: RiskConfig = None):
+    def __init__(self, risk_config: RiskConfig = None, ledger: Optional["PortfolioRiskLedger"] = None,
+                 covariance: Optional[EWMACovariance] = None):
+        """
+        Args:
+            risk_config: Risk limitleri
+            ledger: Açık pozisyonları izleyen PortfolioRiskLedger; verilirse her
+                boyut kalan risk bütçesi ve pozisyon slotu ile sınırlandırılır
+            covariance: Risk parity için EWMA kovaryansı (None: ilk update_covariance'ta oluşturulur)
+        """
         self.risk_config = risk_config or RiskConfig()
+        self.ledger = ledger
+        self.covariance = covariance
         self.position_history = []
+        # Risk parity: sembol -> önceki çözüm (warm start) ve kovaryans sürümü başına ağırlık önbelleği
+        self._parity_x: Dict[str, float] = {}
+        self._parity_cache: Dict[Tuple, Dict[str, float]] = {}
         
     def kelly_criterion(self, win_rate: float, avg_win: float, avg_loss: float) -> float:
         """
@@ -87,6 +287,59 @@ class PositionSizer:
             
         return max(0.01, min(base_risk, self.risk_config.max_position_risk))
     
+    def update_covariance(self, prices, symbols: Optional[Sequence[str]] = None):
+        """Bir barlık fiyatlarla risk parity kovaryansını yerinde günceller (bkz. EWMACovariance.update)"""
+        if self.covariance is None:
+            self.covariance = EWMACovariance()
+        self.covariance.update(prices, symbols)
+
+    def risk_parity(self, symbols: Optional[Sequence[str]] = None,
+                    budgets: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """
+        Eşit risk katkılı portföy ağırlıkları (toplamı 1)
+
+        Args:
+            symbols: Ağırlıklandırılacak semboller (None: ısınmış tüm evren)
+            budgets: Sembol başına risk bütçesi (None: eşit); bütçesi olmayan veya
+                pozitif olmayan semboller çözüme girmez
+
+        Returns:
+            sembol -> ağırlık; ısınmamış veya bütçesiz semboller 0 ağırlık alır
+        """
+        weights = self._risk_parity_weights(symbols, budgets)
+        if symbols is not None:
+            return {s: weights.get(s, 0.0) for s in symbols}
+        return dict(weights)
+
+    def _risk_parity_weights(self, symbols: Optional[Sequence[str]] = None,
+                             budgets: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """Kovaryans sürümü başına bir kez çözülen (önbellekli) risk parity ağırlıkları"""
+        cov = self.covariance
+        if cov is None:
+            logger.warning("Risk parity için kovaryans verisi yok")
+            return {}
+        key = (cov.version, tuple(symbols) if symbols is not None else None,
+               tuple(sorted(budgets.items())) if budgets else None)
+        weights = self._parity_cache.get(key)
+        if weights is not None:
+            return weights
+
+        ready = set(cov.ready())
+        names = [s for s in (symbols if symbols is not None else cov.symbols) if s in ready]
+        if budgets:
+            names = [s for s in names if budgets.get(s, 0.0) > 0]
+        weights = {}
+        if names:
+            x0 = np.array([self._parity_x.get(s, 0.0) for s in names])
+            b = np.array([budgets[s] for s in names]) if budgets else None
+            w, x, _ = risk_parity_weights(cov.matrix(names), b, x0, shrinkage=cov.shrinkage(names))
+            self._parity_x.update(zip(names, x.tolist()))
+            weights = dict(zip(names, w.tolist()))
+        # Önceki kovaryans sürümlerine ait ağırlıklar artık kullanılmaz
+        self._parity_cache = {k: v for k, v in self._parity_cache.items() if k[0] == cov.version}
+        self._parity_cache[key] = weights
+        return weights
+
     def martingale(self, consecutive_losses: int, base_risk: float) -> float:
         """
         Martingale position sizing (DİKKAT: Yüksek risk!)
@@ -104,6 +357,7 @@ class PositionSizer:
         
         return adjusted_risk
     
+    @timed('position_size', symbol_arg='symbol')
     def calculate_position_size(
         self,
         symbol: str,
@@ -170,6 +424,12 @@ class PositionSizer:
                 position_size = portfolio_value * position_ratio
                 reason = f"Martingale (Loss streak: {consecutive_losses})"
                 
+            elif strategy_type == "risk_parity":
+                weight = self._risk_parity_weights().get(symbol, 0.0)
+                gross_exposure = kwargs.get("gross_exposure", 1.0)
+                position_size = portfolio_value * (weight * gross_exposure)
+                reason = f"Risk Parity (w:{weight:.1%})"
+                
             else:
                 # Default fixed fractional
                 position_size = portfolio_value * self.risk_config.max_position_risk
@@ -191,6 +451,13 @@ class PositionSizer:
                 portfolio_risk_pct = (position_size * price_risk_pct) / portfolio_value if portfolio_value > 0 else 0
                 reason += " (Risk adjusted)"
             
+            # Açık pozisyonlarla birlikte toplam risk ve slot kontrolü
+            if self.ledger is not None:
+                position_size, note = self.ledger.cap_size(position_size, price_risk_pct, portfolio_value)
+                if note:
+                    portfolio_risk_pct = (position_size * price_risk_pct) / portfolio_value if portfolio_value > 0 else 0
+                    reason += note
+            
             return {
                 "size": round(position_size, 2),
                 "percentage": round(position_size / portfolio_value * 100, 2) if portfolio_value > 0 else 0,
@@ -211,6 +478,162 @@ class PositionSizer:
                 "strategy": strategy_type
             }
 
+    def calculate_position_sizes(
+        self,
+        entry_prices,
+        stop_losses,
+        portfolio_values,
+        strategy_types="fixed_fractional",
+        symbols=None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """
+        calculate_position_size'ın toplu (vektörize) sürümü
+
+        Tüm girdiler skaler veya aynı uzunlukta dizi olabilir. Strateji dağıtımı,
+        limitler ve portföy riski kontrolü maskelerle tek geçişte yapılır; sonuçlar
+        skaler yolla birebir aynıdır (yuvarlama, pandas'tan gelen np.float64
+        fiyatlarda olduğu gibi np.round ile yapılır). Satırlar birbirinden bağımsız
+        aday boyutlardır: ledger verilmişse her satır mevcut açık pozisyonlara
+        karşı ayrı ayrı sınırlandırılır (satırlar birbirinin riskini tüketmez).
+
+        Args:
+            entry_prices: Giriş fiyatları
+            stop_losses: Stop loss fiyatları
+            portfolio_values: Portföy değerleri
+            strategy_types: Satır başına strateji adı
+            symbols: İşlem sembolleri (isteğe bağlı)
+            **kwargs: Stratejiye özel parametreler (win_rate, risk_pct, volatility ...)
+
+        Returns:
+            Satır başına size, percentage, reason, portfolio_risk_pct, price_risk_pct, strategy
+        """
+        entry = np.atleast_1d(np.asarray(entry_prices, dtype=np.float64))
+        stop = np.atleast_1d(np.asarray(stop_losses, dtype=np.float64))
+        portfolio = np.atleast_1d(np.asarray(portfolio_values, dtype=np.float64))
+        strategies = np.atleast_1d(np.asarray(strategy_types, dtype=object))
+        n = max(len(entry), len(stop), len(portfolio), len(strategies),
+                np.size(symbols) if symbols is not None else 1,
+                *(np.size(v) for v in kwargs.values()))
+        entry, stop, portfolio = (np.broadcast_to(a, n) for a in (entry, stop, portfolio))
+        strategies = np.broadcast_to(strategies, n)
+
+        def param(name: str, default: float) -> np.ndarray:
+            return np.broadcast_to(np.asarray(kwargs.get(name, default), dtype=np.float64), n)
+
+        cfg = self.risk_config
+        valid = (entry > 0) & (stop > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_risk_pct = np.abs(entry - stop) / entry
+
+            ratio = np.full(n, cfg.max_position_risk)
+            reasons = np.full(n, "Default Fixed Fractional", dtype=object)
+            errors = np.zeros(n, dtype=bool)
+
+            mask = strategies == "kelly"
+            if mask.any():
+                win_rate, avg_win, avg_loss = param("win_rate", 0.6), param("avg_win", 0.02), param("avg_loss", 0.01)
+                fallback = (avg_loss <= 0) | (win_rate <= 0)
+                win_loss_ratio = avg_win / np.abs(avg_loss)
+                kelly = (win_rate * win_loss_ratio - (1 - win_rate)) / win_loss_ratio
+                kelly = np.where(fallback, 0.1, np.maximum(0.01, np.minimum(kelly, 0.25)))
+                ratio[mask] = kelly[mask]
+                # Skaler yolda avg_win = 0 ZeroDivisionError ile hata sonucuna düşer
+                errors |= mask & ~fallback & (win_loss_ratio == 0)
+                reasons[mask] = _format_reasons(
+                    "Kelly Criterion (W:{:.1%}, AvgWin:{:.1%})", win_rate[mask], avg_win[mask])
+
+            mask = strategies == "fixed_fractional"
+            if mask.any():
+                risk_pct = param("risk_pct", 0.02)
+                ratio[mask] = np.maximum(0.01, np.minimum(risk_pct, cfg.max_position_risk))[mask]
+                reasons[mask] = _format_reasons("Fixed Fractional ({:.1%} risk)", risk_pct[mask])
+
+            mask = strategies == "volatility"
+            if mask.any():
+                volatility, risk_reward = param("volatility", 0.03), param("risk_reward", 2.0)
+                base_risk = cfg.max_position_risk / (1 / (volatility * 10))
+                base_risk = np.where(risk_reward < 1, base_risk * 0.5, base_risk)
+                vol_ratio = np.where(volatility <= 0, 0.1,
+                                     np.maximum(0.01, np.minimum(base_risk, cfg.max_position_risk)))
+                ratio[mask] = vol_ratio[mask]
+                reasons[mask] = _format_reasons(
+                    "Volatility-based (Vol:{:.1%}, R/R:{:.1f})", volatility[mask], risk_reward[mask])
+
+            mask = strategies == "martingale"
+            if mask.any():
+                losses = np.broadcast_to(np.asarray(kwargs.get("consecutive_losses", 0)), n)
+                base = param("base_risk", 0.01)
+                multiplier = np.minimum(np.power(2.0, np.minimum(losses, 3)), 8)
+                ratio[mask] = np.minimum(base * multiplier, cfg.max_position_risk)[mask]
+                reasons[mask] = _format_reasons("Martingale (Loss streak: {})", losses[mask])
+
+            mask = strategies == "risk_parity"
+            if mask.any():
+                parity = self._risk_parity_weights()
+                names = np.broadcast_to(np.asarray(symbols, dtype=object), n) if symbols is not None else np.full(n, None, dtype=object)
+                weight = np.array([parity.get(s, 0.0) for s in names[mask]], dtype=np.float64)
+                ratio[mask] = weight * param("gross_exposure", 1.0)[mask]
+                reasons[mask] = _format_reasons("Risk Parity (w:{:.1%})", weight)
+
+            # Limitler
+            size = portfolio * ratio
+            size = np.maximum(cfg.min_trade_size, np.minimum(np.minimum(size, cfg.max_trade_size), portfolio))
+
+            positive = portfolio > 0
+            portfolio_risk = np.where(positive, size * price_risk_pct / portfolio, 0.0)
+
+            # Portföy riski kontrolü
+            adjust = portfolio_risk > cfg.max_portfolio_risk
+            if adjust.any():
+                safe = np.where(price_risk_pct > 0, portfolio * cfg.max_portfolio_risk / price_risk_pct, 0.0)
+                size = np.where(adjust, np.minimum(safe, cfg.max_trade_size), size)
+                portfolio_risk = np.where(adjust & positive, size * price_risk_pct / portfolio, portfolio_risk)
+                reasons[adjust] = reasons[adjust] + " (Risk adjusted)"
+
+            # Açık pozisyonlarla birlikte toplam risk ve slot kontrolü
+            if self.ledger is not None:
+                size, notes = self.ledger.cap_sizes(size, price_risk_pct, portfolio)
+                noted = notes != ""
+                if noted.any():
+                    portfolio_risk = np.where(noted, np.where(positive, size * price_risk_pct / portfolio, 0.0),
+                                              portfolio_risk)
+                    reasons[noted] = reasons[noted] + notes[noted]
+
+            percentage = np.where(positive, np.round(size / portfolio * 100, 2), 0.0)
+
+        result = pd.DataFrame({
+            "symbol": np.broadcast_to(np.asarray(symbols, dtype=object), n) if symbols is not None else None,
+            "size": np.round(size, 2),
+            "percentage": percentage,
+            "reason": reasons,
+            "portfolio_risk_pct": np.round(portfolio_risk * 100, 2),
+            "price_risk_pct": np.round(price_risk_pct * 100, 2),
+            "strategy": strategies
+        })
+
+        invalid = ~valid
+        if invalid.any():
+            result.loc[invalid, ["size", "percentage", "portfolio_risk_pct", "price_risk_pct"]] = 0.0
+            result.loc[invalid, "reason"] = "Geçersiz fiyat bilgisi"
+        errors &= valid
+        if errors.any():
+            result.loc[errors, ["size", "percentage", "portfolio_risk_pct", "price_risk_pct"]] = 0.0
+            result.loc[errors, "reason"] = "Hata: float division by zero"
+        return result
+
+
+def _format_reasons(template: str, *columns: np.ndarray) -> np.ndarray:
+    """Açıklama metinlerini benzersiz parametre kombinasyonu başına bir kez biçimlendirir"""
+    cache = {}
+    out = np.empty(len(columns[0]), dtype=object)
+    for i, values in enumerate(zip(*(c.tolist() for c in columns))):
+        text = cache.get(values)
+        if text is None:
+            text = cache[values] = template.format(*values)
+        out[i] = text
+    return out
+
 # Örnek kullanım
 if __name__ == "__main__":
     # Test
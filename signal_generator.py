@@ -5,43 +5,159 @@ Signal Generator - Multi-timeframe consensus sistemi
 Pump coinleri tespit eden akıllı sinyal üretim sistemi
 """
 
+import logging
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from technical_indicators import TechnicalIndicators
+from indicator_cache import IndicatorCache
+from feature_store import FeatureStore, compute_features
+from anomaly_detector import volume_spike_zscore
+from latency_monitor import monitor
+
+logger = logging.getLogger(__name__)
+
+
+def _analyze_chunk(generator: 'SignalGenerator', chunk: List[Tuple[str, str, pd.DataFrame]]) -> List[Tuple[str, str, Optional[Dict], Optional[str]]]:
+    """Havuz işçisi: bir grup (sembol, timeframe) analizini sırayla yapar; hata varsa mesajı döner"""
+    results = []
+    for symbol, tf, df in chunk:
+        try:
+            with monitor.stage('analyze_timeframe', symbol, tf):
+                results.append((symbol, tf, generator._analyze_timeframe(df, generator._features(symbol, tf, df)), None))
+        except Exception as e:
+            logger.error(f"{symbol} {tf} analiz hatası: {e}")
+            results.append((symbol, tf, None, f"{type(e).__name__}: {e}"))
+    return results
+
 
 class SignalGenerator:
     """Multi-timeframe consensus signal generator"""
     
-    def __init__(self):
-        self.ti = TechnicalIndicators()
+    def __init__(self, cache: Optional[IndicatorCache] = None, feature_store: Optional[FeatureStore] = None):
+        # Verilirse timeframe'ler ve tekrarlanan çağrılar aynı alt indikatörleri (EMA, SMA) paylaşır
+        self.cache = cache
+        self.ti = TechnicalIndicators(cache=self.cache)
+        # Verilirse RSI/MACD/Bollinger vektörleri işçiler arasında paylaşılır
+        self.feature_store = feature_store
         self.timeframes = ['1m', '5m', '15m', '1h']
         self.weights = {'1m': 0.1, '5m': 0.2, '15m': 0.3, '1h': 0.4}
+        # Tek timeframe puanındaki bileşen ağırlıkları ve hacim patlaması eşiği
+        self.score_weights = {'rsi': 0.35, 'macd': 0.35, 'bollinger': 0.3}
+        self.volume_lookback = 100
+        self.volume_spike_z = 3.0
         
-    def generate_consensus_signal(self, data: Dict[str, pd.DataFrame]) -> Dict:
-        """Multi-timeframe consensus signal üretimi"""
+    def generate_consensus_signal(self, data: Dict[str, pd.DataFrame], symbol: Optional[str] = None) -> Dict:
+        """
+        Multi-timeframe consensus signal üretimi
+        
+        symbol verilirse ve feature_store tanımlıysa indikatörler depodan okunur.
+        """
         signals = {}
         
         for tf in self.timeframes:
             if tf in data:
-                signals[tf] = self._analyze_timeframe(data[tf])
+                with monitor.stage('analyze_timeframe', symbol, tf):
+                    signals[tf] = self._analyze_timeframe(data[tf], self._features(symbol, tf, data[tf]))
                 
-        return self._calculate_weighted_consensus(signals)
+        with monitor.stage('consensus', symbol):
+            return self._calculate_weighted_consensus(signals)
+    
+    def generate_batch_consensus(
+        self,
+        data: Dict[str, Dict[str, pd.DataFrame]],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        executor: Union[str, Executor] = "thread"
+    ) -> Dict[str, Dict]:
+        """
+        Çok sembollü consensus taraması - (sembol × timeframe) analizleri havuza dağıtılır
         
-    def _analyze_timeframe(self, df: pd.DataFrame) -> Dict:
-        """Tek timeframe analizi"""
-        # RSI hesaplama
-        rsi = self.ti.rsi(df['close'])
+        Args:
+            data: sembol -> {timeframe -> DataFrame}
+            max_workers: İşçi sayısı (varsayılan: CPU sayısı)
+            chunk_size: Bir görevde işlenecek (sembol, timeframe) sayısı
+            executor: "thread", "process" veya tekrar kullanılacak hazır bir Executor
+            
+        Returns:
+            sembol -> consensus sonucu (girdideki sembol sırasıyla). Bir timeframe
+            analizi hata verirse o sembolün sinyali "ERROR" olur ve 'errors'
+            alanında timeframe -> hata mesajı bulunur; eksik timeframe'lerle
+            kısmi consensus üretilmez.
+        """
+        tasks = [
+            (symbol, tf, frames[tf])
+            for symbol, frames in data.items()
+            for tf in self.timeframes
+            if tf in frames
+        ]
+        if not tasks:
+            return {symbol: self._calculate_weighted_consensus({}) for symbol in data}
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(1, math.ceil(len(tasks) / (max_workers * 4)))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
         
-        # MACD hesaplama  
-        macd_data = self.ti.macd(df['close'])
+        if isinstance(executor, Executor):
+            results = self._run_chunks(executor, chunks)
+        else:
+            pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+            with pool_cls(max_workers=max_workers) as pool:
+                results = self._run_chunks(pool, chunks)
         
-        # Bollinger Bands
-        bb = self.ti.bollinger_bands(df['close'])
+        analyzed, errors = {}, {}
+        for chunk_result in results:
+            for symbol, tf, signal, error in chunk_result:
+                if error is not None:
+                    errors.setdefault(symbol, {})[tf] = error
+                else:
+                    analyzed[(symbol, tf)] = signal
+        
+        # Sonuç sırası havuzdaki tamamlanma sırasından bağımsızdır
+        consensus = {}
+        for symbol in data:
+            signals = {tf: analyzed[(symbol, tf)] for tf in self.timeframes if (symbol, tf) in analyzed}
+            if symbol in errors:
+                consensus[symbol] = {'signal': 'ERROR', 'confidence': 0.0,
+                                     'timeframe_breakdown': signals, 'errors': errors[symbol]}
+                continue
+            with monitor.stage('consensus', symbol):
+                consensus[symbol] = self._calculate_weighted_consensus(signals)
+        return consensus
+    
+    def _run_chunks(self, pool: Executor, chunks: List) -> List:
+        """Parçaları havuza gönderir, sonuçları gönderim sırasıyla toplar"""
+        futures = [pool.submit(_analyze_chunk, self, chunk) for chunk in chunks]
+        return [future.result() for future in futures]
+        
+    def _features(self, symbol: Optional[str], tf: str, df: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """Feature store'dan (yoksa hesaplayıp yayınlayarak) indikatör vektörleri"""
+        if self.feature_store is None or symbol is None:
+            return None
+        return self.feature_store.get_or_compute(symbol, tf, df, lambda: compute_features(self.ti, df))
+        
+    def _analyze_timeframe(self, df: pd.DataFrame, features: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+        """Tek timeframe analizi"""
+        if features is not None:
+            rsi = features['rsi'][-1]
+            macd_signal = features['macd_signal'][-1]
+            bb = {'upper': features['bb_upper'], 'middle': features['bb_middle'], 'lower': features['bb_lower']}
+        else:
+            # RSI hesaplama
+            rsi = self.ti.rsi(df['close']).iloc[-1]
+            
+            # MACD hesaplama  
+            macd_signal = self.ti.macd(df['close'])['signal'].iloc[-1]
+            
+            # Bollinger Bands
+            bb = self.ti.bollinger_bands(df['close'])
         
         return {
-            'rsi': rsi.iloc[-1],
-            'macd_signal': macd_data['signal'].iloc[-1],
+            'rsi': rsi,
+            'macd_signal': macd_signal,
             'bb_position': self._bollinger_position(df['close'].iloc[-1], bb),
             'volume_spike': self._detect_volume_spike(df)
         }
@@ -67,3 +183,66 @@ class SignalGenerator:
             'confidence': abs(final_score),
             'timeframe_breakdown': signals
         }
+    
+    def _bollinger_position(self, price: float, bb: Dict) -> float:
+        """
+        Fiyatın bant içindeki konumu: 0 alt bant, 1 üst bant (bant dışı değerler taşabilir)
+        
+        Bantlar henüz hesaplanamıyorsa (pencereden kısa veri) NaN, sıfır genişlikte 0.5.
+        """
+        upper = float(np.asarray(bb['upper'])[-1])
+        lower = float(np.asarray(bb['lower'])[-1])
+        width = upper - lower
+        if not np.isfinite(width):
+            return np.nan
+        if width <= 0:
+            return 0.5
+        return (float(price) - lower) / width
+    
+    def _detect_volume_spike(self, df: pd.DataFrame) -> bool:
+        """Son barın hacmi son volume_lookback bara göre robust z-skoru eşiğini aşıyor mu"""
+        if 'volume' not in df:
+            return False
+        return volume_spike_zscore(df['volume'].to_numpy(), self.volume_lookback) >= self.volume_spike_z
+    
+    def _calculate_signal_score(self, data: Dict) -> float:
+        """
+        Tek timeframe puanı: -1 (güçlü satış) ... +1 (güçlü alış)
+        
+        RSI ve Bollinger konumu aşırı bölgelerde ortalamaya dönüş, MACD sinyal
+        çizgisinin işareti trend yönü olarak okunur. Hacim patlaması mevcut
+        yönü güçlendirir. Bileşenlerden biri hesaplanamıyorsa (NaN; ör. RSI veya
+        Bollinger penceresinden kısa veri) puan 0'dır: tek başına MACD işareti
+        birkaç mumdan sinyal üretmesin.
+        """
+        def finite(value) -> float:
+            value = float(value)
+            return value if np.isfinite(value) else np.nan
+        
+        rsi = finite(data.get('rsi', np.nan))
+        macd_signal = finite(data.get('macd_signal', np.nan))
+        bb_position = finite(data.get('bb_position', np.nan))
+        
+        components = {
+            'rsi': np.clip((50 - rsi) / 20, -1, 1),
+            'macd': np.sign(macd_signal),
+            'bollinger': np.clip(1 - 2 * bb_position, -1, 1)
+        }
+        if any(np.isnan(value) for value in components.values()):
+            return 0.0
+        score = sum(self.score_weights[name] * value for name, value in components.items())
+        if data.get('volume_spike'):
+            score *= 1.5
+        return float(np.clip(score, -1, 1))
+    
+    def _score_to_signal(self, score: float) -> str:
+        """Puanı sinyale çevirir (STRONG_BUY / BUY / HOLD / SELL / STRONG_SELL)"""
+        if score >= 0.6:
+            return "STRONG_BUY"
+        if score >= 0.2:
+            return "BUY"
+        if score <= -0.6:
+            return "STRONG_SELL"
+        if score <= -0.2:
+            return "SELL"
+        return "HOLD"
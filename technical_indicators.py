@@ -9,15 +9,43 @@ import numpy as np
 import pandas as pd
 from typing import Union, List, Dict, Tuple, Optional
 import warnings
+import indicator_kernels as kernels
+from indicator_cache import IndicatorCache
+from latency_monitor import monitor
 warnings.filterwarnings('ignore')
 
+
+def _values(data: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """Girdiyi float64 NumPy dizisine çevirir (çekirdekler için)"""
+    return np.asarray(data, dtype=np.float64)
+
+
+def _series(values: np.ndarray, like: Union[pd.Series, np.ndarray]) -> pd.Series:
+    """Çekirdek sonucunu girdinin index'i ile pd.Series olarak sarar"""
+    index = like.index if isinstance(like, pd.Series) else None
+    return pd.Series(values, index=index)
+
+
 class TechnicalIndicators:
     """100+ teknik indikatör hesaplayan ana sınıf"""
     
-    def __init__(self):
-        """Teknik indikatörler sınıfını başlatır"""
+    def __init__(self, cache: Optional[IndicatorCache] = None):
+        """
+        Teknik indikatörler sınıfını başlatır
+        
+        Args:
+            cache: Paylaşılan indikatör önbelleği (None ise her çağrı yeniden hesaplanır)
+        """
         self.name = "Teknik İndikatör Sistemi"
         self.version = "1.0.0"
+        self.cache = cache
+    
+    def _cached(self, name: str, inputs: Tuple, params: Tuple, compute):
+        """Önbellek varsa sonucu oradan servis eder, yoksa doğrudan hesaplar"""
+        with monitor.stage('indicator.' + name):
+            if self.cache is None:
+                return compute()
+            return self.cache.get_or_compute(name, inputs, params, compute)
     
     # ========================================
     # TREND İNDİKATÖRLERİ (Trend Indicators)
@@ -25,14 +53,20 @@ class TechnicalIndicators:
     
     def sma(self, data: Union[pd.Series, np.ndarray], period: int = 14) -> pd.Series:
         """Simple Moving Average (Basit Hareketli Ortalama)"""
-        return pd.Series(data).rolling(window=period).mean()
+        return self._cached('sma', (data,), (period,),
+                            lambda: pd.Series(data).rolling(window=period).mean())
     
     def ema(self, data: Union[pd.Series, np.ndarray], period: int = 14) -> pd.Series:
         """Exponential Moving Average (Üssel Hareketli Ortalama)"""
-        return pd.Series(data).ewm(span=period).mean()
+        return self._cached('ema', (data,), (period,),
+                            lambda: pd.Series(data).ewm(span=period).mean())
     
     def macd(self, data: Union[pd.Series, np.ndarray], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
         """MACD (Moving Average Convergence Divergence)"""
+        return self._cached('macd', (data,), (fast, slow, signal),
+                            lambda: self._macd(data, fast, slow, signal))
+    
+    def _macd(self, data: Union[pd.Series, np.ndarray], fast: int, slow: int, signal: int) -> Dict[str, pd.Series]:
         ema_fast = self.ema(data, fast)
         ema_slow = self.ema(data, slow)
         macd_line = ema_fast - ema_slow
@@ -45,5 +79,111 @@ class TechnicalIndicators:
             'histogram': histogram
         }
     
-    # RSI ve diğer indikatörler burada devam eder...
-    # (Dosyanın tamamı 755 satır)
+    def adx(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> Dict[str, pd.Series]:
+        """Average Directional Index (+DI / -DI ile birlikte)"""
+        def compute():
+            result = kernels.adx(_values(high), _values(low), _values(close), period)
+            return {k: _series(v, close) for k, v in result.items()}
+        return self._cached('adx', (high, low, close), (period,), compute)
+    
+    def parabolic_sar(self, high: pd.Series, low: pd.Series, step: float = 0.02, max_step: float = 0.2) -> pd.Series:
+        """Parabolic SAR (Stop and Reverse)"""
+        return self._cached('parabolic_sar', (high, low), (step, max_step),
+                            lambda: _series(kernels.parabolic_sar(_values(high), _values(low), step, max_step), high))
+    
+    def ichimoku(self, high: pd.Series, low: pd.Series, close: pd.Series,
+                 tenkan: int = 9, kijun: int = 26, senkou: int = 52) -> Dict[str, pd.Series]:
+        """Ichimoku Kinko Hyo"""
+        def compute():
+            result = kernels.ichimoku(_values(high), _values(low), _values(close), tenkan, kijun, senkou)
+            return {k: _series(v, close) for k, v in result.items()}
+        return self._cached('ichimoku', (high, low, close), (tenkan, kijun, senkou), compute)
+    
+    # ========================================
+    # MOMENTUM İNDİKATÖRLERİ (Momentum Indicators)
+    # ========================================
+    
+    def rsi(self, data: Union[pd.Series, np.ndarray], period: int = 14) -> pd.Series:
+        """Relative Strength Index (Göreceli Güç Endeksi)"""
+        return self._cached('rsi', (data,), (period,),
+                            lambda: _series(kernels.rsi(_values(data), period), data))
+    
+    def stochastic(self, high: pd.Series, low: pd.Series, close: pd.Series,
+                   k_period: int = 14, d_period: int = 3) -> Dict[str, pd.Series]:
+        """Stochastic Oscillator (%K, %D)"""
+        def compute():
+            result = kernels.stochastic(_values(high), _values(low), _values(close), k_period, d_period)
+            return {k: _series(v, close) for k, v in result.items()}
+        return self._cached('stochastic', (high, low, close), (k_period, d_period), compute)
+    
+    def williams_r(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+        """Williams %R"""
+        return self._cached('williams_r', (high, low, close), (period,),
+                            lambda: _series(kernels.williams_r(_values(high), _values(low), _values(close), period), close))
+    
+    def cci(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
+        """Commodity Channel Index"""
+        return self._cached('cci', (high, low, close), (period,),
+                            lambda: _series(kernels.cci(_values(high), _values(low), _values(close), period), close))
+    
+    def roc(self, data: Union[pd.Series, np.ndarray], period: int = 12) -> pd.Series:
+        """Rate of Change (Değişim Oranı)"""
+        return self._cached('roc', (data,), (period,),
+                            lambda: _series(kernels.roc(_values(data), period), data))
+    
+    # ========================================
+    # VOLATİLİTE İNDİKATÖRLERİ (Volatility Indicators)
+    # ========================================
+    
+    def bollinger_bands(self, data: Union[pd.Series, np.ndarray], period: int = 20, std_dev: float = 2) -> Dict[str, pd.Series]:
+        """Bollinger Bands (upper / middle / lower)"""
+        def compute():
+            result = kernels.bollinger_bands(_values(data), period, std_dev)
+            return {k: _series(v, data) for k, v in result.items()}
+        return self._cached('bollinger_bands', (data,), (period, std_dev), compute)
+    
+    def atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+        """Average True Range (Ortalama Gerçek Aralık)"""
+        return self._cached('atr', (high, low, close), (period,),
+                            lambda: _series(kernels.atr(_values(high), _values(low), _values(close), period), close))
+    
+    def keltner_channels(self, high: pd.Series, low: pd.Series, close: pd.Series,
+                         period: int = 20, atr_period: int = 10, multiplier: float = 2) -> Dict[str, pd.Series]:
+        """Keltner Channels"""
+        def compute():
+            result = kernels.keltner_channels(_values(high), _values(low), _values(close), period, atr_period, multiplier)
+            return {k: _series(v, close) for k, v in result.items()}
+        return self._cached('keltner_channels', (high, low, close), (period, atr_period, multiplier), compute)
+    
+    def donchian_channels(self, high: pd.Series, low: pd.Series, period: int = 20) -> Dict[str, pd.Series]:
+        """Donchian Channels"""
+        def compute():
+            result = kernels.donchian_channels(_values(high), _values(low), period)
+            return {k: _series(v, high) for k, v in result.items()}
+        return self._cached('donchian_channels', (high, low), (period,), compute)
+    
+    # ========================================
+    # HACİM İNDİKATÖRLERİ (Volume Indicators)
+    # ========================================
+    
+    def obv(self, close: pd.Series, volume: pd.Series) -> pd.Series:
+        """On Balance Volume"""
+        return self._cached('obv', (close, volume), (),
+                            lambda: _series(kernels.obv(_values(close), _values(volume)), close))
+    
+    def vwap(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+             period: Optional[int] = None) -> pd.Series:
+        """Volume Weighted Average Price"""
+        return self._cached('vwap', (high, low, close, volume), (period,),
+                            lambda: _series(kernels.vwap(_values(high), _values(low), _values(close), _values(volume), period), close))
+    
+    def accumulation_distribution(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+        """Accumulation/Distribution Line"""
+        return self._cached('accumulation_distribution', (high, low, close, volume), (),
+                            lambda: _series(kernels.accumulation_distribution(_values(high), _values(low), _values(close), _values(volume)), close))
+    
+    def chaikin_money_flow(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+                           period: int = 20) -> pd.Series:
+        """Chaikin Money Flow"""
+        return self._cached('chaikin_money_flow', (high, low, close, volume), (period,),
+                            lambda: _series(kernels.chaikin_money_flow(_values(high), _values(low), _values(close), _values(volume), period), close))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+JIT Arka Ucu - NumPy Parite Test Script
+
+Numba kurulu değilse jit_backend döngüleri saf Python olarak aynı çağrı yolundan
+çalıştırılır; böylece döngü mantığı yine NumPy çekirdekleriyle karşılaştırılır.
+"""
+
+import time
+
+import numpy as np
+
+
+def _compare(name, reference, candidate, rtol=1e-9, atol=1e-9) -> bool:
+    if isinstance(reference, dict):
+        return all(_compare(f"{name}.{k}", reference[k], candidate[k], rtol, atol) for k in reference)
+    ok = np.allclose(reference, candidate, rtol=rtol, atol=atol, equal_nan=True)
+    ok = ok and np.array_equal(np.isnan(reference), np.isnan(candidate))
+    diff = np.nanmax(np.abs(np.asarray(reference) - np.asarray(candidate))) if np.size(reference) else 0.0
+    print(f"{'✅' if ok else '❌'} {name}: maks. fark {diff:.2e}")
+    return ok
+
+
+def main():
+    import jit_backend
+    import indicator_kernels as kernels
+    from backtest_engine import BacktestEngine, find_stop_exit
+    from market_data_generator import generate_market_data
+
+    print("🚀 JIT / NumPy Parite Testi")
+    print("=" * 50)
+    print(f"numba: {'kurulu' if jit_backend.NUMBA_AVAILABLE else 'yok (saf Python döngüleri)'}")
+
+    data = generate_market_data(["BTC/USDT", "ETH/USDT", "SOL/USDT"], n_bars=3000, seed=7)
+    high = np.column_stack([df['high'].to_numpy() for df in data.values()])
+    low = np.column_stack([df['low'].to_numpy() for df in data.values()])
+    close = np.column_stack([df['close'].to_numpy() for df in data.values()])
+    # Yeni listelenen parite ve veri boşlukları
+    gappy = close.copy()
+    gappy[:200, 2] = np.nan
+    gappy[1000:1010, 1] = np.nan
+
+    cases = {
+        'ema': lambda: kernels.ema(close, 20),
+        'ema (NaN)': lambda: kernels.ema(gappy, 20),
+        'ewm adjust=False (NaN)': lambda: kernels.ewm_mean(gappy, 0.1, adjust=False, min_periods=5),
+        'rsi': lambda: kernels.rsi(close, 14),
+        'rsi (NaN)': lambda: kernels.rsi(gappy, 14),
+        'atr': lambda: kernels.atr(high, low, close, 14),
+        'macd': lambda: kernels.macd(close[:, 0]),
+        'adx': lambda: kernels.adx(high, low, close, 14),
+    }
+
+    print("\n📊 İndikatör çekirdekleri")
+    enabled = jit_backend.enabled()
+    results = {}
+    try:
+        jit_backend._enabled = False
+        reference = {name: func() for name, func in cases.items()}
+        jit_backend._enabled = True
+        started = time.perf_counter()
+        candidate = {name: func() for name, func in cases.items()}
+        elapsed = time.perf_counter() - started
+    finally:
+        jit_backend._enabled = enabled
+    for name in cases:
+        results[name] = _compare(name, reference[name], candidate[name])
+    print(f"⏱️ JIT yolu (derleme / disk önbelleği dahil): {elapsed * 1000:.1f} ms")
+
+    print("\n🐼 Boşluklu seriler - pandas referansı")
+    import pandas as pd
+    gappy_high = np.where(np.isnan(gappy), np.nan, high)
+    gappy_low = np.where(np.isnan(gappy), np.nan, low)
+    frame = pd.DataFrame(gappy)
+    delta = frame.diff()
+    wilder = dict(alpha=1 / 14, adjust=False, min_periods=14)
+    prev_close = frame.shift(1)
+    true_range = np.fmax(gappy_high - gappy_low,
+                         np.fmax(np.abs(gappy_high - prev_close), np.abs(gappy_low - prev_close)))
+    pandas_cases = {
+        'ema (NaN)': (lambda: kernels.ema(gappy, 20), frame.ewm(span=20).mean()),
+        'ewm adjust=False (NaN)': (lambda: kernels.ewm_mean(gappy, 0.1, adjust=False, min_periods=5),
+                                   frame.ewm(alpha=0.1, adjust=False, min_periods=5).mean()),
+        'rsi (NaN)': (lambda: kernels.rsi(gappy, 14),
+                      100 - 100 / (1 + delta.clip(lower=0).ewm(**wilder).mean() / (-delta).clip(lower=0).ewm(**wilder).mean())),
+        'atr (NaN)': (lambda: kernels.atr(gappy_high, gappy_low, gappy, 14), pd.DataFrame(true_range).ewm(**wilder).mean()),
+    }
+    # Boşluk semantiği iki arka uçta da pandas'a karşı doğrulanır (yalnızca birbirleriyle değil)
+    for backend, label in ((False, 'numpy'), (True, 'jit')):
+        try:
+            jit_backend._enabled = backend
+            for name, (func, expected) in pandas_cases.items():
+                results[f'{name} / pandas [{label}]'] = _compare(f'{name} / pandas [{label}]', expected.to_numpy(), func())
+        finally:
+            jit_backend._enabled = enabled
+
+    print("\n🛑 Stop / trailing stop taraması")
+    engine_results = {}
+    for trailing in (None, 0.03):
+        for backend in (False, True):
+            jit_backend._enabled = backend
+            try:
+                engine = BacktestEngine(trailing_stop_pct=trailing)
+                engine_results[(trailing, backend)] = engine.run(data).trades
+            finally:
+                jit_backend._enabled = enabled
+        numpy_trades, jit_trades = engine_results[(trailing, False)], engine_results[(trailing, True)]
+        same = [(t['symbol'], t['timestamp'], t['exit_price'], t['reason']) for t in numpy_trades] == \
+               [(t['symbol'], t['timestamp'], t['exit_price'], t['reason']) for t in jit_trades]
+        label = f"trailing {trailing:.0%}" if trailing else "sabit stop"
+        results[label] = same
+        print(f"{'✅' if same else '❌'} {label}: {len(numpy_trades)} işlem, "
+              f"{sum(t['reason'] == 'Stop Loss' for t in numpy_trades)} stop")
+
+    rng = np.random.default_rng(3)
+    path = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+    path[rng.integers(0, 5000, 50)] = np.nan
+    path[0] = 100.0
+    mismatches = 0
+    for bar in range(0, 4000, 37):
+        if np.isnan(path[bar]):
+            continue  # Giriş barında fiyat her zaman vardır
+        for trail in (0.0, 0.02, 0.05):
+            stop = path[bar] * 0.95
+            jit_backend._enabled = False
+            expected = find_stop_exit(path, bar, 4999, stop, trail)
+            jit_backend._enabled = True
+            got = find_stop_exit(path, bar, 4999, stop, trail)
+            jit_backend._enabled = enabled
+            mismatches += expected != got
+    results['rastgele yollar'] = mismatches == 0
+    print(f"{'✅' if mismatches == 0 else '❌'} rastgele yollar: {mismatches} uyuşmazlık")
+
+    print("\n" + "=" * 50)
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"❌ Parite hatası: {', '.join(failed)}")
+        raise SystemExit(1)
+    print("✅ Tüm parite testleri tamamlandı!")
+
+
+if __name__ == "__main__":
+    main()
@@ -75,6 +75,29 @@ def main():
     print(f"Risk: {result4['portfolio_risk_pct']:.2%}")
     print(f"Neden: {result4['reason']}")
     
+    # Test 5: Toplu hesaplama skaler yolla aynı mı?
+    batch_prices = [(50000, 48000), (3000, 2850), (100, 95), (1.0, 0.9)]
+    print("\n📦 Test 5: Toplu (Vektörize) Hesaplama")
+    batch = sizer.calculate_position_sizes(
+        entry_prices=[p[0] for p in batch_prices],
+        stop_losses=[p[1] for p in batch_prices],
+        portfolio_values=10000,
+        strategy_types=["fixed_fractional", "kelly", "volatility", "martingale"],
+        symbols=["BTCUSDT", "ETHUSDT", "SOLUSDT", "ADAUSDT"],
+        win_rate=0.65, avg_win=0.03, avg_loss=0.015, volatility=0.05, consecutive_losses=2
+    )
+    for row in batch.itertuples():
+        single = sizer.calculate_position_size(
+            symbol=row.symbol,
+            entry_price=batch_prices[row.Index][0],
+            stop_loss=batch_prices[row.Index][1],
+            portfolio_value=10000,
+            strategy_type=row.strategy,
+            win_rate=0.65, avg_win=0.03, avg_loss=0.015, volatility=0.05, consecutive_losses=2
+        )
+        status = "✅" if single['size'] == row.size and single['reason'] == row.reason else "❌"
+        print(f"{status} {row.symbol}: {row.size:.2f} USDT ({row.reason})")
+    
     print("\n" + "=" * 50)
     print("✅ Tüm Position Sizer testleri tamamlandı!")
     
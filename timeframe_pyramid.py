@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Timeframe Piramidi
+Yalnızca 1m mum akışından 5m/15m/1h barlarını artımlı olarak üretir
+"""
+
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400}
+
+Timestamp = Union[int, float, datetime, pd.Timestamp, np.datetime64]
+
+
+def timeframe_to_ns(timeframe: str) -> int:
+    """'1m', '15m', '1h', '1d' gibi timeframe'leri nanosaniyeye çevirir"""
+    unit = timeframe[-1]
+    if unit not in _UNIT_SECONDS or not timeframe[:-1].isdigit():
+        raise ValueError(f"Desteklenmeyen timeframe: {timeframe}")
+    return int(timeframe[:-1]) * _UNIT_SECONDS[unit] * 1_000_000_000
+
+
+def timestamp_to_ns(ts: Timestamp) -> int:
+    """Zaman damgasını epoch nanosaniyesine çevirir (sayılar milisaniye kabul edilir)"""
+    if isinstance(ts, (int, np.integer)) and not isinstance(ts, bool):
+        return int(ts) * 1_000_000
+    if isinstance(ts, (float, np.floating)):
+        return int(ts * 1_000_000)
+    return pd.Timestamp(ts).value
+
+
+class _BarBuffer:
+    """Önceden ayrılmış, büyüyebilen sütunsal bar tamponu (zaman + OHLCV)"""
+
+    def __init__(self, capacity: int = 1024, max_bars: Optional[int] = None):
+        self.max_bars = max_bars
+        self.size = 0
+        self.time = np.empty(capacity, dtype=np.int64)
+        self.data = {col: np.empty(capacity, dtype=np.float64) for col in COLUMNS}
+
+    def _ensure_capacity(self):
+        if self.size < len(self.time):
+            return
+        if self.max_bars and self.size >= 2 * self.max_bars:
+            # Son max_bars barı başa taşı (amortize O(1) kırpma)
+            keep = slice(self.size - self.max_bars, self.size)
+            self.time[:self.max_bars] = self.time[keep]
+            for col in COLUMNS:
+                self.data[col][:self.max_bars] = self.data[col][keep]
+            self.size = self.max_bars
+            return
+        capacity = len(self.time) * 2
+        if self.max_bars:
+            capacity = min(capacity, 2 * self.max_bars)
+        self.time = np.resize(self.time, capacity)
+        self.data = {col: np.resize(arr, capacity) for col, arr in self.data.items()}
+
+    def append(self, ts: int, o: float, h: float, l: float, c: float, v: float):
+        self._ensure_capacity()
+        i = self.size
+        self.time[i] = ts
+        self.data['open'][i] = o
+        self.data['high'][i] = h
+        self.data['low'][i] = l
+        self.data['close'][i] = c
+        self.data['volume'][i] = v
+        self.size += 1
+
+    def extend(self, times: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Toplu ekleme (seed için)"""
+        n = len(times)
+        if self.max_bars and n > self.max_bars:
+            times = times[-self.max_bars:]
+            columns = {col: arr[-self.max_bars:] for col, arr in columns.items()}
+            n = self.max_bars
+        if self.size + n > len(self.time):
+            capacity = max(self.size + n, len(self.time) * 2)
+            self.time = np.resize(self.time, capacity)
+            self.data = {col: np.resize(arr, capacity) for col, arr in self.data.items()}
+        self.time[self.size:self.size + n] = times
+        for col in COLUMNS:
+            self.data[col][self.size:self.size + n] = columns[col]
+        self.size += n
+
+    def merge_last(self, h: float, l: float, c: float, v: float):
+        """Son (tamamlanmamış) barı yeni alt bar ile günceller"""
+        i = self.size - 1
+        if h > self.data['high'][i]:
+            self.data['high'][i] = h
+        if l < self.data['low'][i]:
+            self.data['low'][i] = l
+        self.data['close'][i] = c
+        self.data['volume'][i] += v
+
+    def set_last(self, o: float, h: float, l: float, c: float, v: float):
+        i = self.size - 1
+        self.data['open'][i] = o
+        self.data['high'][i] = h
+        self.data['low'][i] = l
+        self.data['close'][i] = c
+        self.data['volume'][i] = v
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return int(self.time[self.size - 1]) if self.size else None
+
+    def frame(self, tail: Optional[int] = None, copy: bool = False) -> pd.DataFrame:
+        start = max(0, self.size - tail) if tail else 0
+        if self.max_bars:
+            start = max(start, self.size - self.max_bars)
+        window = slice(start, self.size)
+        columns = {'timestamp': pd.to_datetime(self.time[window], unit='ns')}
+        columns.update({col: self.data[col][window] for col in COLUMNS})
+        return pd.DataFrame(columns, copy=copy)
+
+
+class TimeframePyramid:
+    """
+    1m akışından çoklu timeframe bar üretimi
+
+    Her 1m bar geldiğinde üst timeframe'lerde yalnızca son (kısmi) bar güncellenir
+    veya yeni bar açılır; tüm geçmiş üzerinde resample çalıştırılmaz. frames()
+    çıktısı doğrudan SignalGenerator.generate_consensus_signal'e verilebilir.
+    """
+
+    def __init__(self, timeframes: Sequence[str] = ('1m', '5m', '15m', '1h'),
+                 max_bars: Optional[int] = 1000):
+        """
+        Args:
+            timeframes: Üretilecek timeframe'ler (ilk eleman temel akış, genellikle '1m')
+            max_bars: Her timeframe'de tutulacak en fazla bar sayısı (None: sınırsız)
+        """
+        self.timeframes = list(timeframes)
+        self.base = self.timeframes[0]
+        self.tf_ns = {tf: timeframe_to_ns(tf) for tf in self.timeframes}
+        base_ns = self.tf_ns[self.base]
+        for tf, ns in self.tf_ns.items():
+            if ns % base_ns:
+                raise ValueError(f"{tf}, {self.base} timeframe'inin katı olmalı")
+
+        # Son 1m barı düzeltilirken üst barları yeniden kurabilmek için en büyük kova kadar 1m tutulur
+        largest = max(self.tf_ns.values()) // base_ns
+        base_bars = max(max_bars, largest) if max_bars else None
+        self.bars = {tf: _BarBuffer(max_bars=base_bars if tf == self.base else max_bars)
+                     for tf in self.timeframes}
+
+    def update(self, candle: Mapping) -> Dict[str, bool]:
+        """
+        Yeni (veya güncellenen son) 1m mumu işler
+
+        Args:
+            candle: 'timestamp', 'open', 'high', 'low', 'close', 'volume' alanları olan mum
+
+        Returns:
+            timeframe -> bu güncellemede yeni bar açıldı mı
+        """
+        ts = timestamp_to_ns(candle['timestamp'])
+        o, h, l, c, v = (float(candle[col]) for col in COLUMNS)
+        base = self.bars[self.base]
+        base_ns = self.tf_ns[self.base]
+        ts -= ts % base_ns
+
+        last = base.last_time
+        if last is not None and ts < last:
+            raise ValueError("Mumlar zaman sırasıyla gelmeli")
+
+        if last is not None and ts == last:
+            # Aynı 1m barın güncellemesi: üst timeframe'lerde son bar 1m'lerden yeniden kurulur
+            base.set_last(o, h, l, c, v)
+            for tf in self.timeframes[1:]:
+                self._rebuild_last(tf)
+            return {tf: False for tf in self.timeframes}
+
+        opened = {self.base: True}
+        base.append(ts, o, h, l, c, v)
+        for tf in self.timeframes[1:]:
+            buf = self.bars[tf]
+            bucket = ts - ts % self.tf_ns[tf]
+            if buf.last_time == bucket:
+                buf.merge_last(h, l, c, v)
+                opened[tf] = False
+            else:
+                buf.append(bucket, o, h, l, c, v)
+                opened[tf] = True
+        return opened
+
+    def _rebuild_last(self, tf: str):
+        base = self.bars[self.base]
+        buf = self.bars[tf]
+        start = int(np.searchsorted(base.time[:base.size], buf.last_time))
+        rows = slice(start, base.size)
+        buf.set_last(
+            base.data['open'][start],
+            base.data['high'][rows].max(),
+            base.data['low'][rows].min(),
+            base.data['close'][base.size - 1],
+            base.data['volume'][rows].sum()
+        )
+
+    def seed(self, history: pd.DataFrame):
+        """
+        Geçmiş 1m verisiyle piramidi bir kez doldurur (vektörize, resample yok)
+
+        Args:
+            history: 'timestamp' ve OHLCV kolonları olan, zamana göre sıralı 1m DataFrame
+        """
+        if any(buf.size for buf in self.bars.values()):
+            raise ValueError("seed yalnızca boş piramitte çağrılabilir")
+        if len(history) == 0:
+            return
+        times = pd.to_datetime(history['timestamp']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        cols = {col: history[col].to_numpy(dtype=np.float64) for col in COLUMNS}
+
+        for tf in self.timeframes:
+            bucket = times - times % self.tf_ns[tf]
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+            ends = np.r_[starts[1:], len(bucket)] - 1
+            self.bars[tf].extend(bucket[starts], {
+                'open': cols['open'][starts],
+                'high': np.maximum.reduceat(cols['high'], starts),
+                'low': np.minimum.reduceat(cols['low'], starts),
+                'close': cols['close'][ends],
+                'volume': np.add.reduceat(cols['volume'], starts)
+            })
+
+    def frames(self, tail: Optional[int] = None, copy: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        SignalGenerator için timeframe -> DataFrame sözlüğü
+
+        Args:
+            tail: Her timeframe için son kaç bar (None: tamamı)
+            copy: False ise DataFrame'ler tamponun görünümüdür ve bir sonraki update ile değişebilir
+        """
+        return {tf: self.bars[tf].frame(tail, copy) for tf in self.timeframes if self.bars[tf].size}
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İşlem Günlüğü
+İşlem ve portföy değeri kayıtları için sütunsal, yalnızca eklenen günlük ve O(1) güncellenen istatistikler
+"""
+
+import math
+from collections.abc import Sequence
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class _Columns:
+    """Önceden ayrılmış, ikiye katlanarak büyüyen sütunsal kayıt tamponu"""
+
+    def __init__(self, schema: Dict[str, Any], capacity: int = 256):
+        self.size = 0
+        self.data = {name: np.empty(capacity, dtype=dtype) for name, dtype in schema.items()}
+
+    def append(self, **values):
+        if self.size == len(next(iter(self.data.values()))):
+            self.data = {name: np.resize(arr, 2 * len(arr)) for name, arr in self.data.items()}
+        i = self.size
+        for name, arr in self.data.items():
+            arr[i] = values[name]
+        self.size += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Sütunun doldurulmuş kısmı (kopyasız görünüm)"""
+        return self.data[name][:self.size]
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: arr[:self.size] for name, arr in self.data.items()})
+
+    def row(self, i: int) -> Dict:
+        return {name: arr[i].item() if isinstance(arr[i], np.generic) else arr[i] for name, arr in self.data.items()}
+
+
+class _RecordsView(Sequence):
+    """
+    Sütunsal kayıtlar üzerinde salt okunur, canlı list-of-dict görünümü
+
+    Oluşturmak O(1)'dir; satırlar erişildikçe dict'e çevrilir. append/extend
+    gibi liste değiştiricileri yoktur, yanlışlıkla yapılan ekleme sessizce
+    kaybolmak yerine AttributeError verir.
+    """
+
+    __slots__ = ('_columns',)
+
+    def __init__(self, columns: _Columns):
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return self._columns.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._columns.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("kayıt indeksi aralık dışında")
+        return self._columns.row(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, _RecordsView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self[:])
+
+
+_TRADE_SCHEMA = {
+    'symbol': object,
+    'size': np.float64,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'pnl': np.float64,
+    'reason': object,
+    'timestamp': object
+}
+
+_EQUITY_SCHEMA = {
+    'date': object,
+    'portfolio_value': np.float64,
+    'daily_pnl': np.float64,
+    'balance': np.float64
+}
+
+
+class TradeJournal:
+    """
+    İşlemler ve portföy değeri için sütunsal günlük
+
+    Kayıtlar NumPy dizilerine eklenir; toplam PnL, kazanç/kayıp sayıları,
+    en iyi/en kötü işlem, maksimum drawdown ve getiri ortalaması/varyansı
+    (Welford) her eklemede güncellenir. Rapor ve özkaynak kontrolleri kayıt
+    sayısından bağımsız O(1) maliyetlidir.
+    """
+
+    def __init__(self, initial_balance: float = 10000, capacity: int = 256):
+        self.initial_balance = initial_balance
+        self._trades = _Columns(_TRADE_SCHEMA, capacity)
+        self._equity = _Columns(_EQUITY_SCHEMA, capacity)
+
+        # İşlem istatistikleri
+        self.total_pnl = 0.0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.wins = 0
+        self.losses = 0
+        self._best = -1
+        self._worst = -1
+
+        # Özkaynak istatistikleri
+        self.peak_value = initial_balance
+        self.max_drawdown = 0.0
+        self._last_value: Optional[float] = None
+        self._n_returns = 0
+        self._mean_return = 0.0
+        self._m2_return = 0.0
+        self._downside_sq = 0.0
+
+    # ---- Kayıt ----
+
+    def record_trade(self, symbol: str, size: float, entry_price: float, exit_price: float,
+                     pnl: float, reason: str, timestamp: Any) -> int:
+        """İşlemi ekler ve istatistikleri günceller; işlemin sırasını döndürür"""
+        i = self._trades.size
+        self._trades.append(symbol=symbol, size=size, entry_price=entry_price, exit_price=exit_price,
+                            pnl=pnl, reason=reason, timestamp=timestamp)
+        pnls = self._trades.data['pnl']
+        self.total_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += pnl
+        if self._best < 0 or pnl > pnls[self._best]:
+            self._best = i
+        if self._worst < 0 or pnl < pnls[self._worst]:
+            self._worst = i
+        return i
+
+    def record_equity(self, date: Any, portfolio_value: float, daily_pnl: float, balance: float):
+        """Dönem sonu portföy değerini ekler; drawdown ve getiri istatistiklerini günceller"""
+        self._equity.append(date=date, portfolio_value=portfolio_value, daily_pnl=daily_pnl, balance=balance)
+
+        if portfolio_value > self.peak_value:
+            self.peak_value = portfolio_value
+        if self.peak_value > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak_value - portfolio_value) / self.peak_value)
+
+        previous = self._last_value if self._last_value is not None else self.initial_balance
+        self._last_value = portfolio_value
+        if previous:
+            r = portfolio_value / previous - 1
+            self._n_returns += 1
+            delta = r - self._mean_return
+            self._mean_return += delta / self._n_returns
+            self._m2_return += delta * (r - self._mean_return)
+            if r < 0:
+                self._downside_sq += r * r
+
+    # ---- İstatistikler ----
+
+    @property
+    def num_trades(self) -> int:
+        return self._trades.size
+
+    @property
+    def final_value(self) -> float:
+        return self._last_value if self._last_value is not None else self.initial_balance
+
+    @property
+    def total_return_pct(self) -> float:
+        return (self.final_value - self.initial_balance) / self.initial_balance * 100
+
+    @property
+    def win_rate(self) -> float:
+        """Kazanan işlem oranı (%)"""
+        return self.wins / self.num_trades * 100 if self.num_trades else 0.0
+
+    @property
+    def avg_win(self) -> float:
+        return self.gross_profit / self.wins if self.wins else 0.0
+
+    @property
+    def avg_loss(self) -> float:
+        return self.gross_loss / self.losses if self.losses else 0.0
+
+    @property
+    def best_trade(self) -> Optional[Dict]:
+        return self._trades.row(self._best) if self._best >= 0 else None
+
+    @property
+    def worst_trade(self) -> Optional[Dict]:
+        return self._trades.row(self._worst) if self._worst >= 0 else None
+
+    def sharpe_ratio(self, periods_per_year: Optional[float] = None) -> float:
+        """Dönem getirilerinin ortalama / standart sapması (periods_per_year verilirse yıllıklandırılır)"""
+        if self._n_returns < 2:
+            return 0.0
+        std = math.sqrt(self._m2_return / (self._n_returns - 1))
+        if std == 0:
+            return 0.0
+        ratio = self._mean_return / std
+        return ratio * math.sqrt(periods_per_year) if periods_per_year else ratio
+
+    def sortino_ratio(self, periods_per_year: Optional[float] = None) -> float:
+        """Ortalama getiri / aşağı yönlü sapma (hedef getiri 0)"""
+        if self._n_returns < 2:
+            return 0.0
+        downside = math.sqrt(self._downside_sq / self._n_returns)
+        if downside == 0:
+            return 0.0
+        ratio = self._mean_return / downside
+        return ratio * math.sqrt(periods_per_year) if periods_per_year else ratio
+
+    def summary(self, periods_per_year: Optional[float] = None) -> Dict[str, float]:
+        return {
+            'total_return_pct': self.total_return_pct,
+            'final_value': self.final_value,
+            'trades': self.num_trades,
+            'wins': self.wins,
+            'losses': self.losses,
+            'win_rate_pct': self.win_rate,
+            'net_pnl': self.total_pnl,
+            'gross_profit': self.gross_profit,
+            'gross_loss': self.gross_loss,
+            'max_drawdown_pct': self.max_drawdown * 100,
+            'sharpe': self.sharpe_ratio(periods_per_year),
+            'sortino': self.sortino_ratio(periods_per_year)
+        }
+
+    # ---- Erişim ----
+
+    def trade_column(self, name: str) -> np.ndarray:
+        """İşlem sütununun kopyasız görünümü (ör. 'pnl')"""
+        return self._trades.column(name)
+
+    def equity_column(self, name: str) -> np.ndarray:
+        return self._equity.column(name)
+
+    def trades_frame(self) -> pd.DataFrame:
+        return self._trades.frame()
+
+    def equity_frame(self) -> pd.DataFrame:
+        return self._equity.frame()
+
+    @property
+    def trades(self) -> Sequence:
+        """Eski list-of-dict biçiminde işlemler (salt okunur görünüm; kayıt için record_trade)"""
+        return _RecordsView(self._trades)
+
+    @property
+    def pnl_history(self) -> Sequence:
+        """Eski list-of-dict biçiminde portföy değeri geçmişi (salt okunur görünüm; kayıt için record_equity)"""
+        return _RecordsView(self._equity)
+
+    def __len__(self) -> int:
+        return self._trades.size
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo VaR / CVaR Motoru
+Açık portföy için parça parça vektörize senaryo simülasyonu ve pozisyon bazlı risk katkıları
+"""
+
+import math
+import time
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+RETURN_MODELS = ("historical", "normal")
+
+
+def log_returns(prices: Union[pd.DataFrame, Mapping[str, pd.DataFrame]], column: str = 'close') -> pd.DataFrame:
+    """
+    Fiyatlardan log getiri tablosu (satır: bar, kolon: sembol)
+
+    Args:
+        prices: Kolonları sembol olan fiyat tablosu veya sembol -> OHLCV DataFrame
+    """
+    if not isinstance(prices, pd.DataFrame):
+        prices = pd.DataFrame({symbol: df[column].to_numpy() for symbol, df in prices.items()})
+    values = prices.to_numpy(dtype=np.float64)
+    returns = np.diff(np.log(values), axis=0)
+    return pd.DataFrame(returns, columns=prices.columns).dropna()
+
+
+def _check_levels(confidence: Sequence[float]) -> Tuple[float, ...]:
+    """Güven düzeylerini doğrular ve sıralar"""
+    levels = tuple(sorted(float(a) for a in confidence))
+    if not levels or not all(0 < a < 1 for a in levels):
+        raise ValueError(f"Güven düzeyleri (0, 1) aralığında olmalı: {confidence}")
+    return levels
+
+
+class MonteCarloVaR:
+    """
+    Portföy zararı dağılımı için Monte Carlo VaR / CVaR
+
+    Getiri modeli geçmiş getirilerden bootstrap veya ortalama/kovaryansı
+    geçmişten tahmin edilen korelasyonlu normal dağılımdır. Senaryolar
+    chunk_size'lık parçalar halinde üretilir; bellek senaryo sayısından değil
+    parça boyutundan ve kuyruk büyüklüğünden bağımsızdır: her parçadan sonra
+    yalnızca en büyük zararlı ceil((1 - α) × n) senaryonun pozisyon bazlı
+    zararları np.argpartition ile tutulur. CVaR bu kuyruğun ortalamasıdır ve
+    pozisyon katkıları (Euler / bileşen CVaR) kuyruktaki pozisyon zararlarının
+    ortalamasıdır; katkıların toplamı CVaR'a eşittir.
+    """
+
+    def __init__(self, n_scenarios: int = 100_000, horizon: int = 1,
+                 confidence: Sequence[float] = (0.95, 0.99), model: str = "historical",
+                 chunk_size: int = 25_000, seed: Optional[int] = None):
+        """
+        Args:
+            n_scenarios: Senaryo sayısı
+            horizon: Ufuk (bar); getiriler bu kadar bar boyunca birikir
+            confidence: Güven düzeyleri
+            model: "historical" (bootstrap) veya "normal" (korelasyonlu normal)
+            chunk_size: Parça başına senaryo sayısı (bellek sınırı)
+            seed: Rastgele tohum
+        """
+        if model not in RETURN_MODELS:
+            raise ValueError(f"Bilinmeyen getiri modeli: {model}")
+        self.n_scenarios = n_scenarios
+        self.horizon = horizon
+        self.confidence = _check_levels(confidence)
+        self.model = model
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+        self.symbols: list = []
+        self._index: Dict[str, int] = {}
+        self._returns: Optional[np.ndarray] = None
+        self._mean: Optional[np.ndarray] = None
+        self._cov: Optional[np.ndarray] = None
+
+    # ---- Model ----
+
+    def fit(self, returns: Union[pd.DataFrame, np.ndarray], symbols: Optional[Sequence[str]] = None) -> 'MonteCarloVaR':
+        """
+        Getiri modelini kurar
+
+        Args:
+            returns: (bar × sembol) log getiriler; DataFrame ise kolonlar sembol adıdır
+            symbols: returns bir dizi ise kolon sembolleri
+        """
+        if isinstance(returns, pd.DataFrame):
+            symbols = list(returns.columns)
+            returns = returns.to_numpy(dtype=np.float64)
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.ndim != 2 or len(returns) < 2:
+            raise ValueError("En az iki satırlık (bar × sembol) getiri matrisi gerekli")
+        self.symbols = list(symbols) if symbols is not None else [str(i) for i in range(returns.shape[1])]
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+        self._returns = np.ascontiguousarray(returns)
+        self._mean = returns.mean(axis=0)
+        self.set_covariance(np.atleast_2d(np.cov(returns, rowvar=False)), self._mean)
+        return self
+
+    def set_covariance(self, cov: np.ndarray, mean: Optional[np.ndarray] = None):
+        """Normal model için kovaryansı doğrudan verir (ör. EWMA tahmini); pozitif yarı tanımlıya onarılır"""
+        cov = np.asarray(cov, dtype=np.float64)
+        if mean is not None:
+            self._mean = np.asarray(mean, dtype=np.float64)
+        elif self._mean is None:
+            self._mean = np.zeros(len(cov))
+        if not np.all(np.linalg.eigvalsh((cov + cov.T) / 2) > 0):
+            # Az gözlem veya eşdoğrusal semboller: negatif özdeğerler kırpılır
+            values, vectors = np.linalg.eigh((cov + cov.T) / 2)
+            cov = (vectors * np.maximum(values, 0)) @ vectors.T
+            cov += np.eye(len(cov)) * 1e-12 * max(np.trace(cov) / len(cov), 1e-12)
+        self._cov = cov
+
+    def _factor(self, columns: np.ndarray) -> Optional[np.ndarray]:
+        """Pozisyon alt kümesinin kovaryansının Cholesky çarpanı (normal model)"""
+        if self.model != "normal":
+            return None
+        return np.linalg.cholesky(self._cov[np.ix_(columns, columns)])
+
+    def _scenario_returns(self, rng: np.random.Generator, n: int, columns: np.ndarray,
+                          chol: Optional[np.ndarray]) -> np.ndarray:
+        """(n × pozisyon) basit getiri senaryoları"""
+        if chol is None:
+            sampled = self._returns[:, columns]
+            rows = rng.integers(0, len(sampled), size=(n, self.horizon))
+            log_r = sampled[rows[:, 0]]
+            for h in range(1, self.horizon):
+                log_r += sampled[rows[:, h]]
+        else:
+            z = rng.standard_normal((n, len(columns)))
+            log_r = self._mean[columns] * self.horizon + math.sqrt(self.horizon) * (z @ chol.T)
+        return np.expm1(log_r)
+
+    # ---- Değerlendirme ----
+
+    def evaluate(self, exposures: Mapping[str, float], confidence: Optional[Sequence[float]] = None) -> Dict:
+        """
+        Portföy VaR / CVaR ve pozisyon katkıları
+
+        Args:
+            exposures: sembol -> piyasa değeri (long pozitif, short negatif; quote cinsinden)
+            confidence: Bu çağrı için güven düzeyleri (varsayılan: kurucudaki düzeyler)
+
+        Returns:
+            {'value', 'expected_pnl', 'var': {α: ...}, 'cvar': {α: ...},
+             'contributions': {α: {sembol: bileşen CVaR}}, 'n_scenarios', 'elapsed_sec'}
+            Zararlar pozitif sayıdır.
+        """
+        if self._returns is None:
+            raise RuntimeError("Önce fit() çağrılmalı")
+        started = time.perf_counter()
+        levels = _check_levels(confidence) if confidence is not None else self.confidence
+
+        held = [(s, float(v)) for s, v in exposures.items() if v]
+        missing = [s for s, _ in held if s not in self._index]
+        if missing:
+            raise KeyError(f"Getiri modelinde olmayan semboller: {missing}")
+        symbols = [s for s, _ in held]
+        weights = np.array([v for _, v in held], dtype=np.float64)
+        columns = np.array([self._index[s] for s in symbols], dtype=np.intp)
+        n = self.n_scenarios
+        tail_size = max(1, math.ceil((1 - levels[0]) * n))
+
+        if len(held) == 0:
+            zero = {a: 0.0 for a in levels}
+            return {'value': 0.0, 'expected_pnl': 0.0, 'var': zero, 'cvar': dict(zero),
+                    'contributions': {a: {} for a in levels}, 'n_scenarios': n,
+                    'elapsed_sec': time.perf_counter() - started}
+
+        chol = self._factor(columns)
+        tail_losses = np.empty(0)
+        tail_positions = np.empty((0, len(held)))
+        total_pnl = 0.0
+        seeds = np.random.SeedSequence(self.seed).spawn(math.ceil(n / self.chunk_size))
+        for i, seed in enumerate(seeds):
+            size = min(self.chunk_size, n - i * self.chunk_size)
+            position_losses = -(self._scenario_returns(np.random.default_rng(seed), size, columns, chol) * weights)
+            losses = position_losses.sum(axis=1)
+            total_pnl -= losses.sum()
+
+            # Yalnızca en büyük tail_size zarar (ve pozisyon dağılımı) tutulur
+            losses = np.concatenate([tail_losses, losses])
+            position_losses = np.concatenate([tail_positions, position_losses])
+            if len(losses) > tail_size:
+                keep = np.argpartition(losses, len(losses) - tail_size)[-tail_size:]
+                losses, position_losses = losses[keep], position_losses[keep]
+            tail_losses, tail_positions = losses, position_losses
+
+        order = np.argsort(-tail_losses, kind='stable')
+        tail_losses, tail_positions = tail_losses[order], tail_positions[order]
+        var, cvar, contributions = {}, {}, {}
+        for alpha in levels:
+            k = max(1, math.ceil((1 - alpha) * n))
+            var[alpha] = float(tail_losses[k - 1])
+            cvar[alpha] = float(tail_losses[:k].mean())
+            contributions[alpha] = dict(zip(symbols, tail_positions[:k].mean(axis=0).tolist()))
+
+        return {
+            'value': float(weights.sum()),
+            'expected_pnl': total_pnl / n,
+            'var': var,
+            'cvar': cvar,
+            'contributions': contributions,
+            'n_scenarios': n,
+            'elapsed_sec': time.perf_counter() - started
+        }
+
+    def pre_trade_check(self, exposures: Mapping[str, float], symbol: str, notional: float,
+                        max_cvar: float, confidence: Optional[float] = None) -> Tuple[bool, Dict]:
+        """
+        Yeni pozisyonla birlikte CVaR limiti aşılıyor mu
+
+        Kurucuda olmayan bir güven düzeyi verilirse bu değerlendirmeye eklenir.
+
+        Returns:
+            (izin, yeni pozisyonlu değerlendirme)
+        """
+        alpha = self.confidence[-1] if confidence is None else _check_levels([confidence])[0]
+        proposed = dict(exposures)
+        proposed[symbol] = proposed.get(symbol, 0.0) + notional
+        result = self.evaluate(proposed, None if alpha in self.confidence else self.confidence + (alpha,))
+        return result['cvar'][alpha] <= max_cvar, result
+
+
+def portfolio_exposures(trader, current_prices: Mapping[str, float]) -> Dict[str, float]:
+    """PaperTrader açık pozisyonlarının sembol bazında piyasa değeri (birim × fiyat, quote cinsinden)"""
+    return trader.positions.exposures(current_prices)